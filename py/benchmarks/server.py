@@ -0,0 +1,207 @@
+"""Latency/throughput benchmark for every tool and resource.
+
+Drives the real server through an in-memory MCP client session, so each call
+pays the full protocol path (JSON-RPC, validation, serialization) without any
+transport noise. For each corpus size it records:
+
+- ``cold``: the first call to each target right after the store is reset.
+- ``warm``: ``--iterations`` further calls to the same target.
+
+Synthetic corpora add N generated markdown documents next to a copy of the
+real content, so search and indexing scale while the ``get_*`` tools still
+return the real files.
+
+Run ``python -m benchmarks.server --sizes 10,100,1000 --out bench.json`` from
+``py/``. The JSON report is meant to be diffed across commits.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from mcp.client.session import ClientSession
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.constants import RESOURCES_CATEGORIES, RESOURCES_DIR
+from src.main import mcp
+from src.util.store import ContentStore, set_store
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_ITERATIONS = 50
+
+# Arguments for tools whose parameters have no defaults (or whose defaults are not representative).
+TOOL_ARGUMENTS: dict[str, dict[str, Any]] = {
+    "search_info": {"query": "python"},
+    "get_section": {"resource": "tennis", "section": "Overview"},
+    "get_resources": {"items": ["resume", "work", "projects", "skills"]},
+}
+
+# Concrete URIs for resource templates.
+TEMPLATE_URIS: dict[str, str] = {
+    "larkin://resume.pdf/{offset}/{length}": "larkin://resume.pdf/0/4096",
+    "larkin://batch/{items}": "larkin://batch/resume,work,projects,skills",
+}
+
+VOCABULARY = (
+    "python rust typescript go kafka postgres distributed systems latency throughput tennis swarthmore "
+    "backend frontend react kubernetes docker terraform aws machine learning models pipelines streaming "
+    "trading risk analytics engineer team lead mentor project launch customer platform api design"
+).split()
+
+
+@dataclass
+class Target:
+    kind: str
+    name: str
+    arguments: dict[str, Any] = field(default_factory=dict)
+
+
+def make_corpus(root: Path, size: int, seed: int = 0) -> list[str]:
+    """Copy the real content to ``root`` and add ``size`` synthetic documents; return all category names."""
+    shutil.copytree(RESOURCES_DIR, root)
+    rng = random.Random(seed)
+    names = []
+    for i in range(size):
+        name = f"synthetic_{i:05d}"
+        sections = []
+        for s in range(rng.randint(2, 6)):
+            lines = [" ".join(rng.choices(VOCABULARY, k=rng.randint(6, 16))) for _ in range(rng.randint(3, 10))]
+            sections.append(f"## Section {s}\n\n" + "\n".join(f"- {line}" for line in lines))
+        (root / f"{name}.md").write_text(f"# Document {i}\n\n" + "\n\n".join(sections) + "\n")
+        names.append(name)
+    return RESOURCES_CATEGORIES + names
+
+
+async def discover_targets(client: ClientSession) -> list[Target]:
+    targets = []
+    for tool in (await client.list_tools()).tools:
+        required = set(tool.inputSchema.get("required", []))
+        arguments = TOOL_ARGUMENTS.get(tool.name, {})
+        if not required <= arguments.keys():
+            print(f"skipping tool {tool.name}: no benchmark arguments for {sorted(required)}", file=sys.stderr)
+            continue
+        targets.append(Target("tool", tool.name, arguments))
+
+    for resource in (await client.list_resources()).resources:
+        targets.append(Target("resource", str(resource.uri)))
+    for template in (await client.list_resource_templates()).resourceTemplates:
+        if template.uriTemplate in TEMPLATE_URIS:
+            targets.append(Target("resource", TEMPLATE_URIS[template.uriTemplate]))
+        else:
+            print(f"skipping resource template {template.uriTemplate}: no sample URI", file=sys.stderr)
+    return targets
+
+
+async def call(client: ClientSession, target: Target) -> tuple[float, bool]:
+    """Return (elapsed milliseconds, succeeded) for one call."""
+    started = time.perf_counter()
+    try:
+        if target.kind == "tool":
+            result = await client.call_tool(target.name, target.arguments)
+            ok = not result.isError
+        else:
+            await client.read_resource(target.name)  # type: ignore[arg-type]
+            ok = True
+    except Exception:
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+def summarize(samples_ms: list[float], errors: int) -> dict[str, Any]:
+    ordered = sorted(samples_ms)
+    total_s = sum(ordered) / 1000
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "p50_ms": round(statistics.median(ordered), 4),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "throughput_per_s": round(len(ordered) / total_s, 2) if total_s else None,
+    }
+
+
+async def bench_corpus(size: int, iterations: int) -> list[dict[str, Any]]:
+    with tempfile.TemporaryDirectory(prefix="larkin-mcp-bench-") as tmp:
+        root = Path(tmp) / "content"
+        categories = make_corpus(root, size)
+        set_store(ContentStore(root, categories))
+
+        results = []
+        async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+            for target in await discover_targets(client):
+                cold_ms, cold_ok = await call(client, target)
+                warm = [await call(client, target) for _ in range(iterations)]
+                for phase, samples in (("cold", [(cold_ms, cold_ok)]), ("warm", warm)):
+                    results.append(
+                        {
+                            "corpus_docs": size,
+                            "kind": target.kind,
+                            "target": target.name,
+                            "phase": phase,
+                            **summarize([ms for ms, _ in samples], sum(not ok for _, ok in samples)),
+                        }
+                    )
+                # Every target starts cold, not just the first one after the corpus is built.
+                set_store(ContentStore(root, categories))
+
+        set_store(None)
+        return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(sizes: list[int], iterations: int) -> dict[str, Any]:
+    results = []
+    for size in sizes:
+        started = time.perf_counter()
+        results.extend(await bench_corpus(size, iterations))
+        print(f"corpus of {size} docs done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "sizes": sizes,
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.server", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated corpus sizes")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Warm calls per target")
+    parser.add_argument("--out", type=Path, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run([int(size) for size in args.sizes.split(",")], args.iterations))
+    output = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Cold-start benchmark for the stdio server.
+
+Measures two things in fresh interpreters, since the stdio server is spawned
+once per conversation and both sit on the user-visible path:
+
+- ``python -X importtime -c "import src.main"``: total import time, and the
+  share spent in this package's own modules (registration included).
+- Time from process spawn to the response to an MCP ``initialize`` request.
+
+Run ``python -m benchmarks.startup`` from ``py/``. It prints a JSON report and
+exits non-zero if a median exceeds its budget. Budgets can be overridden with
+the ``LARKIN_MCP_*_BUDGET_MS`` env vars for slower machines.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PY_ROOT = Path(__file__).resolve().parent.parent
+
+# Our own modules (src.*) are the part we control; mcp/pydantic dominate the total.
+OWN_IMPORT_BUDGET_MS = float(os.environ.get("LARKIN_MCP_OWN_IMPORT_BUDGET_MS", 150))
+FIRST_RESPONSE_BUDGET_MS = float(os.environ.get("LARKIN_MCP_FIRST_RESPONSE_BUDGET_MS", 5000))
+
+# Modules that must not be imported before the first request that needs them.
+DEFERRED_MODULES = ("src.util.search", "src.util.sections", "src.util.bundle", "numpy")
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Map module name to (self_us, cumulative_us) from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_import(module: str = "src.main") -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PY_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    return {
+        "total_ms": modules[module][1] / 1000,
+        "own_ms": sum(self_us for name, (self_us, _) in modules.items() if name.split(".")[0] == "src") / 1000,
+        "module_count": len(modules),
+        "deferred_imported": sorted(name for name in DEFERRED_MODULES if name in modules),
+    }
+
+
+def measure_first_response() -> float:
+    """Return milliseconds from spawning the stdio server to its initialize response."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.main", "--transport", "stdio"],
+        cwd=PY_ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        assert proc.stdin is not None and proc.stdout is not None
+        proc.stdin.write(json.dumps(INITIALIZE_REQUEST) + "\n")
+        proc.stdin.flush()
+        response = json.loads(proc.stdout.readline())
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if response.get("id") != 1 or "result" not in response:
+            raise RuntimeError(f"Unexpected initialize response: {response}")
+        return elapsed_ms
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def run(runs: int = 5) -> dict:
+    imports = [measure_import() for _ in range(runs)]
+    first_responses = [measure_first_response() for _ in range(runs)]
+
+    report = {
+        "runs": runs,
+        "import_total_ms_p50": statistics.median(r["total_ms"] for r in imports),
+        "import_own_ms_p50": statistics.median(r["own_ms"] for r in imports),
+        "first_response_ms_p50": statistics.median(first_responses),
+        "module_count": imports[-1]["module_count"],
+        "deferred_imported": imports[-1]["deferred_imported"],
+        "budgets": {"import_own_ms": OWN_IMPORT_BUDGET_MS, "first_response_ms": FIRST_RESPONSE_BUDGET_MS},
+    }
+    report["failures"] = check_budgets(report)
+    return report
+
+
+def check_budgets(report: dict) -> list[str]:
+    failures = []
+    if report["import_own_ms_p50"] > OWN_IMPORT_BUDGET_MS:
+        failures.append(f"own import time {report['import_own_ms_p50']:.1f}ms > {OWN_IMPORT_BUDGET_MS}ms")
+    if report["first_response_ms_p50"] > FIRST_RESPONSE_BUDGET_MS:
+        failures.append(f"first response {report['first_response_ms_p50']:.1f}ms > {FIRST_RESPONSE_BUDGET_MS}ms")
+    if report["deferred_imported"]:
+        failures.append(f"imported at startup but should be deferred: {', '.join(report['deferred_imported'])}")
+    return failures
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    report = run(runs)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
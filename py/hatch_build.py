@@ -0,0 +1,35 @@
+"""Hatch build hook that compiles the content directory into a single bundle file.
+
+Wheels ship ``src/resources/content.bundle`` instead of the loose markdown/PDF
+files, so an installed server starts from one memory-mapped read.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class ContentBundleBuildHook(BuildHookInterface):
+    PLUGIN_NAME = "content-bundle"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        # Editable installs read the loose files in place, so a bundle would only go stale.
+        if self.target_name != "wheel" or version == "editable":
+            return
+
+        sys.path.insert(0, self.root)
+        from src.util.bundle import build_bundle
+
+        self._tmp_dir = Path(tempfile.mkdtemp(prefix="larkin-mcp-bundle-"))
+        bundle_path = self._tmp_dir / "content.bundle"
+        build_bundle(bundle_path)
+        build_data["force_include"][str(bundle_path)] = "src/resources/content.bundle"
+
+    def finalize(self, version: str, build_data: dict[str, Any], artifact_path: str) -> None:
+        tmp_dir = getattr(self, "_tmp_dir", None)
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
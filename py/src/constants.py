@@ -10,11 +10,80 @@ MCP_INSTRUCTIONS = (
 MCP_WEBSITE_URL = "https://johnlarkin1.github.io/2025/larkin-mcp"
 MCP_VERSION = "0.2.0"
 
+# Transport (overridable via CLI flags or env vars)
+MCP_TRANSPORTS = ["stdio", "sse", "streamable-http"]
+MCP_TRANSPORT_ENV = "LARKIN_MCP_TRANSPORT"
+MCP_HOST_ENV = "LARKIN_MCP_HOST"
+MCP_PORT_ENV = "LARKIN_MCP_PORT"
+MCP_DEFAULT_HOST = "127.0.0.1"
+MCP_DEFAULT_PORT = 8000
+
+# Concurrency
+# Max worker threads doing blocking file I/O at once, shared by every session.
+IO_THREAD_LIMIT = 8
+
 # Resources
 RESOURCES_DIR = Path(__file__).parent / "resources" / "content"
 RESOURCES_CATEGORIES = ["resume", "bio", "projects", "contact", "skills", "work", "tennis"]
 
+# Precompiled bundle of RESOURCES_DIR (see src/util/bundle.py). Set the env var to a
+# different path to use another bundle, or to "off" to always read the loose files.
+BUNDLE_PATH = Path(__file__).parent / "resources" / "content.bundle"
+BUNDLE_ENV = "LARKIN_MCP_BUNDLE"
+
+# Seconds between checks of RESOURCES_DIR for edits, which are swapped in without a
+# restart (see ContentStore.watch). 0 disables the watcher; each request then checks instead.
+RELOAD_INTERVAL_ENV = "LARKIN_MCP_RELOAD_INTERVAL"
+RELOAD_DEFAULT_INTERVAL = 2.0
+
+# Multi-profile serving (see src/util/profiles.py): each subdirectory of the profiles
+# directory is laid out like RESOURCES_DIR and served under its name. Unset disables it.
+PROFILES_DIR_ENV = "LARKIN_MCP_PROFILES_DIR"
+# Estimated memory that loaded profiles may use before the least recently used ones are dropped.
+PROFILE_MEMORY_CAP_ENV = "LARKIN_MCP_PROFILE_MEMORY_MB"
+PROFILE_DEFAULT_MEMORY_CAP_MB = 512
+# search_info responses cached per profile (the default content uses SEARCH_CACHE_SIZE).
+PROFILE_SEARCH_CACHE_SIZE = 64
+PROFILE_CONTENT_URI = "larkin://profiles/{profile}/{resource}"
+PROFILE_PAGES_URI = "larkin://profiles/{profile}/pages/{resource}/{cursor}"
+PROFILE_RESUME_PDF_URI = "larkin://profiles/{profile}/resume.pdf"
+
+# Pagination of markdown resources (see src/util/pagination.py). Pages end on a
+# section or line boundary at or before the byte limit.
+CONTENT_PAGE_BYTES = 64 * 1024
+CONTENT_MAX_PAGE_BYTES = 1024 * 1024
+CONTENT_URI = "larkin://{resource}"
+CONTENT_PAGES_URI = "larkin://pages/{resource}/{cursor}"
+# Content hash per larkin:// resource (see src/resources/subscriptions.py).
+ETAGS_URI = "config://etags"
+# Past content versions kept so get_changes can diff against them.
+CONTENT_HISTORY_SIZE = 16
+
+# Largest number of resources/sections get_resources returns in one call.
+BATCH_MAX_ITEMS = 20
+BATCH_URI = "larkin://batch/{items}"
+
+# Matching lines shown per resource by search_info, and resources returned in keyword mode.
+SEARCH_LINES_PER_RESOURCE = 5
+SEARCH_RESOURCE_LIMIT = 10
+# Formatted search_info responses kept per content version, keyed by normalized query and options.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_MODES = ["keyword", "semantic"]
+# Sections returned by search_info in semantic mode.
+SEMANTIC_SEARCH_LIMIT = 10
+
+# Parallel index builds (see src/util/indexer.py). Corpora smaller than the minimum are
+# indexed in-process, since starting worker processes costs more than it saves.
+INDEX_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+INDEX_SHARD_BYTES = 1024 * 1024
+
 # Resume
 RESUME_DATE_VERSION = "2025-12-14"
 RESUME_PDF_PATH = RESOURCES_DIR / "resume" / "larkin_resume.pdf"
 RESUME_MD_PATH = RESOURCES_DIR / "resume" / "larkin_resume.md"
+# Name of the resume PDF among the snapshot's blobs; it is served at larkin://<name> like the text resources.
+RESUME_PDF_RESOURCE = "resume.pdf"
+RESUME_PDF_URI = f"larkin://{RESUME_PDF_RESOURCE}"
+# Multiples of 3 so chunk boundaries line up with the cached base64 encoding.
+RESUME_PDF_CHUNK_BYTES = 48 * 1024
+RESUME_PDF_MAX_CHUNK_BYTES = 3 * 1024 * 1024
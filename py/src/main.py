@@ -1,15 +1,35 @@
+import argparse
 import logging
+import os
+from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import Response
 
 from src.constants import (
+    MCP_DEFAULT_HOST,
+    MCP_DEFAULT_PORT,
+    MCP_HOST_ENV,
     MCP_INSTRUCTIONS,
     MCP_NAME,
+    MCP_PORT_ENV,
+    MCP_TRANSPORT_ENV,
+    MCP_TRANSPORTS,
     MCP_WEBSITE_URL,
+    PROFILE_DEFAULT_MEMORY_CAP_MB,
+    PROFILE_MEMORY_CAP_ENV,
+    PROFILES_DIR_ENV,
+    RELOAD_DEFAULT_INTERVAL,
+    RELOAD_INTERVAL_ENV,
 )
 from src.prompts.registry import register_prompts
 from src.resources.registry import register_resources
+from src.resources.subscriptions import register_subscriptions
 from src.tools.registry import register_tools
+from src.util.metrics import PROMETHEUS_CONTENT_TYPE, instrument, metrics
+from src.util.profiles import ProfileRegistry, set_profiles
+from src.util.store import get_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +37,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(MCP_NAME)
 
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
 
 mcp = FastMCP(
     name=MCP_NAME,
@@ -26,11 +48,89 @@ mcp = FastMCP(
 
 register_tools(mcp)
 register_resources(mcp)
+register_subscriptions(mcp)
 register_prompts(mcp)
+instrument(mcp)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> Response:
+    """Prometheus scrape endpoint, served alongside the sse/streamable-http transports."""
+    return Response(metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog=MCP_NAME, description=MCP_INSTRUCTIONS)
+    parser.add_argument(
+        "--transport",
+        choices=MCP_TRANSPORTS,
+        default=os.environ.get(MCP_TRANSPORT_ENV, "stdio"),
+        help=f"Transport to serve over (env: {MCP_TRANSPORT_ENV}, default: stdio)",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.environ.get(MCP_HOST_ENV, MCP_DEFAULT_HOST),
+        help=f"Bind address for sse/streamable-http (env: {MCP_HOST_ENV}, default: {MCP_DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.environ.get(MCP_PORT_ENV, MCP_DEFAULT_PORT)),
+        help=f"Port for sse/streamable-http (env: {MCP_PORT_ENV}, default: {MCP_DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=float(os.environ.get(RELOAD_INTERVAL_ENV, RELOAD_DEFAULT_INTERVAL)),
+        help=f"Seconds between checks for edited resources, 0 to disable "
+        f"(env: {RELOAD_INTERVAL_ENV}, default: {RELOAD_DEFAULT_INTERVAL})",
+    )
+    parser.add_argument(
+        "--profiles-dir",
+        default=os.environ.get(PROFILES_DIR_ENV),
+        help=f"Directory with one content directory per additional profile, served by name "
+        f"(env: {PROFILES_DIR_ENV}, default: off)",
+    )
+    parser.add_argument(
+        "--profile-memory-mb",
+        type=float,
+        default=float(os.environ.get(PROFILE_MEMORY_CAP_ENV, PROFILE_DEFAULT_MEMORY_CAP_MB)),
+        help=f"Estimated memory loaded profiles may use before the least recently used are dropped "
+        f"(env: {PROFILE_MEMORY_CAP_ENV}, default: {PROFILE_DEFAULT_MEMORY_CAP_MB})",
+    )
+    args = parser.parse_args(argv)
+    if args.transport not in MCP_TRANSPORTS:
+        parser.error(f"invalid transport {args.transport!r} (choose from {', '.join(MCP_TRANSPORTS)})")
+    if args.reload_interval < 0:
+        parser.error("--reload-interval must be >= 0")
+    if args.profile_memory_mb <= 0:
+        parser.error("--profile-memory-mb must be > 0")
+    return args
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+
+    if args.transport != "stdio":
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        # FastMCP only allows loopback Host headers by default; behind a load balancer
+        # the Host header is the public name, so leave validation to the proxy.
+        if args.host not in LOOPBACK_HOSTS:
+            mcp.settings.transport_security = None
+        # Every session shares this process, so pay the disk reads once up front.
+        get_store().preload()
+        logger.info(f"Serving {args.transport} on {args.host}:{args.port}")
+
+    if args.profiles_dir:
+        set_profiles(ProfileRegistry(Path(args.profiles_dir), int(args.profile_memory_mb * 1024 * 1024)))
+        logger.info(f"Serving profiles from {args.profiles_dir}")
 
+    if args.reload_interval:
+        # Edits are picked up in the background and swapped in whole; requests stop stat'ing files.
+        get_store().watch(args.reload_interval)
 
-def main():
-    mcp.run(transport="stdio")
+    mcp.run(transport=args.transport)
 
 
 if __name__ == "__main__":
@@ -21,11 +21,9 @@ def register_prompts(mcp):
         return f"""Based on John Larkin's background, create a concise 2-3 paragraph summary
 highlighting why he would be a strong fit for a {role} position.
 
-To gather the necessary information, use these tools:
-- get_resume() - Full professional background
-- get_work() - Detailed employment history
-- get_projects() - Notable projects demonstrating expertise
-- get_skills() - Technical capabilities
+To gather the necessary information, fetch everything in one call:
+- get_resources(["resume", "work", "projects", "skills"]) - Full professional background, detailed
+  employment history, notable projects demonstrating expertise, and technical capabilities
 
 Focus on:
 1. Relevant experience from work history that aligns with the role
@@ -48,11 +46,9 @@ Keep the summary professional and tailored specifically for a {role} position.""
 {job_description}
 ---
 
-Use these tools to gather information:
-- get_resume() - Full professional background
-- get_work() - Detailed employment history
-- get_skills() - Technical capabilities
-- get_projects() - Project portfolio
+Gather information in one call:
+- get_resources(["resume", "work", "skills", "projects"]) - Full professional background, detailed
+  employment history, technical capabilities, and project portfolio
 
 Please provide:
 1. **Matching Qualifications**: Skills and experience that directly match job requirements
@@ -74,11 +70,9 @@ Format the analysis in clear sections with bullet points for easy scanning."""
         company_context = f" at {company}" if company else ""
         return f"""Help prepare John Larkin for an interview for a {role} position{company_context}.
 
-Use these tools to understand John's background:
-- get_resume() - Full professional background
-- get_work() - Detailed employment history
-- get_projects() - Project portfolio
-- get_skills() - Technical capabilities
+Understand John's background with one call:
+- get_resources(["resume", "work", "projects", "skills"]) - Full professional background, detailed
+  employment history, project portfolio, and technical capabilities
 
 Generate:
 
@@ -107,7 +101,7 @@ Identify any gaps or areas where John might need to prepare additional context."
         """
         return f"""Provide a comprehensive overview of John Larkin's "{project_name}" project.
 
-Use get_projects() and get_resume() to gather information.
+Use get_resources(["projects", "resume"]) to gather information in one call.
 
 Please include:
 1. **Project Overview**: What the project does and its purpose
@@ -1,5 +1,26 @@
-from src.constants import MCP_VERSION, RESOURCES_DIR, RESUME_DATE_VERSION
-from src.util.resources import load_resource
+import re
+from urllib.parse import unquote
+
+from mcp import types
+
+from src.constants import (
+    BATCH_URI,
+    CONTENT_PAGES_URI,
+    MCP_VERSION,
+    PROFILE_CONTENT_URI,
+    PROFILE_PAGES_URI,
+    PROFILE_RESUME_PDF_URI,
+    RESUME_DATE_VERSION,
+    RESUME_PDF_MAX_CHUNK_BYTES,
+    RESUME_PDF_URI,
+)
+from src.util.batch import aload_batch
+from src.util.metrics import PROMETHEUS_CONTENT_TYPE, metrics
+from src.util.pagination import format_page
+from src.util.profiles import ause_profile
+from src.util.resources import aload_page, aload_resume_pdf
+
+PROFILE_RESUME_PDF_PATTERN = re.compile(re.escape(PROFILE_RESUME_PDF_URI).replace(r"\{profile\}", "(?P<profile>[^/]+)"))
 
 
 def register_resources(mcp):
@@ -11,35 +32,112 @@ def register_resources(mcp):
     def get_resume_version() -> str:
         return RESUME_DATE_VERSION
 
+    @mcp.resource("config://stats", mime_type=PROMETHEUS_CONTENT_TYPE)
+    def get_stats() -> str:
+        return metrics.render_prometheus()
+
     @mcp.resource("larkin://resume")
-    def get_resume() -> str:
-        return load_resource("resume")
+    async def get_resume() -> str:
+        return await _read_page("resume")
+
+    @mcp.resource(RESUME_PDF_URI, mime_type="application/pdf")
+    async def get_resume_pdf() -> bytes:
+        # Only reached when called in-process; protocol reads go through _serve_cached_pdf.
+        return (await aload_resume_pdf()).data
 
-    @mcp.resource("larkin://resume.pdf", mime_type="application/pdf")
-    def get_resume_pdf() -> bytes:
-        pdf_path = RESOURCES_DIR / "resume" / "larkin_resume.pdf"
-        return pdf_path.read_bytes()
+    @mcp.resource(RESUME_PDF_URI + "/{offset}/{length}", mime_type="application/pdf")
+    async def get_resume_pdf_range(offset: int, length: int) -> bytes:
+        """Return ``length`` bytes of the resume PDF starting at ``offset``."""
+        if offset < 0 or length <= 0 or length > RESUME_PDF_MAX_CHUNK_BYTES:
+            raise ValueError(f"offset must be >= 0 and length in 1..{RESUME_PDF_MAX_CHUNK_BYTES}")
+        entry = await aload_resume_pdf()
+        return entry.data[offset : offset + length]
 
     @mcp.resource("larkin://bio")
-    def get_bio() -> str:
-        return load_resource("bio")
+    async def get_bio() -> str:
+        return await _read_page("bio")
 
     @mcp.resource("larkin://projects")
-    def get_projects() -> str:
-        return load_resource("projects")
+    async def get_projects() -> str:
+        return await _read_page("projects")
 
     @mcp.resource("larkin://contact")
-    def get_contact() -> str:
-        return load_resource("contact")
+    async def get_contact() -> str:
+        return await _read_page("contact")
 
     @mcp.resource("larkin://skills")
-    def get_skills() -> str:
-        return load_resource("skills")
+    async def get_skills() -> str:
+        return await _read_page("skills")
 
     @mcp.resource("larkin://work")
-    def get_work() -> str:
-        return load_resource("work")
+    async def get_work() -> str:
+        return await _read_page("work")
 
     @mcp.resource("larkin://tennis")
-    def get_tennis_info() -> str:
-        return load_resource("tennis")
+    async def get_tennis_info() -> str:
+        return await _read_page("tennis")
+
+    @mcp.resource(CONTENT_PAGES_URI)
+    async def get_page(resource: str, cursor: str) -> str:
+        """Return the page of a ``larkin://`` resource that ``cursor`` points at."""
+        return await _read_page(resource, cursor)
+
+    @mcp.resource(BATCH_URI)
+    async def get_batch(items: str) -> str:
+        """Return several resources/sections at once; ``items`` is a comma-separated list as for get_resources."""
+        return await aload_batch([unquote(item) for item in items.split(",")])
+
+    # Registered before PROFILE_CONTENT_URI, whose {resource} would otherwise match "resume.pdf".
+    @mcp.resource(PROFILE_RESUME_PDF_URI, mime_type="application/pdf")
+    async def get_profile_resume_pdf(profile: str) -> bytes:
+        """Return another hosted profile's resume PDF."""
+        async with ause_profile(profile):
+            return (await aload_resume_pdf()).data
+
+    @mcp.resource(PROFILE_CONTENT_URI)
+    async def get_profile_resource(profile: str, resource: str) -> str:
+        """Return a resource of another hosted profile (see the ``list_profiles`` tool)."""
+        async with ause_profile(profile):
+            return await _read_page(resource, pages_uri=_profile_pages_uri(profile))
+
+    @mcp.resource(PROFILE_PAGES_URI)
+    async def get_profile_page(profile: str, resource: str, cursor: str) -> str:
+        """Return the page of a profile's resource that ``cursor`` points at."""
+        async with ause_profile(profile):
+            return await _read_page(resource, cursor, pages_uri=_profile_pages_uri(profile))
+
+    _serve_cached_pdf(mcp)
+
+
+async def _read_page(resource: str, cursor: str | None = None, pages_uri: str = CONTENT_PAGES_URI) -> str:
+    """Read one bounded page; a trailer names the ``pages_uri`` of the next one."""
+    page = await aload_page(resource, cursor)
+    return format_page(page, pages_uri.format(resource=resource, cursor="{cursor}"))
+
+
+def _profile_pages_uri(profile: str) -> str:
+    return PROFILE_PAGES_URI.format(profile=profile, resource="{resource}", cursor="{cursor}")
+
+
+def _serve_cached_pdf(mcp):
+    """Answer protocol reads of the resume PDF (the default one or a profile's) with its cached base64 encoding.
+
+    The low-level server base64-encodes any ``bytes`` a resource returns, on every
+    read. The store already keeps the encoding for the current file version, so
+    this wraps the read handler to hand that string straight to the client.
+    """
+    server = mcp._mcp_server
+    default_handler = server.request_handlers[types.ReadResourceRequest]
+
+    async def handler(req: types.ReadResourceRequest) -> types.ServerResult:
+        uri = str(req.params.uri)
+        match = PROFILE_RESUME_PDF_PATTERN.fullmatch(uri)
+        if uri != RESUME_PDF_URI and match is None:
+            return await default_handler(req)
+
+        async with ause_profile(match["profile"] if match else None):
+            entry = await aload_resume_pdf()
+        contents = types.BlobResourceContents(uri=req.params.uri, blob=entry.base64, mimeType="application/pdf")
+        return types.ServerResult(types.ReadResourceResult(contents=[contents]))
+
+    server.request_handlers[types.ReadResourceRequest] = handler
@@ -0,0 +1,158 @@
+"""Resource subscriptions, change notifications and ETags.
+
+Clients subscribe to ``larkin://<resource>`` (or any page of it, or
+``larkin://resume.pdf`` and its byte ranges) and receive
+``notifications/resources/updated`` when that resource's content hash changes,
+instead of re-reading it to find out. The resource list itself is fixed at
+registration, so ``list_changed`` is never sent. Change detection piggybacks on
+the store's snapshot swaps (see ``ContentStore.watch``), so nothing is polled
+per client.
+Only the default content is followed: ``larkin://profiles/...`` URIs can be
+subscribed to but never receive updates, since a profile's store is dropped
+whenever the registry evicts it.
+
+Each ``larkin://`` read carries its ETag (and the corpus version id that
+``get_changes`` accepts) in ``_meta``, and ``config://etags`` lists every ETag,
+so a client can check one small document before re-downloading.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+
+from mcp import types
+from mcp.server.session import ServerSession
+
+from src.constants import CONTENT_URI, ETAGS_URI, RESOURCES_CATEGORIES, RESUME_PDF_RESOURCE, RESUME_PDF_URI
+from src.util.aio import run_blocking
+from src.util.store import ContentStore, Snapshot, get_store
+
+logger = logging.getLogger(__name__)
+
+CONTENT_URI_PREFIX = CONTENT_URI.format(resource="")
+PAGES_URI_PREFIX = f"{CONTENT_URI_PREFIX}pages/"
+
+
+def resource_for_uri(uri: str) -> str | None:
+    """Return the resource a ``larkin://`` URI (whole resource, one of its pages or a PDF range) reads, if any."""
+    if uri == RESUME_PDF_URI or uri.startswith(f"{RESUME_PDF_URI}/"):
+        return RESUME_PDF_RESOURCE
+    if uri.startswith(PAGES_URI_PREFIX):
+        name = uri.removeprefix(PAGES_URI_PREFIX).split("/", 1)[0]
+    elif uri.startswith(CONTENT_URI_PREFIX):
+        name = uri.removeprefix(CONTENT_URI_PREFIX)
+    else:
+        return None
+    return name if name in RESOURCES_CATEGORIES else None
+
+
+class SubscriptionManager:
+    """Tracks which sessions subscribed to which URIs and notifies them when content changes."""
+
+    def __init__(self) -> None:
+        self._subscriptions: weakref.WeakKeyDictionary[ServerSession, set[str]] = weakref.WeakKeyDictionary()
+        self._watched: weakref.WeakSet[ContentStore] = weakref.WeakSet()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, session: ServerSession, uri: str, store: ContentStore) -> None:
+        """Send ``session`` an update whenever the resource behind ``uri`` changes in ``store``."""
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            if store not in self._watched:
+                self._watched.add(store)
+                store.add_listener(self.on_swap)
+            self._subscriptions.setdefault(session, set()).add(uri)
+
+    def unsubscribe(self, session: ServerSession, uri: str) -> None:
+        with self._lock:
+            self._subscriptions.get(session, set()).discard(uri)
+
+    def subscribers(self, uri: str) -> list[ServerSession]:
+        with self._lock:
+            return [session for session, uris in self._subscriptions.items() if uri in uris]
+
+    def on_swap(self, old: Snapshot, new: Snapshot) -> None:
+        """Store listener: work out what changed and hand the notifications to the event loop."""
+        old_etags, new_etags = old.etags(), new.etags()
+        changed = {name for name in old_etags.keys() | new_etags.keys() if old_etags.get(name) != new_etags.get(name)}
+        if not changed or self._loop is None or self._loop.is_closed():
+            return
+        # Swaps happen on the watcher thread or a worker thread; sessions belong to the loop.
+        asyncio.run_coroutine_threadsafe(self.notify(changed), self._loop)
+
+    async def notify(self, changed: set[str]) -> None:
+        with self._lock:
+            targets = [
+                (session, [uri for uri in uris if resource_for_uri(uri) in changed])
+                for session, uris in self._subscriptions.items()
+            ]
+
+        for session, uris in targets:
+            for uri in uris:
+                await self._send(session, session.send_resource_updated(types.AnyUrl(uri)))
+        logger.info(f"Notified subscribers of changes to {', '.join(sorted(changed))}")
+
+    async def _send(self, session: ServerSession, notification) -> None:
+        try:
+            await notification
+        except Exception as e:
+            # The client went away; forget it rather than failing every later notification.
+            logger.debug(f"Dropping session after failed notification: {e}")
+            with self._lock:
+                self._subscriptions.pop(session, None)
+
+
+subscriptions = SubscriptionManager()
+
+
+def register_subscriptions(mcp, manager: SubscriptionManager = subscriptions) -> None:
+    """Handle resources/subscribe and resources/unsubscribe, tag reads with ETags, and add ``config://etags``.
+
+    Call this after ``register_resources`` so the ETag wrapper sees every read.
+    """
+    server = mcp._mcp_server
+
+    @mcp.resource(ETAGS_URI, mime_type="application/json")
+    async def get_etags() -> str:
+        """Content hash of every ``larkin://`` resource; re-read a resource only when its ETag changed."""
+        snapshot = await run_blocking(get_store().snapshot)
+        return json.dumps({CONTENT_URI.format(resource=name): etag for name, etag in snapshot.etags().items()})
+
+    @server.subscribe_resource()
+    async def subscribe(uri) -> None:
+        manager.subscribe(server.request_context.session, str(uri), get_store())
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri) -> None:
+        manager.unsubscribe(server.request_context.session, str(uri))
+
+    read_resource = server.request_handlers[types.ReadResourceRequest]
+
+    async def read_resource_handler(req: types.ReadResourceRequest) -> types.ServerResult:
+        name = resource_for_uri(str(req.params.uri))
+        if name is None:
+            return await read_resource(req)
+        # Take the ETag first: if the content changes in between, the client sees a stale tag and re-reads.
+        snapshot = await run_blocking(get_store().snapshot)
+        entry = snapshot.entries.get(name) or snapshot.blobs.get(name)
+        result = await read_resource(req)
+        if entry is not None and isinstance(result.root, types.ReadResourceResult):
+            for contents in result.root.contents:
+                contents.meta = {**(contents.meta or {}), "etag": entry.etag, "version": snapshot.content_id}
+        return result
+
+    server.request_handlers[types.ReadResourceRequest] = read_resource_handler
+
+    get_capabilities = server.get_capabilities
+
+    def capabilities(notification_options, experimental_capabilities) -> types.ServerCapabilities:
+        # The low-level server always advertises subscribe=False; this server supports it.
+        result = get_capabilities(notification_options, experimental_capabilities)
+        if result.resources is not None:
+            result.resources.subscribe = True
+        return result
+
+    server.get_capabilities = capabilities
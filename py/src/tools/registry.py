@@ -1,6 +1,57 @@
-from src.constants import MCP_VERSION, MCP_WEBSITE_URL, RESOURCES_CATEGORIES, RESUME_DATE_VERSION
-from src.types.models import HealthCheckResponse, Metadata, ResourceStatus
-from src.util.resources import list_resources, load_resource, search_resources
+from datetime import UTC, datetime
+from typing import Annotated
+
+from pydantic import Field
+
+from src.constants import (
+    CONTENT_PAGE_BYTES,
+    MCP_VERSION,
+    MCP_WEBSITE_URL,
+    RESOURCES_CATEGORIES,
+    RESUME_DATE_VERSION,
+    RESUME_PDF_CHUNK_BYTES,
+    RESUME_PDF_MAX_CHUNK_BYTES,
+    SEARCH_CACHE_SIZE,
+    SEARCH_LINES_PER_RESOURCE,
+    SEARCH_MODES,
+)
+from src.types.models import BinaryChunk, HealthCheckResponse, Metadata, ResourceStatus
+from src.util.aio import run_blocking
+from src.util.batch import aload_batch
+from src.util.budget import TokenBudget, fit
+from src.util.cache import LRUCache
+from src.util.metrics import metrics
+from src.util.pagination import Page, format_page
+from src.util.profiles import ause_profile, get_profiles
+from src.util.query import normalize_query
+from src.util.resources import (
+    achanges_since,
+    acorrect_query,
+    alist_resources,
+    aload_page,
+    aload_resume_pdf,
+    aload_section,
+    asearch_resources,
+    asearch_sections,
+    atable_of_contents,
+)
+from src.util.store import ContentStore, get_store
+
+# Arguments shared by the whole-resource tools (get_resume, get_bio, ...), described once in their schemas.
+PageCursor = Annotated[
+    str | None, Field(description="Cursor from the previous page's trailer; omit for the first page")
+]
+PageLimit = Annotated[int, Field(description="Page size in bytes; longer documents are split into pages")]
+PageMaxTokens = Annotated[
+    int | None,
+    Field(description="Instead of paging, pack whole sections into this many tokens and list the ones left out"),
+]
+# The ``profile`` argument of every content tool.
+ProfileName = Annotated[str | None, Field(description="Serve another hosted profile's content (see list_profiles)")]
+
+# Formatted search_info output; "" records a query with no matches.
+search_cache: LRUCache[str] = LRUCache("search_info", SEARCH_CACHE_SIZE)
+metrics.add_collector(search_cache.prometheus_lines)
 
 
 def register_tools(mcp):
@@ -16,74 +67,300 @@ def register_tools(mcp):
         )
 
     @mcp.tool()
-    def get_resume() -> str:
+    async def get_resume(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return the full resume content as Markdown."""
-        return load_resource("resume")
+        return await _read_content("resume", cursor, limit, max_tokens, profile)
 
     @mcp.tool()
-    def get_bio() -> str:
+    async def get_bio(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return the extended biography content."""
-        return load_resource("bio")
+        return await _read_content("bio", cursor, limit, max_tokens, profile)
 
     @mcp.tool()
-    def get_contact() -> str:
+    async def get_contact(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return contact instructions for reaching John."""
-        return load_resource("contact")
+        return await _read_content("contact", cursor, limit, max_tokens, profile)
 
     @mcp.tool()
-    def get_projects() -> str:
+    async def get_projects(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return the curated list of noteworthy projects."""
-        return load_resource("projects")
+        return await _read_content("projects", cursor, limit, max_tokens, profile)
 
     @mcp.tool()
-    def get_skills() -> str:
+    async def get_skills(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return the current skills overview."""
-        return load_resource("skills")
+        return await _read_content("skills", cursor, limit, max_tokens, profile)
 
     @mcp.tool()
-    def get_work() -> str:
+    async def get_work(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return detailed work experience and employment history."""
-        return load_resource("work")
+        return await _read_content("work", cursor, limit, max_tokens, profile)
 
     @mcp.tool()
-    def get_tennis_info() -> str:
+    async def get_tennis_info(
+        cursor: PageCursor = None,
+        limit: PageLimit = CONTENT_PAGE_BYTES,
+        max_tokens: PageMaxTokens = None,
+        profile: ProfileName = None,
+    ) -> str:
         """Return collegiate tennis career information including awards and match records."""
-        return load_resource("tennis")
+        return await _read_content("tennis", cursor, limit, max_tokens, profile)
+
+    @mcp.tool()
+    async def get_section(
+        resource: str,
+        section: str,
+        cursor: str | None = None,
+        limit: int = CONTENT_PAGE_BYTES,
+        max_tokens: int | None = None,
+        profile: ProfileName = None,
+    ) -> str:
+        """Return a single section of a resource, selected by heading name or path.
+
+        ``section`` matches a heading case-insensitively (e.g. ``"Dropbox"``) or a
+        path of headings separated by ``/`` or ``>`` (e.g. ``"2015-2016 Season/Singles"``).
+        The section is returned with all of its subsections, in pages of at most ``limit`` bytes,
+        or packed into ``max_tokens`` with the subsections that did not fit listed at the end.
+        """
+        async with ause_profile(profile):
+            return _format_tool_page(await aload_section(resource, section, cursor, limit, max_tokens))
+
+    @mcp.tool()
+    async def get_resources(items: list[str], max_tokens: int | None = None, profile: ProfileName = None) -> str:
+        """Return several resources and/or sections in one call, deduplicated, each under a ``<!-- label -->`` line.
+
+        Each item is a resource name (``"work"``) or ``resource:section``
+        (``"resume:Work Experience > Dropbox"``), with the section matched as in
+        ``get_section``. Prefer this over calling several ``get_*`` tools in a row.
+        """
+        async with ause_profile(profile):
+            return await aload_batch(items, max_tokens)
+
+    @mcp.tool()
+    async def get_table_of_contents(resource: str | None = None, profile: ProfileName = None) -> str:
+        """Return the heading outline of one resource (or all of them) with line numbers and token sizes.
+
+        Use it to pick a section for ``get_section`` instead of fetching whole documents.
+        """
+        async with ause_profile(profile):
+            return await atable_of_contents(resource)
+
+    @mcp.tool()
+    async def get_changes(since: str | None = None, resource: str | None = None, profile: ProfileName = None) -> str:
+        """Return only the sections added, removed or changed since content version ``since``.
+
+        Call it without ``since`` to get the current version id, keep that id with
+        what you fetched, and pass it next time to pay for the delta instead of the
+        whole corpus. Limit the diff to one ``resource`` if you only hold that one.
+        Only recent versions are remembered; an expired one is an error, and the
+        resources should then be fetched in full.
+        """
+        async with ause_profile(profile):
+            return await achanges_since(since, resource)
+
+    @mcp.tool()
+    async def get_resume_pdf_chunk(
+        offset: int = 0, length: int = RESUME_PDF_CHUNK_BYTES, profile: ProfileName = None
+    ) -> BinaryChunk:
+        """Return one base64-encoded chunk of the resume PDF so it can be fetched in pieces."""
+        if offset < 0:
+            raise ValueError("offset must be >= 0")
+        if not 0 < length <= RESUME_PDF_MAX_CHUNK_BYTES:
+            raise ValueError(f"length must be between 1 and {RESUME_PDF_MAX_CHUNK_BYTES}")
+
+        async with ause_profile(profile):
+            entry = await aload_resume_pdf()
+        offset = min(offset, entry.size)
+        end = min(offset + length, entry.size)
+        return BinaryChunk(
+            offset=offset,
+            length=end - offset,
+            total_size=entry.size,
+            data_base64=entry.base64_range(offset, length),
+            next_offset=end if end < entry.size else None,
+        )
 
     @mcp.tool()
-    def get_available_resources() -> list[str]:
+    async def get_available_resources(profile: ProfileName = None) -> list[str]:
         """Return identifiers for all available content resources."""
-        return list_resources()
+        async with ause_profile(profile):
+            return await alist_resources()
 
     @mcp.tool()
-    def search_info(query: str) -> str:
-        """Return a formatted summary of resources matching the query string."""
-        results = search_resources(query)
+    async def list_profiles() -> list[str]:
+        """Return the names of the other profiles this server hosts; pass one as ``profile`` to any content tool.
 
-        if not results:
-            return f"No matches found for '{query}'"
+        Empty when the server only serves its default content.
+        """
+        registry = get_profiles()
+        return await run_blocking(registry.names) if registry is not None else []
 
-        output = []
-        for resource, lines in results.items():
-            output.append(f"## {resource.title()}")
-            output.extend(f"  - {line.strip()}" for line in lines[:5])
+    @mcp.tool()
+    async def search_info(
+        query: str, max_tokens: int | None = None, mode: str = "keyword", profile: ProfileName = None
+    ) -> str:
+        """Return a formatted summary of resources matching the query string, most relevant first.
 
-        return "\n".join(output)
+        ``mode="keyword"`` (default) returns line-numbered snippets of lines containing every
+        query word, with the matches in bold, grouped by resource; a misspelled word matches
+        its closest indexed words instead. Keyword queries also accept AND, OR, NOT (or
+        ``-word``), parentheses, ``"quoted phrases"``, prefix wildcards (``pyth*``) and
+        ``resource:``/``section:`` filters, e.g.
+        ``(python OR go) section:"Work Experience" -resource:projects``. ``mode="semantic"``
+        ranks individual sections by TF-IDF similarity, so sections can match on some of the
+        words or on word fragments. ``max_tokens`` keeps the summary within that budget,
+        dropping the least relevant matches first.
+        """
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError("max_tokens must be >= 1")
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
+
+        async with ause_profile(profile) as active:
+            # Each profile caches its own responses, so one busy profile cannot flush another's.
+            cache = search_cache if active is None else active.search_cache
+            # Search is case-insensitive (except for operators), so these queries share results.
+            key = (normalize_query(query), max_tokens, mode)
+            # One snapshot per request: the cached output is keyed by the content it was computed from.
+            snapshot = await run_blocking(get_store().snapshot)
+            output = cache.get(key, snapshot.content_id)
+            if output is None:
+                if mode == "semantic":
+                    results = await asearch_sections(query, snapshot=snapshot)
+                else:
+                    hits = await asearch_resources(query, snapshot)
+                    results = {resource.title(): lines for resource, lines in hits.items()}
+                output = _format_search_results(results, max_tokens) if results else ""
+                if output and mode == "keyword" and (corrections := await acorrect_query(query, snapshot)):
+                    matched = ", ".join(f"'{alternative}' for '{term}'" for term, alternative in corrections.items())
+                    output = f"_No exact match; showing {matched}._\n\n{output}"
+                cache.put(key, snapshot.content_id, output)
+
+        return output or f"No matches found for '{query}'"
+
+    @mcp.tool()
+    def get_server_stats() -> str:
+        """Return per-tool and per-resource call counts, errors, latency histograms and payload sizes.
+
+        The output uses the Prometheus text exposition format.
+        """
+        return metrics.render_prometheus()
 
     @mcp.tool()
-    def health_check() -> HealthCheckResponse:
+    async def health_check(profile: ProfileName = None) -> HealthCheckResponse:
         """Return server health status and resource availability."""
-        resources_status = {}
-        for resource in RESOURCES_CATEGORIES:
-            content = load_resource(resource)
-            is_available = not content.startswith("Resource '") and not content.startswith("Error")
-            resources_status[resource] = ResourceStatus(
-                available=is_available,
-                size_bytes=len(content.encode()) if is_available else 0,
-            )
-
-        return HealthCheckResponse(
-            status="healthy",
-            version=MCP_VERSION,
-            resources=resources_status,
+        async with ause_profile(profile):
+            store = get_store()
+            if not store.preloaded:
+                await run_blocking(store.preload)
+            return _health_from_store(store)
+
+
+def _format_search_results(results: dict[str, list[str]], max_tokens: int | None = None) -> str:
+    """Render up to SEARCH_LINES_PER_RESOURCE lines under each result heading, within ``max_tokens`` if given."""
+
+    def build(budget: TokenBudget | None) -> str:
+        output: list[str] = []
+        for resource, lines in results.items():
+            shown = [f"  - {line.strip()}" for line in lines[:SEARCH_LINES_PER_RESOURCE]]
+            header = f"## {resource}"
+            if budget is None:
+                output.append(header)
+                output.extend(shown)
+                continue
+
+            # A header is only worth its tokens together with at least one match.
+            if not shown or not budget.take(f"{header}\n{shown[0]}\n"):
+                budget.omit(f"{resource} ({len(shown)} lines)")
+                continue
+            output.extend((header, shown[0]))
+            for i, line in enumerate(shown[1:], start=1):
+                if not budget.take(line + "\n"):
+                    budget.omit(f"{resource} ({len(shown) - i} more lines)")
+                    break
+                output.append(line)
+        return "\n".join(output)
+
+    if max_tokens is None:
+        return build(None)
+
+    def note(omitted: str) -> str:
+        return f"<!-- omitted to fit max_tokens={max_tokens}: {omitted} -->"
+
+    return fit(build, max_tokens, note)
+
+
+async def _read_content(
+    resource: str, cursor: str | None, limit: int, max_tokens: int | None, profile: str | None
+) -> str:
+    """Serve one page of ``resource`` (or a ``max_tokens`` pack of its sections) from ``profile``'s content."""
+    async with ause_profile(profile):
+        return _format_tool_page(await aload_page(resource, cursor, limit, max_tokens))
+
+
+def _format_tool_page(page: Page) -> str:
+    return format_page(page, "cursor='{cursor}'")
+
+
+def _health_from_store(store: ContentStore) -> HealthCheckResponse:
+    """Summarize health from what the store already knows, without touching the filesystem."""
+    resources_status = {}
+    for resource in RESOURCES_CATEGORIES:
+        # A failed reload leaves the last good entry cached, so the error wins.
+        error = store.error(resource)
+        entry = None if error else store.cached(resource)
+        resources_status[resource] = ResourceStatus(
+            available=entry is not None,
+            size_bytes=entry.size if entry else 0,
+            last_loaded=_isoformat(entry.loaded_at) if entry else None,
+            error=None if entry else error or "not loaded",
         )
+
+    available = sum(status.available for status in resources_status.values())
+    if available == len(resources_status):
+        status = "healthy"
+    elif available:
+        status = "degraded"
+    else:
+        status = "unhealthy"
+
+    return HealthCheckResponse(
+        status=status,
+        version=MCP_VERSION,
+        resources=resources_status,
+        last_reload=_isoformat(store.last_reload) if store.last_reload else None,
+    )
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=UTC).isoformat()
@@ -10,9 +10,20 @@ class Metadata(BaseModel):
 class ResourceStatus(BaseModel):
     available: bool = Field(description="Whether the resource exists and is readable")
     size_bytes: int = Field(default=0, description="Size of the resource in bytes")
+    last_loaded: str | None = Field(default=None, description="ISO 8601 time the resource was last (re)loaded")
+    error: str | None = Field(default=None, description="Why the resource is unavailable, if it is")
 
 
 class HealthCheckResponse(BaseModel):
-    status: str = Field(description="Server health status (e.g., 'healthy')")
+    status: str = Field(description="Server health status: 'healthy', 'degraded' or 'unhealthy'")
     version: str = Field(description="MCP server version")
     resources: dict[str, ResourceStatus] = Field(description="Status of each resource")
+    last_reload: str | None = Field(default=None, description="ISO 8601 time any resource was last (re)loaded")
+
+
+class BinaryChunk(BaseModel):
+    offset: int = Field(description="Byte offset of this chunk within the file")
+    length: int = Field(description="Number of bytes in this chunk")
+    total_size: int = Field(description="Total size of the file in bytes")
+    data_base64: str = Field(description="Base64-encoded chunk bytes")
+    next_offset: int | None = Field(default=None, description="Offset of the next chunk, or null at end of file")
@@ -0,0 +1,24 @@
+"""Helpers for keeping blocking work off the event loop.
+
+Handlers run on the server's event loop, so anything that touches the disk is
+pushed onto a bounded worker pool. One slow read then only ties up a worker
+thread instead of stalling every other session on the same process.
+"""
+
+import functools
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from src.constants import IO_THREAD_LIMIT
+
+T = TypeVar("T")
+
+_io_limiter = anyio.CapacityLimiter(IO_THREAD_LIMIT)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``func`` in the shared I/O thread pool and await its result."""
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_io_limiter)
@@ -0,0 +1,128 @@
+"""Fetch several resources and sections in one request.
+
+Items are resource names (``"work"``) or ``resource:section`` pairs
+(``"resume:Work Experience > Dropbox"``), where the section is matched as in
+``get_section``. Duplicates are dropped: a whole resource subsumes any of its
+sections, and a section subsumes the subsections inside it.
+"""
+
+from dataclasses import dataclass
+
+from src.constants import BATCH_MAX_ITEMS
+from src.util.aio import run_blocking
+from src.util.budget import TokenBudget, fit
+from src.util.resources import load_resource
+from src.util.store import get_store
+
+ITEM_SEPARATOR = ":"
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    resource: str
+    section: str | None = None
+
+
+def parse_items(items: list[str]) -> list[BatchItem]:
+    """Parse and de-duplicate item strings, keeping first-seen order."""
+    if not items:
+        raise ValueError("items must name at least one resource")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"at most {BATCH_MAX_ITEMS} items can be fetched at once")
+
+    parsed: dict[BatchItem, None] = {}
+    for item in items:
+        resource, _, section = item.partition(ITEM_SEPARATOR)
+        resource, section = resource.strip().lower(), section.strip()
+        if not resource:
+            raise ValueError(f"'{item}' does not name a resource")
+        parsed.setdefault(BatchItem(resource, section or None), None)
+
+    whole = {item.resource for item in parsed if item.section is None}
+    return [item for item in parsed if item.section is None or item.resource not in whole]
+
+
+@dataclass(frozen=True)
+class _Block:
+    label: str
+    text: str
+    resource: str | None = None
+    start: int = 0
+    end: int = 0
+
+    def covers(self, resource: str, start: int, end: int) -> bool:
+        return self.resource == resource and self.start <= start and end <= self.end
+
+
+def load_batch(items: list[str], max_tokens: int | None = None) -> str:
+    """Return every requested resource and section, each under an ``<!-- label -->`` marker.
+
+    Items that cannot be resolved, including names that are not resources, are
+    reported inline rather than failing the whole batch. With ``max_tokens``,
+    items are taken in request order and each one that no longer fits the
+    remaining budget is listed as omitted; later, smaller items may still fit.
+    """
+    from src.util.sections import get_section_trees
+
+    blocks: list[_Block] = []
+    # Every item is read from the same snapshot, so a concurrent reload cannot mix versions.
+    store = get_store()
+    snapshot = store.snapshot()
+    trees = None
+
+    for item in parse_items(items):
+        if item.resource not in store.categories:
+            # Only the store's own resources are served; an item never names a path.
+            blocks.append(_Block(_label(item), f"Resource '{item.resource}' not found."))
+            continue
+        if item.section is None:
+            entry = snapshot.entries.get(item.resource)
+            # load_resource supplies the usual not-found / read-error message.
+            blocks.append(_Block(item.resource, entry.text if entry else load_resource(item.resource)))
+            continue
+
+        trees = get_section_trees(snapshot) if trees is None else trees
+        tree = trees.get(item.resource)
+        match = tree.find(item.section) if tree else None
+        if tree is None or match is None:
+            blocks.append(_Block(_label(item), f"No section matching '{item.section}' in '{item.resource}'."))
+            continue
+
+        # Skip sections an earlier item already covers, and drop earlier ones this one covers.
+        if any(block.covers(item.resource, match.start, match.end) for block in blocks):
+            continue
+        blocks = [
+            block
+            for block in blocks
+            if not (block.resource == item.resource and match.start <= block.start and block.end <= match.end)
+        ]
+        label = f"{item.resource}{ITEM_SEPARATOR}{' / '.join(match.path)}"
+        blocks.append(_Block(label, tree.text(match), item.resource, match.start, match.end))
+
+    def render(kept: list[_Block]) -> str:
+        return "\n\n".join(f"<!-- {block.label} -->\n{block.text.rstrip()}" for block in kept)
+
+    if max_tokens is None:
+        return render(blocks)
+
+    def build(budget: TokenBudget) -> str:
+        kept = []
+        for block in blocks:
+            if budget.take(render([block]) + "\n\n"):
+                kept.append(block)
+            else:
+                budget.omit(block.label)
+        return render(kept)
+
+    def note(omitted: str) -> str:
+        return f"<!-- omitted to fit max_tokens={max_tokens}: {omitted}. Fetch them individually. -->"
+
+    return fit(build, max_tokens, note)
+
+
+def _label(item: BatchItem) -> str:
+    return item.resource if item.section is None else f"{item.resource}{ITEM_SEPARATOR}{item.section}"
+
+
+async def aload_batch(items: list[str], max_tokens: int | None = None) -> str:
+    return await run_blocking(load_batch, items, max_tokens)
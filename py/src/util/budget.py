@@ -0,0 +1,123 @@
+"""Token budgets for tool responses.
+
+Tools that accept ``max_tokens`` pack whole sections (or search snippets) in
+priority order until the budget is spent, skip what does not fit, and end the
+response with a note listing what was left out so the client can fetch it
+separately. Token counts use the estimator in :mod:`src.util.tokens`, and the
+note itself counts against the budget.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from src.util.tokens import estimate_tokens
+
+# Largest fraction of a budget spent listing what was omitted.
+NOTE_SHARE = 0.2
+
+if TYPE_CHECKING:
+    from src.util.sections import Section, SectionTree
+
+
+class TokenBudget:
+    """Running token allowance plus a record of what was omitted to stay within it."""
+
+    def __init__(self, max_tokens: int):
+        self.remaining = max_tokens
+        self.omitted: list[str] = []
+
+    def take(self, text: str) -> bool:
+        """Spend the tokens for ``text`` if they fit and return whether they did."""
+        cost = estimate_tokens(text)
+        if cost > self.remaining:
+            return False
+        self.remaining -= cost
+        return True
+
+    def omit(self, description: str) -> None:
+        self.omitted.append(description)
+
+
+def fit(build: Callable[[TokenBudget], str], max_tokens: int, note: Callable[[str], str]) -> str:
+    """Run ``build`` against a budget, append a note on what it omitted, and keep the total in budget.
+
+    ``note`` receives the omitted items as one string. At most NOTE_SHARE of the
+    budget goes to naming them; the rest are summarized as "and N more". When the
+    note does not fit, ``build`` is rerun with a budget shrunk by the overflow; only
+    a budget too small for the note itself can be exceeded.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be >= 1")
+
+    allowance = max_tokens
+    while True:
+        budget = TokenBudget(allowance)
+        text = build(budget)
+        if not budget.omitted:
+            return text
+        message = note(_list_omitted(budget.omitted, max(1, int(max_tokens * NOTE_SHARE))))
+        output = f"{text}\n\n{message}" if text else message
+        overflow = estimate_tokens(output) - max_tokens
+        if overflow <= 0 or allowance <= 0:
+            return output
+        allowance -= overflow
+
+
+def _list_omitted(omitted: list[str], max_tokens: int) -> str:
+    listed: list[str] = []
+    for item in omitted:
+        if listed and estimate_tokens("; ".join([*listed, item])) > max_tokens:
+            break
+        listed.append(item)
+    rest = len(omitted) - len(listed)
+    return "; ".join(listed) + (f"; and {rest} more" if rest else "")
+
+
+def pack_sections(tree: "SectionTree", max_tokens: int, section: "Section | None" = None) -> str:
+    """Return as much of ``section`` (or the whole document) as fits in ``max_tokens``, in document order.
+
+    A section that does not fit is replaced by its heading and introduction plus
+    whichever of its subsections do fit; one with nothing that fits is omitted.
+    """
+
+    def build(budget: TokenBudget) -> str:
+        parts: list[str] = []
+
+        def visit(node: "Section") -> None:
+            text = tree.text(node)
+            if budget.take(text):
+                parts.append(text)
+                return
+            if node.children:
+                intro = tree.data[node.start : node.children[0].start].decode()
+                if budget.take(intro):
+                    kept, omitted = len(parts), len(budget.omitted)
+                    parts.append(intro)
+                    for child in node.children:
+                        visit(child)
+                    if len(parts) > kept + 1:
+                        return
+                    # No subsection fit, so a bare heading is not worth its tokens: omit the whole section.
+                    del parts[kept:], budget.omitted[omitted:]
+                    budget.remaining += estimate_tokens(intro)
+            # Drop a lone document title from the path; get_section matches path suffixes anyway.
+            path = node.path[1:] if len(tree.roots) == 1 and len(node.path) > 1 else node.path
+            budget.omit(f"{' / '.join(path)} (~{estimate_tokens(text)} tokens)")
+
+        if section is not None:
+            visit(section)
+        else:
+            first = tree.roots[0].start if tree.roots else len(tree.data)
+            preamble = tree.data[:first].decode()
+            if preamble and budget.take(preamble):
+                parts.append(preamble)
+            elif preamble:
+                budget.omit(f"text before the first heading (~{estimate_tokens(preamble)} tokens)")
+            for root in tree.roots:
+                visit(root)
+        return "".join(parts).rstrip("\n")
+
+    def note(omitted: str) -> str:
+        return f"<!-- {tree.name}: omitted to fit max_tokens={max_tokens}: {omitted}. Fetch them with get_section. -->"
+
+    return fit(build, max_tokens, note)
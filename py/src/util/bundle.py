@@ -0,0 +1,185 @@
+"""Precompiled content bundle for fast cold starts.
+
+A bundle packs every markdown resource, the binary files next to them, the
+search index and per-resource metadata into a single versioned file. The
+server memory-maps it at startup, so a cold process does one sequential read
+instead of a stat/open/read per resource and does not rebuild the index.
+
+Layout::
+
+    MAGIC (8 bytes) | format version (u32) | manifest length (u64)
+    manifest (UTF-8 JSON)
+    payload (resource text, binaries and the serialized index, back to back)
+
+Build one with ``python -m src.util.bundle build``.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.constants import BUNDLE_PATH, RESOURCES_CATEGORIES, RESOURCES_DIR
+from src.util.indexer import build_index
+from src.util.search import SearchIndex
+from src.util.store import ContentStore
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b"LMCPBNDL"
+BUNDLE_FORMAT_VERSION = 2
+_HEADER = struct.Struct(">8sIQ")
+
+
+class BundleFormatError(Exception):
+    def __init__(self, path: Path, reason: str):
+        self.path = path
+        self.reason = reason
+        super().__init__(f"Invalid content bundle {path}: {reason}")
+
+
+@dataclass(frozen=True)
+class BundledFile:
+    path: str
+    offset: int
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class ContentBundle:
+    """Read-only, memory-mapped view of a bundle file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            raise BundleFormatError(path, "file is too short")
+        magic, version, manifest_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != BUNDLE_MAGIC:
+            raise BundleFormatError(path, "bad magic bytes")
+        if version != BUNDLE_FORMAT_VERSION:
+            raise BundleFormatError(path, f"unsupported format version {version}")
+
+        manifest_end = _HEADER.size + manifest_length
+        self.manifest = json.loads(bytes(self._mmap[_HEADER.size : manifest_end]))
+        self._payload = memoryview(self._mmap)[manifest_end:]
+
+        self.resources = {name: BundledFile(**meta) for name, meta in self.manifest["resources"].items()}
+        self.blobs = {rel: BundledFile(**meta) for rel, meta in self.manifest["blobs"].items()}
+
+    @property
+    def content_version(self) -> str:
+        return self.manifest["content_version"]
+
+    def text(self, name: str) -> str:
+        meta = self.resources[name]
+        # Match Path.read_text(), which translates Windows line endings.
+        return bytes(self._payload[meta.offset : meta.offset + meta.size]).decode().replace("\r\n", "\n")
+
+    def blob(self, relative_path: str) -> memoryview:
+        meta = self.blobs[relative_path]
+        return self._payload[meta.offset : meta.offset + meta.size]
+
+    def search_index(self) -> SearchIndex:
+        section = self.manifest["index"]
+        payload = json.loads(bytes(self._payload[section["offset"] : section["offset"] + section["size"]]))
+        return SearchIndex.from_payload(payload, {name: self.text(name) for name in payload["docs"]})
+
+
+def build_bundle(
+    out_path: Path = BUNDLE_PATH,
+    root: Path = RESOURCES_DIR,
+    categories: list[str] = RESOURCES_CATEGORIES,
+) -> dict:
+    """Compile ``root`` into a bundle at ``out_path`` and return its manifest."""
+    started = time.perf_counter()
+    store = ContentStore(root, categories)
+    entries = store.entries()
+
+    payload = bytearray()
+    digest = hashlib.sha256()
+
+    def append(relative_path: str, data: bytes, mtime_ns: int) -> dict:
+        sha = hashlib.sha256(data).hexdigest()
+        digest.update(f"{relative_path}\0{sha}\0".encode())
+        meta = {"path": relative_path, "offset": len(payload), "size": len(data), "mtime_ns": mtime_ns, "sha256": sha}
+        payload.extend(data)
+        return meta
+
+    resources = {}
+    for name, entry in entries.items():
+        data = entry.path.read_bytes()
+        resources[name] = append(entry.path.relative_to(root).as_posix(), data, entry.mtime_ns)
+
+    blobs = {}
+    for path in sorted(p for p in root.rglob("*") if p.is_file() and p.suffix != ".md"):
+        relative_path = path.relative_to(root).as_posix()
+        blobs[relative_path] = append(relative_path, path.read_bytes(), path.stat().st_mtime_ns)
+
+    search_index, _ = build_index({name: entry.text for name, entry in entries.items()})
+    index_bytes = json.dumps(search_index.to_payload(), separators=(",", ":")).encode()
+    index = {"offset": len(payload), "size": len(index_bytes)}
+    payload.extend(index_bytes)
+
+    manifest = {
+        "content_version": digest.hexdigest(),
+        "built_at": time.time(),
+        "resources": resources,
+        "blobs": blobs,
+        "index": index,
+    }
+    manifest_bytes = json.dumps(manifest, separators=(",", ":")).encode()
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        f.write(payload)
+    tmp_path.replace(out_path)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"Built bundle {out_path} ({len(resources)} resources, {len(blobs)} blobs, "
+        f"{out_path.stat().st_size} bytes) in {elapsed_ms:.1f}ms"
+    )
+    return manifest
+
+
+def open_bundle(path: Path = BUNDLE_PATH) -> ContentBundle | None:
+    """Open the bundle at ``path``, or return None if it is missing or unreadable."""
+    if not path.is_file():
+        return None
+    try:
+        return ContentBundle(path)
+    except (OSError, ValueError, KeyError, BundleFormatError) as e:
+        logger.warning(f"Ignoring content bundle {path}: {e}")
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.util.bundle", description="Build the larkin-mcp content bundle"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Compile the content directory into a bundle")
+    build.add_argument("--root", type=Path, default=RESOURCES_DIR, help="Content directory to compile")
+    build.add_argument("--out", type=Path, default=BUNDLE_PATH, help="Where to write the bundle")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "build":
+        manifest = build_bundle(args.out, args.root)
+        print(f"{args.out} {manifest['content_version'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
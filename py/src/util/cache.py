@@ -0,0 +1,83 @@
+"""Bounded LRU cache for computed responses, scoped to a content version.
+
+Entries are only valid for the content version they were computed from. The
+first lookup with a new version drops every entry, so edits to the resources
+never serve stale responses and the cache needs no explicit invalidation hooks.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from src.util.metrics import METRIC_PREFIX
+
+T = TypeVar("T")
+
+
+class LRUCache(Generic[T]):
+    """Thread-safe LRU mapping with hit/miss/eviction/invalidation counters."""
+
+    def __init__(self, name: str, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.name = name
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, T] = OrderedDict()
+        self._version: Hashable = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: Hashable) -> T | None:
+        with self._lock:
+            self._check_version(version)
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, version: Hashable, value: T) -> None:
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _check_version(self, version: Hashable) -> None:
+        if version != self._version:
+            if self._data:
+                self._data.clear()
+                self.invalidations += 1
+            self._version = version
+
+    def prometheus_lines(self) -> list[str]:
+        """Return the counters in Prometheus text format, for ``Metrics.add_collector``."""
+        label = f'cache="{self.name}"'
+        lines = []
+        for suffix, help_text, value in (
+            ("cache_hits_total", "Cache lookups served from the cache.", self.hits),
+            ("cache_misses_total", "Cache lookups that had to be computed.", self.misses),
+            ("cache_evictions_total", "Entries dropped to stay within the size bound.", self.evictions),
+            ("cache_invalidations_total", "Times the cache was emptied because content changed.", self.invalidations),
+            ("cache_entries", "Entries currently cached.", len(self._data)),
+        ):
+            kind = "gauge" if suffix == "cache_entries" else "counter"
+            lines.append(f"# HELP {METRIC_PREFIX}_{suffix} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{suffix} {kind}")
+            lines.append(f"{METRIC_PREFIX}_{suffix}{{{label}}} {value}")
+        return lines
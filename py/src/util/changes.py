@@ -0,0 +1,96 @@
+"""Section-level changes between two content versions.
+
+The store remembers the entries of its last CONTENT_HISTORY_SIZE snapshots by
+content id (a hash of every resource). Given one of those ids, this module
+compares each resource's sections (heading plus text up to the first
+subsection) by heading path and returns only the ones that were added,
+removed or changed, so a client that already holds an old version fetches
+the delta instead of the corpus.
+"""
+
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from src.util.sections import SectionTree
+from src.util.store import ContentEntry, ContentStore
+
+PREAMBLE_LABEL = "(text before the first heading)"
+
+
+@dataclass(frozen=True)
+class SectionChange:
+    kind: str  # "added", "removed" or "changed"
+    label: str
+    text: str = ""
+
+
+def _units(name: str, text: str) -> dict[str, str]:
+    """Own text per section, keyed by heading path; repeated paths are numbered in document order."""
+    units: dict[str, str] = {}
+    seen: Counter[str] = Counter()
+    for path, _, own_text in SectionTree(name, text).units():
+        label = " / ".join(path) or PREAMBLE_LABEL
+        seen[label] += 1
+        units[label if seen[label] == 1 else f"{label} ({seen[label]})"] = own_text
+    return units
+
+
+def diff_resource(name: str, old: str, new: str) -> list[SectionChange]:
+    """Return the sections of ``name`` that differ between ``old`` and ``new``, in document order."""
+    if old == new:
+        return []
+    before, after = _units(name, old), _units(name, new)
+    changes = [
+        SectionChange("added" if label not in before else "changed", label, text)
+        for label, text in after.items()
+        if before.get(label) != text
+    ]
+    changes.extend(SectionChange("removed", label) for label in before if label not in after)
+    return changes
+
+
+def diff_versions(
+    old: Mapping[str, ContentEntry], new: Mapping[str, ContentEntry], resource: str | None = None
+) -> dict[str, list[SectionChange]]:
+    """Return section changes per resource between two sets of entries (only ``resource`` if given)."""
+    names = [name for name in dict.fromkeys([*new, *old]) if resource is None or name == resource]
+    changes = {}
+    for name in names:
+        old_text = old[name].text if name in old else None
+        new_text = new[name].text if name in new else None
+        if old_text is None:
+            changes[name] = [SectionChange("added", "(whole resource)", new_text or "")]
+        elif new_text is None:
+            changes[name] = [SectionChange("removed", "(whole resource)")]
+        elif old[name].etag != new[name].etag and (resource_changes := diff_resource(name, old_text, new_text)):
+            changes[name] = resource_changes
+    return changes
+
+
+def changes_since(store: ContentStore, since: str, resource: str | None = None) -> str:
+    """Render what changed in ``store`` since content version ``since``.
+
+    Raises:
+        ValueError: If ``since`` is not one of the recent versions the store remembers.
+    """
+    snapshot = store.snapshot()
+    current = snapshot.content_id
+    old = store.history(since)
+    if old is None:
+        raise ValueError(
+            f"Unknown or expired content version '{since}'; fetch the resources in full. Current version: {current}"
+        )
+
+    changes = diff_versions(old, snapshot.entries, resource)
+    if not changes:
+        return f"No changes since {since}. Current version: {current}"
+
+    output = [f"Changes since {since}. Current version: {current}"]
+    for name, resource_changes in changes.items():
+        output.append(f"\n## {name}")
+        for change in resource_changes:
+            output.append(f"\n### {change.kind.title()}: {change.label}")
+            if change.text.strip():
+                output.append(f"\n{change.text.rstrip()}")
+    return "\n".join(output)
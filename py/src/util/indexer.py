@@ -0,0 +1,141 @@
+"""Parallel search index builds for large corpora.
+
+Tokenizing is pure Python, so one process indexes at most one core's worth of
+text. ``build_index`` splits the documents into contiguous shards of about
+INDEX_SHARD_BYTES, tokenizes them on a process pool (``index_shard``) and
+combines the packed results with ``SearchIndex.from_shards``. The result equals
+a serial build. The parent only unpickles the shards and lays out line
+tables (postings are unpacked on first lookup), so the build scales with cores
+until that step dominates.
+
+Corpora under INDEX_PARALLEL_MIN_BYTES are indexed in-process. The server's own
+stores stay well below that; the pool pays off for bundle builds and bulk
+imports of whole directories of profiles.
+
+Run ``python -m src.util.indexer <dir>`` to index every markdown file under a
+directory and print the build throughput.
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.constants import INDEX_PARALLEL_MIN_BYTES, INDEX_SHARD_BYTES
+from src.util.search import SearchIndex, index_shard
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BuildStats:
+    documents: int
+    bytes: int
+    seconds: float
+    workers: int
+    shards: int
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Indexed {self.documents} documents ({self.bytes / (1024 * 1024):.1f} MB) in {self.seconds:.2f}s "
+            f"with {self.workers} worker{'s' if self.workers != 1 else ''} "
+            f"over {self.shards} shard{'s' if self.shards != 1 else ''}: "
+            f"{self.docs_per_second:.0f} docs/s, {self.mb_per_second:.2f} MB/s"
+        )
+
+
+def shard_documents(documents: dict[str, str], shard_bytes: int, workers: int = 1) -> list[dict[str, str]]:
+    """Split ``documents`` into contiguous runs of about ``shard_bytes``, in order.
+
+    Shards are made smaller when needed so that every worker gets several, which
+    keeps one large shard from holding up the rest of the pool.
+    """
+    if shard_bytes < 1:
+        raise ValueError("shard_bytes must be >= 1")
+    total = sum(len(text) for text in documents.values())
+    target = max(1, min(shard_bytes, total // (workers * 4)))
+    shards: list[dict[str, str]] = []
+    current: dict[str, str] = {}
+    size = 0
+    for name, text in documents.items():
+        current[name] = text
+        size += len(text)
+        if size >= target:
+            shards.append(current)
+            current, size = {}, 0
+    if current:
+        shards.append(current)
+    return shards
+
+
+def build_index(
+    documents: dict[str, str],
+    workers: int | None = None,
+    shard_bytes: int = INDEX_SHARD_BYTES,
+    min_bytes: int = INDEX_PARALLEL_MIN_BYTES,
+) -> tuple[SearchIndex, BuildStats]:
+    """Index ``documents`` on up to ``workers`` processes (default: one per CPU) and report the throughput."""
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    size = sum(len(text.encode()) for text in documents.values())
+
+    if workers == 1 or len(documents) < 2 or size < min_bytes:
+        index = SearchIndex(documents)
+        workers, shard_count = 1, 1
+    else:
+        shards = shard_documents(documents, shard_bytes, workers)
+        workers = min(workers, len(shards))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(index_shard, shards))
+        index = SearchIndex.from_shards(documents, parts)
+        shard_count = len(shards)
+
+    stats = BuildStats(len(documents), size, time.perf_counter() - started, workers, shard_count)
+    logger.info(str(stats))
+    return index, stats
+
+
+def load_markdown(root: Path) -> dict[str, str]:
+    """Read every ``.md`` file under ``root``, named by its path relative to ``root`` without the suffix."""
+    return {
+        path.relative_to(root).with_suffix("").as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(root.rglob("*.md"))
+        if path.is_file()
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.util.indexer", description="Index a directory of markdown files and report throughput"
+    )
+    parser.add_argument("root", type=Path, help="Directory to index; every .md file below it is a document")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument(
+        "--shard-mb", type=float, default=INDEX_SHARD_BYTES / (1024 * 1024), help="Target shard size in MB"
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if args.shard_mb <= 0:
+        parser.error("--shard-mb must be > 0")
+
+    documents = load_markdown(args.root)
+    if not documents:
+        parser.error(f"no markdown files under {args.root}")
+    _, stats = build_index(documents, args.workers, int(args.shard_mb * 1024 * 1024), min_bytes=0)
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compact line storage: one UTF-8 buffer per document plus an ``array`` of line-start offsets.
+
+Keeping a ``str`` per line costs an object header for every line of every
+resource. A ``LineTable`` keeps the document as a single ``bytes`` buffer,
+finds lines by bisecting a 4-byte-per-line offset table, and only decodes the
+lines that are actually returned. Matching runs over case-folded text, made on
+demand instead of stored: one pass over the whole buffer when it is ASCII (folding
+then keeps every offset), line by line otherwise, since folding can change lengths.
+"""
+
+import bisect
+import re
+from array import array
+from collections.abc import Iterator
+
+# Offsets are stored as unsigned 32-bit integers, so a document can be at most 4 GiB.
+OFFSET_TYPECODE = "I"
+
+
+def line_offsets(data: bytes) -> array:
+    """Return the byte offset at which each line of ``data`` starts (lines end with ``\\n``)."""
+    offsets = array(OFFSET_TYPECODE, [0] if data else [])
+    start = data.find(b"\n")
+    while start != -1 and start + 1 < len(data):
+        offsets.append(start + 1)
+        start = data.find(b"\n", start + 1)
+    return offsets
+
+
+def split_lines(text: str) -> list[str]:
+    """Split ``text`` after every ``\\n``, keeping the endings.
+
+    Unlike ``str.splitlines`` this never breaks on ``\\r``, form feeds or
+    Unicode separators, so line numbers agree with ``line_offsets``.
+    """
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+
+class LineTable:
+    """A document's text as a UTF-8 buffer, addressable by line number."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, text: str):
+        self.data = text.encode()
+        self.offsets = line_offsets(self.data)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def line(self, number: int) -> str:
+        """Decode line ``number`` (0-based) without its line ending."""
+        start = self.offsets[number]
+        end = self.offsets[number + 1] if number + 1 < len(self.offsets) else len(self.data)
+        return self.data[start:end].decode().rstrip("\r\n")
+
+    def line_at(self, offset: int) -> int:
+        """Return the number of the line containing byte ``offset``."""
+        return bisect.bisect_right(self.offsets, offset) - 1
+
+    def text(self) -> str:
+        return self.data.decode()
+
+    def finditer(self, pattern: re.Pattern[str]) -> Iterator[tuple[int, int, str]]:
+        """Yield (line number, match index within the line, matched text) for ``pattern`` over the case-folded text."""
+        if not self.data.isascii():
+            for number in range(len(self.offsets)):
+                for column, match in enumerate(pattern.finditer(self.line(number).casefold())):
+                    yield number, column, match[0]
+            return
+
+        offsets = self.offsets
+        line, column = -1, 0
+        next_start = 0
+        for match in pattern.finditer(self.data.decode("ascii").lower()):
+            start = match.start()
+            if start >= next_start:
+                # Matches arrive in order, so step forward through the offsets rather than bisecting.
+                while start >= next_start:
+                    line += 1
+                    next_start = offsets[line + 1] if line + 1 < len(offsets) else len(self.data) + 1
+                column = 0
+            yield line, column, match[0]
+            column += 1
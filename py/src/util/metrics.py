@@ -0,0 +1,186 @@
+"""In-process request metrics for tools and resources.
+
+Every tool call and resource read is recorded with its latency, outcome,
+response size and an approximate token count, so it is easy to see which
+handlers dominate latency and token spend. ``render_prometheus`` formats the
+counters in the Prometheus text exposition format.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from mcp import types
+
+from src.util.tokens import estimate_tokens
+
+# Latency histogram bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+METRIC_PREFIX = "larkin_mcp"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Requests for tools/resources that don't exist share one label instead of growing the series set.
+UNKNOWN_LABEL = "unknown"
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    errors: int = 0
+    response_bytes: int = 0
+    response_tokens: int = 0
+    latency_sum: float = 0.0
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, seconds: float, ok: bool, response_bytes: int, response_tokens: int) -> None:
+        self.calls += 1
+        self.errors += not ok
+        self.response_bytes += response_bytes
+        self.response_tokens += response_tokens
+        self.latency_sum += seconds
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+
+class Metrics:
+    """Thread-safe registry of per-handler stats, keyed by (kind, name)."""
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str], HandlerStats] = {}
+        self._collectors: list[Callable[[], list[str]]] = []
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, kind: str, name: str, seconds: float, ok: bool, response_bytes: int, response_tokens: int):
+        with self._lock:
+            stats = self._stats.setdefault((kind, name), HandlerStats())
+            stats.observe(seconds, ok, response_bytes, response_tokens)
+
+    def snapshot(self) -> dict[tuple[str, str], HandlerStats]:
+        with self._lock:
+            return {
+                key: HandlerStats(
+                    s.calls, s.errors, s.response_bytes, s.response_tokens, s.latency_sum, list(s.latency_buckets)
+                )
+                for key, s in self._stats.items()
+            }
+
+    def add_collector(self, collector: Callable[[], list[str]]) -> None:
+        """Register a callable returning extra Prometheus lines (e.g. cache counters)."""
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def render_prometheus(self) -> str:
+        stats = sorted(self.snapshot().items())
+        lines = [
+            f"# HELP {METRIC_PREFIX}_uptime_seconds Seconds since the metrics registry was created.",
+            f"# TYPE {METRIC_PREFIX}_uptime_seconds gauge",
+            f"{METRIC_PREFIX}_uptime_seconds {time.time() - self.started_at:.3f}",
+        ]
+
+        counters = (
+            ("requests_total", "Tool calls and resource reads handled.", lambda s: s.calls),
+            ("errors_total", "Tool calls and resource reads that failed.", lambda s: s.errors),
+            ("response_bytes_total", "UTF-8 bytes of response content returned.", lambda s: s.response_bytes),
+            ("response_tokens_total", "Approximate tokens of response content returned.", lambda s: s.response_tokens),
+        )
+        for suffix, help_text, value in counters:
+            lines.append(f"# HELP {METRIC_PREFIX}_{suffix} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{suffix} counter")
+            for (kind, name), s in stats:
+                lines.append(f"{METRIC_PREFIX}_{suffix}{{{_labels(kind, name)}}} {value(s)}")
+
+        histogram = f"{METRIC_PREFIX}_request_duration_seconds"
+        lines.append(f"# HELP {histogram} Handler latency.")
+        lines.append(f"# TYPE {histogram} histogram")
+        for (kind, name), s in stats:
+            labels = _labels(kind, name)
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), s.latency_buckets, strict=True):
+                cumulative += count
+                lines.append(f'{histogram}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{histogram}_sum{{{labels}}} {s.latency_sum:.6f}")
+            lines.append(f"{histogram}_count{{{labels}}} {s.calls}")
+
+        for collector in self._collectors:
+            lines.extend(collector())
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(kind: str, name: str) -> str:
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'kind="{kind}",name="{escaped}"'
+
+
+def _content_size(blocks: list[Any]) -> tuple[int, int]:
+    """Return (bytes, approximate tokens) for tool content blocks or resource contents."""
+    size = tokens = 0
+    for block in blocks:
+        text = getattr(block, "text", None)
+        if text is None:
+            text = getattr(block, "blob", None) or getattr(block, "data", None) or ""
+        size += len(text.encode())
+        tokens += estimate_tokens(text)
+    return size, tokens
+
+
+metrics = Metrics()
+
+
+def instrument(mcp, registry: Metrics = metrics) -> None:
+    """Wrap the server's tool-call and resource-read handlers so every request is recorded.
+
+    Call this after all tools and resources are registered (and after any other
+    handler wrappers), so the measurement covers the whole request.
+    """
+    server = mcp._mcp_server
+    call_tool = server.request_handlers[types.CallToolRequest]
+    read_resource = server.request_handlers[types.ReadResourceRequest]
+
+    async def instrumented_call_tool(req: types.CallToolRequest) -> types.ServerResult:
+        started = time.perf_counter()
+        ok = False
+        size = tokens = 0
+        try:
+            result = await call_tool(req)
+            if isinstance(result.root, types.CallToolResult):
+                ok = not result.root.isError
+                size, tokens = _content_size(result.root.content)
+            return result
+        finally:
+            name = req.params.name if mcp._tool_manager.get_tool(req.params.name) else UNKNOWN_LABEL
+            registry.observe("tool", name, time.perf_counter() - started, ok, size, tokens)
+
+    async def instrumented_read_resource(req: types.ReadResourceRequest) -> types.ServerResult:
+        started = time.perf_counter()
+        ok = False
+        size = tokens = 0
+        try:
+            result = await read_resource(req)
+            if isinstance(result.root, types.ReadResourceResult):
+                ok = True
+                size, tokens = _content_size(result.root.contents)
+            return result
+        finally:
+            name = _resource_label(mcp, str(req.params.uri))
+            registry.observe("resource", name, time.perf_counter() - started, ok, size, tokens)
+
+    server.request_handlers[types.CallToolRequest] = instrumented_call_tool
+    server.request_handlers[types.ReadResourceRequest] = instrumented_read_resource
+
+
+def _resource_label(mcp, uri: str) -> str:
+    # Templated URIs are labelled by their template to keep label cardinality bounded.
+    if any(str(resource.uri) == uri for resource in mcp._resource_manager.list_resources()):
+        return uri
+    for template in mcp._resource_manager.list_templates():
+        if template.matches(uri) is not None:
+            return template.uri_template
+    return UNKNOWN_LABEL
@@ -0,0 +1,129 @@
+"""Bounded, cursor-based pages over markdown resources.
+
+A page is a byte range of a resource's UTF-8 text. Pages end on the last
+section boundary in the back half of the byte limit, else on the last line
+boundary, else (for a single enormous line) on a character boundary, so a
+heading or line is never split unless it has to be. Boundaries come from the
+offsets precomputed in :class:`~src.util.sections.SectionTree`.
+
+Cursors are opaque to clients. They encode the resource, the content version
+(the entry's ETag, a hash of its text) the page was cut from and the next byte
+offset, so a cursor issued before the text changed is rejected instead of
+resuming at a shifted position, even when the file kept its mtime.
+"""
+
+import base64
+import binascii
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.util.sections import SectionTree
+
+
+class InvalidCursorError(ValueError):
+    def __init__(self, cursor: str, reason: str):
+        self.cursor = cursor
+        self.reason = reason
+        super().__init__(f"Invalid cursor '{cursor}': {reason}")
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of a resource; offsets are relative to the start of the paginated range."""
+
+    resource: str
+    text: str
+    offset: int
+    end: int
+    total_size: int
+    next_cursor: str | None
+
+
+def encode_cursor(resource: str, version: str, offset: int) -> str:
+    raw = f"{resource}:{version}:{offset:x}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, resource: str, version: str) -> int:
+    """Return the byte offset stored in ``cursor``, checking it belongs to this resource version."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        name, cursor_version, offset = raw.rsplit(":", 2)
+        parsed_offset = int(offset, 16)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(cursor, "malformed") from None
+    if name != resource:
+        raise InvalidCursorError(cursor, f"issued for '{name}', not '{resource}'")
+    if cursor_version != version:
+        raise InvalidCursorError(cursor, f"'{resource}' has changed since it was issued; start again without a cursor")
+    return parsed_offset
+
+
+def page_end(tree: "SectionTree", start: int, stop: int, limit: int) -> int:
+    """Return where a page starting at ``start`` should end, at most ``limit`` bytes later."""
+    hard_end = start + limit
+    if hard_end >= stop:
+        return stop
+
+    section_starts = tree.section_starts
+    i = bisect_right(section_starts, hard_end) - 1
+    # Strictly after ``start``: with a tiny limit the page's own heading would otherwise end it at zero bytes.
+    if i >= 0 and section_starts[i] > start and section_starts[i] >= start + limit // 2:
+        return section_starts[i]
+
+    i = bisect_right(tree.line_offsets, hard_end) - 1
+    if i >= 0 and tree.line_offsets[i] > start:
+        return tree.line_offsets[i]
+
+    # Back off to the first byte of a UTF-8 sequence (continuation bytes are 0b10xxxxxx).
+    end = hard_end
+    while end > start and tree.data[end] & 0xC0 == 0x80:
+        end -= 1
+    if end == start:
+        # One character is longer than ``limit``; take it whole rather than return an empty page.
+        end = hard_end
+        while end < stop and tree.data[end] & 0xC0 == 0x80:
+            end += 1
+    return end
+
+
+def paginate(
+    tree: "SectionTree",
+    version: str,
+    limit: int,
+    cursor: str | None = None,
+    start: int = 0,
+    stop: int | None = None,
+) -> Page:
+    """Cut the page of ``tree.data[start:stop]`` that ``cursor`` points at (the first page if None)."""
+    stop = len(tree.data) if stop is None else stop
+    offset = start if cursor is None else decode_cursor(cursor, tree.name, version)
+    if not start <= offset <= stop:
+        raise InvalidCursorError(cursor or "", "offset is outside the requested range")
+    # Never start inside a UTF-8 sequence, whatever offset the cursor carried.
+    while offset > start and offset < len(tree.data) and tree.data[offset] & 0xC0 == 0x80:
+        offset -= 1
+
+    end = page_end(tree, offset, stop, limit)
+    return Page(
+        resource=tree.name,
+        text=tree.data[offset:end].decode(),
+        offset=offset - start,
+        end=end - start,
+        total_size=stop - start,
+        next_cursor=encode_cursor(tree.name, version, end) if end < stop else None,
+    )
+
+
+def format_page(page: Page, continuation: str) -> str:
+    """Render ``page`` as text, with a trailer naming ``continuation`` (formatted with the cursor) if more follows."""
+    if page.next_cursor is None and page.offset == 0:
+        return page.text
+    if page.next_cursor is None:
+        return page.text + f"\n\n<!-- end of {page.resource} ({page.total_size} bytes) -->"
+    return page.text + (
+        f"\n\n<!-- {page.resource}: bytes {page.offset}-{page.end} of {page.total_size}; "
+        f"continue with {continuation.format(cursor=page.next_cursor)} -->"
+    )
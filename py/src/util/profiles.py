@@ -0,0 +1,279 @@
+"""Serving many profiles (content directories) from one process.
+
+A profile is a subdirectory of the profiles directory, laid out like
+RESOURCES_DIR. Each one gets its own ContentStore, and so its own snapshots,
+search and semantic indexes, plus its own search_info cache, all created the
+first time the profile is asked for. Tools and resources take a profile name
+and run inside ``ause_profile`` (``use_profile`` outside the event loop), which points ``get_store`` at that profile's
+store for the rest of the request, so every loader and index routes by profile
+without taking it as an argument.
+
+Loaded profiles are kept in least-recently-used order. Whenever a profile is
+loaded, the estimated memory of every loaded profile is compared with the cap
+and the coldest ones are dropped until it fits; the next request for one of
+them loads it again from disk. Requests for profiles already in memory skip the
+check, so the indexes they build are only accounted for at the next load.
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.constants import (
+    PROFILE_DEFAULT_MEMORY_CAP_MB,
+    PROFILE_MEMORY_CAP_ENV,
+    PROFILE_SEARCH_CACHE_SIZE,
+    PROFILES_DIR_ENV,
+    RESOURCES_CATEGORIES,
+)
+from src.util.aio import run_blocking
+from src.util.cache import LRUCache
+from src.util.metrics import METRIC_PREFIX, metrics
+from src.util.store import ContentStore, use_store
+
+logger = logging.getLogger(__name__)
+
+# Directory names only: no separators, no leading dot, so a profile can never name a path outside the root.
+PROFILE_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,127}")
+
+# Approximate bytes each derived value keeps per byte of indexed text, measured with
+# tracemalloc on the bundled content. The indexes, not the text, dominate a profile's footprint.
+DERIVED_MEMORY_FACTORS = {"search_index": 31, "section_trees": 3, "semantic_index": 43}
+
+
+class ProfileNotFoundError(Exception):
+    def __init__(self, name: str, root: Path):
+        self.name = name
+        self.root = root
+        super().__init__(f"Profile '{name}' not found in {root}")
+
+
+class ProfilesDisabledError(Exception):
+    def __init__(self):
+        super().__init__(f"Multi-profile serving is off; start the server with --profiles-dir or {PROFILES_DIR_ENV}")
+
+
+@dataclass
+class Profile:
+    name: str
+    store: ContentStore
+    search_cache: LRUCache[str]
+
+    def memory_bytes(self) -> int:
+        """Estimate the memory this profile holds: its text and blobs plus the derived values built so far."""
+        snapshot = self.store.peek()
+        derived = 0
+        if snapshot is not None:
+            text_bytes = sum(entry.size for entry in snapshot.entries.values())
+            derived = sum(
+                int(text_bytes * factor) for key, factor in DERIVED_MEMORY_FACTORS.items() if snapshot.has_derived(key)
+            )
+        return self.store.resident_bytes() + derived
+
+
+class ProfileRegistry:
+    """Lazily loaded profiles under ``root``, evicted least recently used first to stay under ``max_bytes``."""
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = PROFILE_DEFAULT_MEMORY_CAP_MB * 1024 * 1024,
+        categories: list[str] = RESOURCES_CATEGORIES,
+    ):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.categories = list(categories)
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def names(self) -> list[str]:
+        """Return every profile that can be served, loaded or not."""
+        if not self.root.is_dir():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir() and _valid(path.name))
+
+    def loaded(self) -> list[str]:
+        """Return the loaded profiles, least recently used first."""
+        with self._lock:
+            return list(self._profiles)
+
+    def get(self, name: str) -> Profile:
+        """Return profile ``name``, loading it on first use and marking it most recently used.
+
+        Loading a profile trims the registry back under ``max_bytes``, never dropping ``name`` itself.
+
+        Raises:
+            ProfileNotFoundError: If ``name`` is not a directory under the profiles root.
+        """
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is not None:
+                self._profiles.move_to_end(name)
+                return profile
+
+        root = self.root / name
+        if not _valid(name) or not root.is_dir():
+            raise ProfileNotFoundError(name, self.root)
+
+        with self._lock:
+            profile = self._profiles.get(name)
+            loaded = profile is None
+            if profile is None:
+                profile = Profile(
+                    name=name,
+                    store=ContentStore(root, self.categories),
+                    search_cache=LRUCache(f"search_info:{name}", PROFILE_SEARCH_CACHE_SIZE),
+                )
+                self._profiles[name] = profile
+                self.loads += 1
+                logger.info(f"Loaded profile '{name}' from {root}")
+            self._profiles.move_to_end(name)
+        if loaded:
+            self.trim(keep=name)
+        return profile
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return sum(profile.memory_bytes() for profile in profiles)
+
+    def trim(self, keep: str | None = None) -> list[str]:
+        """Drop least recently used profiles until the estimate fits ``max_bytes``; never drops ``keep``.
+
+        Returns the names of the profiles dropped.
+        """
+        with self._lock:
+            profiles = list(self._profiles.items())
+        # Estimated outside the lock: it walks every profile's snapshot, and lookups should not wait on it.
+        sizes = {name: profile.memory_bytes() for name, profile in profiles}
+        total = sum(sizes.values())
+        evicted = []
+        with self._lock:
+            for name in list(self._profiles):
+                if total <= self.max_bytes:
+                    break
+                if name == keep or name not in sizes:
+                    continue
+                # Requests already holding this store finish against it; it is freed once they do.
+                self._profiles.pop(name).store.unwatch()
+                total -= sizes[name]
+                evicted.append(name)
+            self.evictions += len(evicted)
+        if evicted:
+            logger.info(f"Evicted profiles {', '.join(evicted)} to stay within {self.max_bytes} bytes")
+        return evicted
+
+    def prometheus_lines(self) -> list[str]:
+        """Return registry gauges and counters in Prometheus text format, for ``Metrics.add_collector``."""
+        lines = []
+        for suffix, help_text, kind, value in (
+            ("profiles_loaded", "Profiles currently held in memory.", "gauge", len(self.loaded())),
+            ("profiles_memory_bytes", "Estimated memory held by loaded profiles.", "gauge", self.memory_bytes()),
+            ("profile_loads_total", "Profiles loaded on first use or after eviction.", "counter", self.loads),
+            ("profile_evictions_total", "Profiles dropped to stay under the memory cap.", "counter", self.evictions),
+        ):
+            lines.append(f"# HELP {METRIC_PREFIX}_{suffix} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{suffix} {kind}")
+            lines.append(f"{METRIC_PREFIX}_{suffix} {value}")
+        return lines
+
+
+_registry: ProfileRegistry | None = None
+_registry_configured = False
+_registry_lock = threading.Lock()
+
+
+def get_profiles() -> ProfileRegistry | None:
+    """Return the process-wide profile registry, or None when multi-profile serving is off.
+
+    Unless ``set_profiles`` was called, it is created on first use from PROFILES_DIR_ENV.
+    """
+    global _registry, _registry_configured
+    if not _registry_configured:
+        with _registry_lock:
+            if not _registry_configured:
+                _registry = _create_default_registry()
+                _registry_configured = True
+    return _registry
+
+
+def set_profiles(registry: ProfileRegistry | None) -> None:
+    """Replace the process-wide registry; None turns multi-profile serving off."""
+    global _registry, _registry_configured
+    with _registry_lock:
+        _registry = registry
+        _registry_configured = True
+
+
+def reset_profiles() -> None:
+    """Forget the registry so the next ``get_profiles`` reads the environment again."""
+    global _registry, _registry_configured
+    with _registry_lock:
+        _registry = None
+        _registry_configured = False
+
+
+@contextmanager
+def use_profile(name: str | None) -> Iterator[Profile | None]:
+    """Serve the rest of the request from profile ``name``; None keeps the default content.
+
+    Raises:
+        ProfilesDisabledError: If ``name`` is given but no profiles directory is configured.
+        ProfileNotFoundError: If there is no such profile.
+    """
+    if name is None:
+        yield None
+        return
+
+    profile = _profile_registry().get(name)
+    with use_store(profile.store):
+        yield profile
+
+
+@asynccontextmanager
+async def ause_profile(name: str | None) -> AsyncIterator[Profile | None]:
+    """``use_profile`` for handlers: the profile is looked up (and loaded) on the I/O pool, off the event loop."""
+    if name is None:
+        yield None
+        return
+
+    profile = await run_blocking(_profile_registry().get, name)
+    with use_store(profile.store):
+        yield profile
+
+
+def _profile_registry() -> ProfileRegistry:
+    registry = get_profiles()
+    if registry is None:
+        raise ProfilesDisabledError()
+    return registry
+
+
+def _prometheus_lines() -> list[str]:
+    registry = _registry
+    return registry.prometheus_lines() if registry is not None else []
+
+
+metrics.add_collector(_prometheus_lines)
+
+
+def _valid(name: str) -> bool:
+    return PROFILE_NAME_PATTERN.fullmatch(name) is not None
+
+
+def _create_default_registry() -> ProfileRegistry | None:
+    root = os.environ.get(PROFILES_DIR_ENV)
+    if not root:
+        return None
+    cap_mb = float(os.environ.get(PROFILE_MEMORY_CAP_ENV, PROFILE_DEFAULT_MEMORY_CAP_MB))
+    return ProfileRegistry(Path(root), int(cap_mb * 1024 * 1024))
@@ -0,0 +1,169 @@
+"""Query language for keyword search.
+
+A query is parsed once into a small syntax tree that ``SearchIndex`` executes
+as set operations over its positional postings:
+
+- ``python rust`` or ``python AND rust``: lines containing both words
+- ``python OR go``: lines containing either word
+- ``NOT java`` or ``-java``: lines without the word
+- ``"machine learning"``: the words next to each other, in order
+- ``pyth*``: any word starting with ``pyth``
+- ``resource:work`` / ``section:"Work Experience"``: only lines in that resource or section
+- parentheses group, e.g. ``(python OR go) -resource:projects``
+
+Operators are upper case so that "and", "or" and "not" stay searchable words.
+NOT binds tightest, then AND (also implied between adjacent terms), then OR.
+"""
+
+import re
+from dataclasses import dataclass
+
+FIELDS = ("resource", "section")
+OPERATORS = ("AND", "OR", "NOT")
+
+LEXER_PATTERN = re.compile(r'\(|\)|"[^"]*"?|[^\s()"]+')
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Term:
+    text: str
+    prefix: bool = False
+
+
+@dataclass(frozen=True)
+class Phrase:
+    """Consecutive words on one line; a single word that tokenizes into several (``next.js``) is one too."""
+
+    terms: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Field:
+    name: str
+    value: str
+
+
+@dataclass(frozen=True)
+class Not:
+    node: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    nodes: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    nodes: tuple["Node", ...]
+
+
+Node = Term | Phrase | Field | Not | And | Or
+
+
+def parse_query(query: str) -> Node | None:
+    """Parse ``query`` into a syntax tree, or None when it contains no searchable words."""
+    from src.util.search import tokenize
+
+    tokens = _lex(query)
+    position = 0
+
+    def peek() -> str | None:
+        return tokens[position] if position < len(tokens) else None
+
+    def advance() -> str:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or() -> Node | None:
+        nodes = [parse_and()]
+        while peek() == "OR":
+            advance()
+            nodes.append(parse_and())
+        return _combine(Or, nodes)
+
+    def parse_and() -> Node | None:
+        nodes = []
+        while (token := peek()) is not None and token not in ("OR", ")"):
+            if token == "AND":
+                advance()
+                continue
+            nodes.append(parse_unary())
+        return _combine(And, nodes)
+
+    def parse_unary() -> Node | None:
+        token = peek()
+        if token == "NOT" or (token is not None and token.startswith("-") and len(token) > 1):
+            advance()
+            if token == "NOT" and peek() in (None, ")", "OR"):
+                raise QuerySyntaxError(f"NOT must be followed by a term in query '{query}'")
+            if token != "NOT":
+                tokens.insert(position, token[1:])
+            node = parse_unary()
+            return Not(node) if node is not None else None
+        return parse_primary()
+
+    def parse_primary() -> Node | None:
+        token = advance()
+        if token == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise QuerySyntaxError(f"unbalanced parenthesis in query '{query}'")
+            advance()
+            return node
+        if token == ")":
+            raise QuerySyntaxError(f"unbalanced parenthesis in query '{query}'")
+
+        name, colon, value = token.partition(":")
+        if colon and name.lower() in FIELDS:
+            if not value and (next_token := peek()) is not None and next_token.startswith('"'):
+                value = advance()
+            value = value.strip('"').strip()
+            return Field(name.lower(), value) if value else None
+
+        prefix = token.endswith("*") and not token.startswith('"')
+        words = tuple(tokenize(token))
+        if not words:
+            return None
+        if prefix:
+            return _combine(And, [*map(Term, words[:-1]), Term(words[-1], prefix=True)])
+        return Term(words[0]) if len(words) == 1 else Phrase(words)
+
+    node = parse_or()
+    if position < len(tokens):
+        raise QuerySyntaxError(f"unbalanced parenthesis in query '{query}'")
+    return node
+
+
+def normalize_query(query: str) -> str:
+    """Return a canonical spelling of ``query``: same tokens, single spaces, case-folded except operators."""
+    return " ".join(token if token in OPERATORS else token.casefold() for token in _lex(query))
+
+
+def terms(node: Node | None, negated: bool = False) -> list[Term]:
+    """Return the plain and prefix terms that count towards a match (those not under NOT)."""
+    if node is None or isinstance(node, Field):
+        return []
+    if isinstance(node, Term):
+        return [] if negated else [node]
+    if isinstance(node, Phrase):
+        return [] if negated else [Term(term) for term in node.terms]
+    if isinstance(node, Not):
+        return terms(node.node, not negated)
+    return [term for child in node.nodes for term in terms(child, negated)]
+
+
+def _lex(query: str) -> list[str]:
+    return LEXER_PATTERN.findall(query)
+
+
+def _combine(kind: type[And] | type[Or], nodes: list[Node | None]) -> Node | None:
+    kept = tuple(node for node in nodes if node is not None)
+    if not kept:
+        return None
+    return kept[0] if len(kept) == 1 else kind(kept)
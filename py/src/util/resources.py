@@ -3,16 +3,27 @@
 import logging
 from pathlib import Path
 
-from src.constants import RESOURCES_CATEGORIES, RESOURCES_DIR, RESUME_MD_PATH
+from src.constants import (
+    CONTENT_MAX_PAGE_BYTES,
+    CONTENT_PAGE_BYTES,
+    RESUME_PDF_RESOURCE,
+    SEARCH_LINES_PER_RESOURCE,
+    SEARCH_RESOURCE_LIMIT,
+    SEMANTIC_SEARCH_LIMIT,
+)
+from src.util.aio import run_blocking
+from src.util.pagination import Page, paginate
+from src.util.store import BlobEntry, ContentStore, Snapshot, UnknownResourceError, get_store
+from src.util.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 
 class ResourceNotFoundError(Exception):
-    def __init__(self, name: str, path: Path):
+    def __init__(self, name: str, path: Path | None = None):
         self.name = name
         self.path = path
-        super().__init__(f"Resource '{name}' not found at {path}")
+        super().__init__(f"Resource '{name}' not found" + (f" at {path}" if path else ""))
 
 
 class ResourceReadError(Exception):
@@ -23,23 +34,29 @@ class ResourceReadError(Exception):
         super().__init__(f"Error reading resource '{name}' from {path}: {cause}")
 
 
+class SemanticSearchUnavailableError(Exception):
+    def __init__(self):
+        super().__init__("Semantic search needs numpy; install it with: pip install 'larkin-mcp[semantic]'")
+
+
 def load_resource(name: str, *, raise_on_error: bool = False) -> str:
-    if name == "resume":
-        path = RESUME_MD_PATH
-    else:
-        path = RESOURCES_DIR / f"{name}.md"
+    store = get_store()
+    try:
+        path = store.path_for(name)
+    except UnknownResourceError:
+        logger.warning(f"Unknown resource '{name}' requested")
+        if raise_on_error:
+            raise ResourceNotFoundError(name) from None
+        return f"Resource '{name}' not found."
 
-    if not path.exists():
+    try:
+        entry = store.get(name)
+    except FileNotFoundError:
         msg = f"Resource '{name}' not found at {path}"
         logger.warning(msg)
         if raise_on_error:
-            raise ResourceNotFoundError(name, path)
+            raise ResourceNotFoundError(name, path) from None
         return f"Resource '{name}' not found. Please create {path}"
-
-    try:
-        content = path.read_text()
-        logger.debug(f"Loaded resource '{name}' ({len(content)} bytes)")
-        return content
     except Exception as e:
         msg = f"Error reading resource '{name}' from {path}: {e}"
         logger.error(msg)
@@ -47,44 +64,249 @@ def load_resource(name: str, *, raise_on_error: bool = False) -> str:
             raise ResourceReadError(name, path, e) from e
         return f"Error reading resource '{name}': {e}"
 
+    return entry.text
 
-def list_resources() -> list[str]:
-    resources = []
 
-    # resume has special path
-    if RESUME_MD_PATH.exists():
-        resources.append("resume")
+def load_resume_pdf() -> BlobEntry:
+    store = get_store()
+    blob = store.snapshot().blobs.get(RESUME_PDF_RESOURCE)
+    if blob is None:
+        raise FileNotFoundError(f"not found at {store.resume_pdf_path}")
+    return blob
+
 
-    for expected in RESOURCES_CATEGORIES:
-        if expected == "resume":
-            continue  # already handled above
-        resource_path = RESOURCES_DIR / f"{expected}.md"
-        if resource_path.exists():
-            resources.append(expected)
+def list_resources() -> list[str]:
+    store = get_store()
+    snapshot = store.snapshot()
+    resources = [name for name in store.categories if name in snapshot.entries]
 
     logger.debug(f"Found {len(resources)} available resources: {resources}")
     return resources
 
 
-def search_resources(query: str) -> dict[str, list[str]]:
+def search_resources(
+    query: str,
+    limit: int = SEARCH_RESOURCE_LIMIT,
+    max_lines: int = SEARCH_LINES_PER_RESOURCE,
+    snapshot: Snapshot | None = None,
+) -> dict[str, list[str]]:
+    """Return snippets of lines matching ``query`` (see :mod:`src.util.query`) per resource, by BM25 relevance.
+
+    Each snippet is a window of the line around the first match, prefixed with
+    its line number (``"L12: … **Python** …"``), for the first ``max_lines``
+    matching lines of each of the ``limit`` best resources. Searches ``snapshot``
+    if given, otherwise the store's current one.
+    """
     if not query or not query.strip():
         logger.warning("Empty search query provided")
         return {}
 
-    results: dict[str, list[str]] = {}
-    query_lower = query.lower()
-
-    for resource_name in list_resources():
-        try:
-            content = load_resource(resource_name, raise_on_error=True)
-            matching_lines = [line for line in content.splitlines() if query_lower in line.lower()]
+    # Deferred so the index code stays off the startup path until the first search.
+    from src.util.search import get_index, snippet
 
-            if matching_lines:
-                results[resource_name] = matching_lines
-                logger.debug(f"Found {len(matching_lines)} matches in '{resource_name}'")
-        except (ResourceNotFoundError, ResourceReadError) as e:
-            logger.warning(f"Skipping resource '{resource_name}' in search: {e}")
-            continue
+    hits = get_index(snapshot or get_store().snapshot()).search(query, limit=limit, max_lines=max_lines)
+    results = {
+        hit.resource: [
+            f"L{n + 1}: {snippet(line, hit.terms)}" for n, line in zip(hit.line_numbers, hit.lines, strict=True)
+        ]
+        for hit in hits
+    }
+    for hit in hits:
+        logger.debug(f"Found {hit.matched} matching lines in '{hit.resource}' (score {hit.score:.3f})")
 
     logger.info(f"Search for '{query}' found matches in {len(results)} resources")
     return results
+
+
+def correct_query(query: str, snapshot: Snapshot | None = None) -> dict[str, str]:
+    """Map each query word missing from the index to the words ``search_resources`` matched instead."""
+    from src.util.search import get_index
+
+    corrections = get_index(snapshot or get_store().snapshot()).corrections(query)
+    return {term: " or ".join(alternatives) for term, alternatives in corrections.items() if alternatives}
+
+
+def search_sections(
+    query: str, limit: int = SEMANTIC_SEARCH_LIMIT, snapshot: Snapshot | None = None
+) -> dict[str, list[str]]:
+    """Return snippets per section ("resource › heading path"), most similar to ``query`` first.
+
+    Uses the TF-IDF index in :mod:`src.util.semantic`, which needs numpy.
+    """
+    if not query or not query.strip():
+        logger.warning("Empty search query provided")
+        return {}
+
+    try:
+        from src.util.semantic import get_semantic_index
+    except ImportError as e:
+        raise SemanticSearchUnavailableError() from e
+
+    hits = get_semantic_index(snapshot or get_store().snapshot()).search(query, limit)
+    logger.info(f"Semantic search for '{query}' found {len(hits)} sections")
+    return {" › ".join((hit.resource, *hit.path[1:])): hit.lines for hit in hits}
+
+
+def load_page(
+    name: str, cursor: str | None = None, limit: int = CONTENT_PAGE_BYTES, max_tokens: int | None = None
+) -> Page:
+    """Return one bounded page of resource ``name``; ``cursor`` comes from the previous page.
+
+    With ``max_tokens`` the whole document is packed into that budget instead,
+    section by section, and the omitted sections are listed at the end.
+    """
+    _check_page_args(cursor, limit, max_tokens)
+    # One snapshot for the whole request, so the text, its section tree and the cursor version agree.
+    snapshot = get_store().snapshot()
+    try:
+        entry = snapshot.get(name)
+    except Exception:
+        # Keep the not-found / read-error message that the unpaginated tools have always returned.
+        message = load_resource(name)
+        return Page(name, message, 0, 0, 0, None)
+
+    if max_tokens is None and cursor is None and entry.size <= limit:
+        # Whole document fits; skip the section tree. Text never has more bytes than the file.
+        return Page(name, entry.text, 0, entry.size, entry.size, None)
+    if max_tokens is not None and estimate_tokens(entry.text) <= max_tokens:
+        return Page(name, entry.text, 0, entry.size, entry.size, None)
+
+    from src.util.sections import get_section_trees
+
+    tree = get_section_trees(snapshot)[name]
+    if max_tokens is not None:
+        from src.util.budget import pack_sections
+
+        return Page(name, pack_sections(tree, max_tokens), 0, entry.size, entry.size, None)
+    return paginate(tree, entry.etag, limit, cursor)
+
+
+def load_section(
+    name: str,
+    section: str,
+    cursor: str | None = None,
+    limit: int = CONTENT_PAGE_BYTES,
+    max_tokens: int | None = None,
+) -> Page:
+    """Return (a page of) one heading's subtree from resource ``name``.
+
+    Raises ResourceNotFoundError for unknown resources and ValueError, listing
+    the available headings, when nothing matches ``section``. ``max_tokens``
+    packs the subtree into a token budget as in :func:`load_page`.
+    """
+    from src.util.sections import get_section_trees
+
+    _check_page_args(cursor, limit, max_tokens)
+    store = get_store()
+    snapshot = store.snapshot()
+    tree = get_section_trees(snapshot).get(name)
+    if tree is None:
+        raise _not_found(store, name)
+
+    match = tree.find(section)
+    if match is None:
+        headings = ", ".join(" / ".join(s.path) for s in tree.sections)
+        raise ValueError(f"No section matching '{section}' in '{name}'. Available sections: {headings}")
+    if max_tokens is not None:
+        from src.util.budget import pack_sections
+
+        return Page(name, pack_sections(tree, max_tokens, match), 0, match.size, match.size, None)
+    return paginate(tree, snapshot.get(name).etag, limit, cursor, match.start, match.end)
+
+
+def _not_found(store: ContentStore, name: str) -> ResourceNotFoundError:
+    return ResourceNotFoundError(name, store.path_for(name) if name in store.categories else None)
+
+
+def _check_page_args(cursor: str | None, limit: int, max_tokens: int | None) -> None:
+    if not 0 < limit <= CONTENT_MAX_PAGE_BYTES:
+        raise ValueError(f"limit must be between 1 and {CONTENT_MAX_PAGE_BYTES}")
+    if max_tokens is not None and max_tokens < 1:
+        raise ValueError("max_tokens must be >= 1")
+    if max_tokens is not None and cursor is not None:
+        raise ValueError("max_tokens cannot be combined with cursor; fetch omitted sections with get_section")
+
+
+def changes_since(since: str | None = None, name: str | None = None) -> str:
+    """Return the section-level changes since content version ``since``, or just the current version id.
+
+    Raises ResourceNotFoundError when ``name`` is in neither version and
+    ValueError when ``since`` is unknown or too old to be remembered.
+    """
+    store = get_store()
+    if since is None:
+        return f"Current version: {store.snapshot().content_id}"
+    if name is not None and name not in store.categories:
+        raise _not_found(store, name)
+
+    from src.util.changes import changes_since as render_changes
+
+    return render_changes(store, since, name)
+
+
+def table_of_contents(name: str | None = None) -> str:
+    """Return an indented heading outline for one resource, or for all of them."""
+    from src.util.sections import get_section_trees
+
+    store = get_store()
+    trees = get_section_trees(store.snapshot())
+    if name is not None:
+        if name not in trees:
+            raise _not_found(store, name)
+        trees = {name: trees[name]}
+
+    output = []
+    for resource, tree in trees.items():
+        output.append(f"## {resource}")
+        output.extend(tree.outline())
+    return "\n".join(output)
+
+
+async def aload_resource(name: str, *, raise_on_error: bool = False) -> str:
+    return await run_blocking(load_resource, name, raise_on_error=raise_on_error)
+
+
+async def aload_resume_pdf() -> BlobEntry:
+    return await run_blocking(load_resume_pdf)
+
+
+async def alist_resources() -> list[str]:
+    return await run_blocking(list_resources)
+
+
+async def asearch_resources(query: str, snapshot: Snapshot | None = None) -> dict[str, list[str]]:
+    return await run_blocking(search_resources, query, snapshot=snapshot)
+
+
+async def acorrect_query(query: str, snapshot: Snapshot | None = None) -> dict[str, str]:
+    return await run_blocking(correct_query, query, snapshot)
+
+
+async def asearch_sections(
+    query: str, limit: int = SEMANTIC_SEARCH_LIMIT, snapshot: Snapshot | None = None
+) -> dict[str, list[str]]:
+    return await run_blocking(search_sections, query, limit, snapshot)
+
+
+async def aload_page(
+    name: str, cursor: str | None = None, limit: int = CONTENT_PAGE_BYTES, max_tokens: int | None = None
+) -> Page:
+    return await run_blocking(load_page, name, cursor, limit, max_tokens)
+
+
+async def aload_section(
+    name: str,
+    section: str,
+    cursor: str | None = None,
+    limit: int = CONTENT_PAGE_BYTES,
+    max_tokens: int | None = None,
+) -> Page:
+    return await run_blocking(load_section, name, section, cursor, limit, max_tokens)
+
+
+async def atable_of_contents(name: str | None = None) -> str:
+    return await run_blocking(table_of_contents, name)
+
+
+async def achanges_since(since: str | None = None, name: str | None = None) -> str:
+    return await run_blocking(changes_since, since, name)
@@ -0,0 +1,609 @@
+"""Token-level inverted index with BM25 ranking over the resource corpus.
+
+The index is built once per content version (see ``ContentStore.derived``) and
+answers queries by walking only the postings for the query terms, so lookup
+cost tracks the number of matches rather than the size of the corpus.
+
+Query terms that are not in the vocabulary (typos such as "pyhton") are
+replaced by their closest vocabulary terms. Candidates come from a trigram
+index over the vocabulary, so only terms sharing trigrams with the typo are
+considered, and only that short list is checked with a bounded edit distance.
+
+Queries may combine words with AND/OR/NOT, phrases, prefix wildcards and
+``resource:``/``section:`` filters (see :mod:`src.util.query`). Phrases are
+matched from the word positions stored in each posting.
+
+Large corpora can be indexed in shards (``index_shard``) on several processes
+and combined with ``SearchIndex.from_shards`` (see :mod:`src.util.indexer`).
+Shards carry one packed integer array per term, so combining them costs one
+step per term and shard rather than one per posting. A term's postings are
+only unpacked the first time it is looked up.
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+import re
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.util.lines import OFFSET_TYPECODE, LineTable
+from src.util.query import Field, Node, Not, Or, Phrase, Term, parse_query
+from src.util.query import terms as query_terms
+from src.util.store import ContentEntry, ContentStore, Snapshot
+
+if TYPE_CHECKING:
+    from src.util.sections import SectionTree
+
+# Runs of Unicode letters and digits, matched in case-folded text so "Zürich" is one token.
+# `c++` and `c#` are real skills in the corpus, so keep their suffixes attached.
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:\+\+|#)?")
+
+# URLs and markdown link targets, which snippets show verbatim so links keep working.
+UNHIGHLIGHTED_PATTERN = re.compile(r"\S+://\S+|\]\([^)]*\)")
+
+# Characters of a matching line shown around the first match.
+SNIPPET_WIDTH = 120
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Fuzzy matching: trigram-similarity shortlist, then an edit-distance check on that shortlist only.
+# A candidate must share at least this (Jaccard) fraction of trigrams with the query word; at 0.2,
+# words that only share an ending ("zürch" and "march") were still suggested.
+FUZZY_MIN_SIMILARITY = 0.25
+FUZZY_SHORTLIST = 20
+FUZZY_MAX_CANDIDATES = 3
+
+# Most vocabulary terms a prefix wildcard such as ``p*`` expands to.
+PREFIX_MAX_TERMS = 128
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(term: str) -> int:
+    return 1 if len(term) <= 4 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count once), capped at ``limit + 1``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            cost = ca != cb
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class TrigramIndex:
+    """Maps each trigram to the vocabulary terms containing it, for typo-tolerant term lookup."""
+
+    def __init__(self, vocabulary: Iterable[str]):
+        self.terms = [term for term in vocabulary if not any(c.isdigit() for c in term)]
+        self.sizes: list[int] = []
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for term_id, term in enumerate(self.terms):
+            grams = trigrams(term)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(term_id)
+
+    def candidates(self, term: str, limit: int = FUZZY_MAX_CANDIDATES) -> list[str]:
+        """Return up to ``limit`` of the vocabulary terms fewest edits (at most ``max_edits(term)``) away."""
+        if any(c.isdigit() for c in term):
+            return []
+        edits = max_edits(term)
+        grams = trigrams(term)
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            for term_id in self.postings.get(gram, ()):
+                if abs(len(self.terms[term_id]) - len(term)) <= edits:
+                    shared[term_id] += 1
+
+        similarity = {term_id: count / (len(grams) + self.sizes[term_id] - count) for term_id, count in shared.items()}
+        shortlist = sorted(
+            (term_id for term_id, score in similarity.items() if score >= FUZZY_MIN_SIMILARITY),
+            key=lambda term_id: -similarity[term_id],
+        )[:FUZZY_SHORTLIST]
+
+        ranked = []
+        for term_id in shortlist:
+            distance = edit_distance(term, self.terms[term_id], edits)
+            if distance <= edits:
+                ranked.append((distance, -similarity[term_id], self.terms[term_id]))
+        # Only the closest terms: "larkn" should become "larkin", not also "large".
+        ranked.sort()
+        return [candidate for distance, _, candidate in ranked[:limit] if distance == ranked[0][0]]
+
+
+@dataclass(frozen=True)
+class Posting:
+    doc_id: int
+    term_frequency: int
+    line_numbers: tuple[int, ...]
+    # (line, word index within the line) of every occurrence, for phrase matching.
+    positions: tuple[tuple[int, int], ...] = ()
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    resource: str
+    score: float
+    lines: list[str]
+    # 0-based numbers of ``lines`` in the resource, and how many lines matched in all.
+    line_numbers: list[int] = field(default_factory=list)
+    matched: int = 0
+    # Vocabulary words the query matched (after prefix expansion and typo correction), for highlighting.
+    terms: frozenset[str] = frozenset()
+
+
+# Matching lines per resource: doc_id -> line numbers.
+Matches = dict[int, set[int]]
+
+# Token -> doc_id -> (line, word index within the line) of each occurrence, while building.
+Positions = dict[str, dict[int, list[tuple[int, int]]]]
+
+
+@dataclass(frozen=True)
+class IndexShard:
+    """Postings for a contiguous run of documents, numbered from 0 within the shard.
+
+    Each term's postings are packed into one array: the number of documents,
+    then per document ``doc_id, count`` followed by ``count`` (line, word index)
+    pairs.
+    """
+
+    lengths: list[int]
+    postings: dict[str, array]
+
+
+class PackedPostings:
+    """One term's postings as packed shard segments, each with the doc_id its shard starts at."""
+
+    __slots__ = ("segments",)
+
+    def __init__(self) -> None:
+        self.segments: list[tuple[int, array]] = []
+
+    def __len__(self) -> int:
+        return sum(data[0] for _, data in self.segments)
+
+    def unpack(self) -> list[Posting]:
+        postings = []
+        for doc_offset, data in self.segments:
+            i = 1
+            while i < len(data):
+                doc_id, count = data[i], data[i + 1]
+                flat = data[i + 2 : i + 2 + 2 * count]
+                lines = flat[::2]
+                postings.append(
+                    Posting(
+                        doc_id=doc_offset + doc_id,
+                        term_frequency=count,
+                        line_numbers=tuple(dict.fromkeys(lines)),
+                        positions=tuple(zip(lines, flat[1::2], strict=True)),
+                    )
+                )
+                i += 2 + 2 * count
+        return postings
+
+
+class PostingTable(Mapping[str, list[Posting]]):
+    """Postings by term. Terms added from shards stay packed until their first lookup."""
+
+    def __init__(self, postings: dict[str, list[Posting]] | None = None):
+        self._terms: dict[str, list[Posting] | PackedPostings] = dict(postings or {})
+
+    def add_shard(self, doc_offset: int, shard: IndexShard) -> None:
+        for term, data in shard.postings.items():
+            packed = self._terms.get(term)
+            if packed is None:
+                packed = self._terms[term] = PackedPostings()
+            elif not isinstance(packed, PackedPostings):
+                raise ValueError(f"cannot add a shard after the postings of '{term}' were unpacked")
+            packed.segments.append((doc_offset, data))
+
+    def __getitem__(self, term: str) -> list[Posting]:
+        postings = self._terms[term]
+        if isinstance(postings, PackedPostings):
+            # Concurrent lookups may both unpack; they store equal lists, so either one may win.
+            postings = self._terms[term] = postings.unpack()
+        return postings
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._terms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._terms)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def document_frequency(self, term: str) -> int:
+        """Number of resources containing ``term``, without unpacking its postings."""
+        return len(self._terms.get(term, ()))
+
+
+def index_shard(documents: dict[str, str]) -> IndexShard:
+    """Tokenize ``documents`` into a packed shard; runs in worker processes (see :mod:`src.util.indexer`)."""
+    _, lengths, building = _collect_positions(documents)
+    postings = {}
+    for token, docs in building.items():
+        data = array(OFFSET_TYPECODE, [len(docs)])
+        for doc_id, positions in docs.items():
+            data.append(doc_id)
+            data.append(len(positions))
+            data.extend(itertools.chain.from_iterable(positions))
+        postings[token] = data
+    return IndexShard(lengths, postings)
+
+
+def _collect_positions(documents: dict[str, str]) -> tuple[list[LineTable], list[int], Positions]:
+    """Return each document's line table and token count, and every token's positions per document."""
+    tables: list[LineTable] = []
+    lengths: list[int] = []
+    building: Positions = defaultdict(dict)
+    for doc_id, text in enumerate(documents.values()):
+        lines = LineTable(text)
+        length = 0
+        for line_number, column, token in lines.finditer(TOKEN_PATTERN):
+            length += 1
+            docs = building[token]
+            if doc_id in docs:
+                docs[doc_id].append((line_number, column))
+            else:
+                docs[doc_id] = [(line_number, column)]
+        tables.append(lines)
+        lengths.append(length)
+    return tables, lengths, building
+
+
+class SearchIndex:
+    """Positional inverted index mapping each token to the resources, lines and line positions containing it."""
+
+    def __init__(self, documents: dict[str, str]):
+        self.doc_names: list[str] = list(documents)
+        self.doc_lines, self.doc_lengths, building = _collect_positions(documents)
+        self.postings = PostingTable(
+            {
+                token: [
+                    Posting(
+                        doc_id=doc_id,
+                        term_frequency=len(positions),
+                        line_numbers=tuple(dict.fromkeys(line for line, _ in positions)),
+                        positions=tuple(positions),
+                    )
+                    for doc_id, positions in docs.items()
+                ]
+                for token, docs in building.items()
+            }
+        )
+        self.avg_doc_length = sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        self._reset_lazy()
+
+    def _reset_lazy(self) -> None:
+        self._trigrams: TrigramIndex | None = None
+        self._sorted_terms: list[str] | None = None
+        self._section_trees: Mapping[str, "SectionTree"] | None = None
+        # Set by get_index so field queries reuse the snapshot's section trees.
+        self._section_source: Callable[[], Mapping[str, "SectionTree"]] | None = None
+        self._word_lines: Matches | None = None
+
+    @classmethod
+    def from_entries(cls, entries: dict[str, ContentEntry]) -> "SearchIndex":
+        return cls({name: entry.text for name, entry in entries.items()})
+
+    @classmethod
+    def from_shards(cls, documents: dict[str, str], shards: list[IndexShard]) -> "SearchIndex":
+        """Combine ``index_shard`` results for consecutive runs of ``documents``, in order."""
+        index = cls.__new__(cls)
+        index.doc_names = list(documents)
+        index.doc_lines = [LineTable(text) for text in documents.values()]
+        index.doc_lengths = []
+        index.postings = PostingTable()
+        for shard in shards:
+            index.postings.add_shard(len(index.doc_lengths), shard)
+            index.doc_lengths.extend(shard.lengths)
+        if len(index.doc_lengths) != len(index.doc_names):
+            raise ValueError(f"shards cover {len(index.doc_lengths)} documents, expected {len(index.doc_names)}")
+        index.avg_doc_length = sum(index.doc_lengths) / len(index.doc_lengths) if index.doc_lengths else 0.0
+        index._reset_lazy()
+        return index
+
+    def to_payload(self) -> dict:
+        """Return a JSON-serializable form of the index (see ``src.util.bundle``)."""
+        return {
+            "docs": self.doc_names,
+            "lengths": self.doc_lengths,
+            "postings": {
+                term: [[p.doc_id, [value for position in p.positions for value in position]] for p in postings]
+                for term, postings in self.postings.items()
+            },
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict, documents: dict[str, str]) -> "SearchIndex":
+        """Rebuild an index from ``to_payload`` output without re-tokenizing ``documents``."""
+        index = cls.__new__(cls)
+        index.doc_names = list(payload["docs"])
+        index.doc_lines = [LineTable(documents[name]) for name in index.doc_names]
+        index.doc_lengths = list(payload["lengths"])
+        postings: dict[str, list[Posting]] = {}
+        for term, term_postings in payload["postings"].items():
+            postings[term] = []
+            for doc_id, flat in term_postings:
+                positions = tuple(zip(flat[::2], flat[1::2], strict=True))
+                line_numbers = tuple(dict.fromkeys(line for line, _ in positions))
+                postings[term].append(Posting(doc_id, len(positions), line_numbers, positions))
+        index.postings = PostingTable(postings)
+        index.avg_doc_length = sum(index.doc_lengths) / len(index.doc_lengths) if index.doc_lengths else 0.0
+        index._reset_lazy()
+        return index
+
+    def idf(self, term: str) -> float:
+        return self._idf(self.postings.document_frequency(term))
+
+    def _idf(self, df: int) -> float:
+        n = len(self.doc_names)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def corrections(self, query: str) -> dict[str, list[str]]:
+        """Map each query word missing from the vocabulary to its closest vocabulary terms (possibly none)."""
+        missing = [
+            term.text
+            for term in dict.fromkeys(query_terms(parse_query(query)))
+            if not term.prefix and term.text not in self.postings
+        ]
+        if not missing:
+            return {}
+        if self._trigrams is None:
+            # Built on the first typo rather than with the index; most queries never need it.
+            self._trigrams = TrigramIndex(self.postings)
+        return {term: self._trigrams.candidates(term) for term in dict.fromkeys(missing)}
+
+    def search(
+        self, query: str, limit: int | None = None, fuzzy: bool = True, max_lines: int | None = None
+    ) -> list[SearchHit]:
+        """Return resources with lines matching ``query`` (see :mod:`src.util.query`), best BM25 score first.
+
+        With ``fuzzy``, a word missing from the vocabulary matches any of its
+        ``corrections`` instead. Only words that are not negated contribute to
+        the score. ``limit`` keeps the best resources with a heap rather than
+        sorting them all, and ``max_lines`` decodes only the first lines of each.
+        """
+        node = parse_query(query)
+        if node is None:
+            return []
+
+        corrections = self.corrections(query) if fuzzy else {}
+        matches = self._evaluate(node, corrections)
+        matches = {doc_id: lines for doc_id, lines in matches.items() if lines}
+        if not matches:
+            return []
+
+        scores: dict[int, float] = defaultdict(float)
+        matched_terms: set[str] = set()
+        for term in dict.fromkeys(query_terms(node)):
+            postings = self._term_postings(term, corrections)
+            matched_terms.update(self._term_words(term, corrections))
+            idf = self._idf(len(postings))
+            for posting in postings:
+                if posting.doc_id in matches:
+                    scores[posting.doc_id] += idf * self._bm25_tf(posting)
+
+        def rank(doc_id: int) -> tuple[float, int]:
+            return (-scores[doc_id], doc_id)
+
+        ranked = sorted(matches, key=rank) if limit is None else heapq.nsmallest(limit, matches, key=rank)
+        terms = frozenset(matched_terms)
+        hits = []
+        for doc_id in ranked:
+            lines = matches[doc_id]
+            shown = sorted(lines) if max_lines is None else heapq.nsmallest(max_lines, lines)
+            hits.append(
+                SearchHit(
+                    resource=self.doc_names[doc_id],
+                    score=scores[doc_id],
+                    lines=[self.doc_lines[doc_id].line(n) for n in shown],
+                    line_numbers=shown,
+                    matched=len(lines),
+                    terms=terms,
+                )
+            )
+        return hits
+
+    def _evaluate(self, node: Node, corrections: dict[str, list[str]]) -> Matches:
+        if isinstance(node, Term):
+            return {p.doc_id: set(p.line_numbers) for p in self._term_postings(node, corrections)}
+        if isinstance(node, Phrase):
+            return self._phrase(node.terms)
+        if isinstance(node, Field):
+            return self._field(node)
+        if isinstance(node, Not):
+            return _difference(self._all_lines(), self._evaluate(node.node, corrections))
+        if isinstance(node, Or):
+            result: Matches = defaultdict(set)
+            for child in node.nodes:
+                for doc_id, lines in self._evaluate(child, corrections).items():
+                    result[doc_id] |= lines
+            return result
+
+        # AND: intersect the positive operands smallest first, then subtract the negated ones.
+        positives = [self._evaluate(child, corrections) for child in node.nodes if not isinstance(child, Not)]
+        negatives = [self._evaluate(child.node, corrections) for child in node.nodes if isinstance(child, Not)]
+        positives.sort(key=lambda matches: sum(map(len, matches.values())))
+        result = positives[0] if positives else self._all_lines()
+        for other in positives[1:]:
+            result = {doc_id: lines & other[doc_id] for doc_id, lines in result.items() if doc_id in other}
+            result = {doc_id: lines for doc_id, lines in result.items() if lines}
+            if not result:
+                return {}
+        for negative in negatives:
+            result = _difference(result, negative)
+        return result
+
+    def _term_postings(self, term: Term, corrections: dict[str, list[str]]) -> list[Posting]:
+        return self._merged_postings(self._term_words(term, corrections))
+
+    def _term_words(self, term: Term, corrections: dict[str, list[str]]) -> list[str]:
+        if term.prefix:
+            return self._expand_prefix(term.text)
+        return [term.text] if term.text in self.postings else corrections.get(term.text, [])
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        """Vocabulary terms starting with ``prefix``: the PREFIX_MAX_TERMS found in the most resources."""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + "\U0010ffff", lo=start)
+        expansions = self._sorted_terms[start:end]
+        if len(expansions) > PREFIX_MAX_TERMS:
+            expansions = sorted(expansions, key=lambda term: -self.postings.document_frequency(term))[:PREFIX_MAX_TERMS]
+        return expansions
+
+    def _phrase(self, terms: tuple[str, ...]) -> Matches:
+        if any(term not in self.postings for term in terms):
+            return {}
+        # Candidate (line, start column) pairs, narrowed by each following word one column further on.
+        starts = {p.doc_id: set(p.positions) for p in self.postings[terms[0]]}
+        for offset, term in enumerate(terms[1:], start=1):
+            following = {p.doc_id: p.positions for p in self.postings[term] if p.doc_id in starts}
+            starts = {
+                doc_id: {(line, column - offset) for line, column in following[doc_id]} & positions
+                for doc_id, positions in starts.items()
+                if doc_id in following
+            }
+        return {doc_id: {line for line, _ in positions} for doc_id, positions in starts.items() if positions}
+
+    def _field(self, node: Field) -> Matches:
+        value = node.value.casefold()
+        if node.name == "resource":
+            all_lines = self._all_lines()
+            return {
+                doc_id: all_lines[doc_id]
+                for doc_id, name in enumerate(self.doc_names)
+                if name == value or (value.endswith("*") and name.startswith(value[:-1]))
+            }
+
+        result: Matches = {}
+        trees = self._trees()
+        for doc_id, name in enumerate(self.doc_names):
+            tree = trees[name]
+            section = tree.find(node.value)
+            if section is not None:
+                end = bisect.bisect_left(tree.line_offsets, section.end)
+                result[doc_id] = set(range(section.line - 1, end))
+        return result
+
+    def _trees(self) -> Mapping[str, "SectionTree"]:
+        if self._section_source is not None:
+            return self._section_source()
+        if self._section_trees is None:
+            from src.util.sections import SectionTree
+
+            self._section_trees = {
+                name: SectionTree(name, lines.text())
+                for name, lines in zip(self.doc_names, self.doc_lines, strict=True)
+            }
+        return self._section_trees
+
+    def _all_lines(self) -> Matches:
+        """Every line with at least one word; the universe that NOT complements against."""
+        if self._word_lines is None:
+            self._word_lines = defaultdict(set)
+            for postings in self.postings.values():
+                for posting in postings:
+                    self._word_lines[posting.doc_id].update(posting.line_numbers)
+        return {doc_id: set(lines) for doc_id, lines in self._word_lines.items()}
+
+    def _merged_postings(self, terms: list[str]) -> list[Posting]:
+        """Postings for "any of ``terms``": per resource, summed frequencies and the union of lines."""
+        if len(terms) == 1:
+            return self.postings[terms[0]]
+        if not terms:
+            return []
+        merged: dict[int, tuple[int, set[int]]] = {}
+        for term in terms:
+            for posting in self.postings[term]:
+                frequency, lines = merged.get(posting.doc_id, (0, set()))
+                merged[posting.doc_id] = (frequency + posting.term_frequency, lines | set(posting.line_numbers))
+        return [
+            Posting(doc_id=doc_id, term_frequency=frequency, line_numbers=tuple(sorted(lines)))
+            for doc_id, (frequency, lines) in sorted(merged.items())
+        ]
+
+    def _bm25_tf(self, posting: Posting) -> float:
+        tf = posting.term_frequency
+        length_ratio = self.doc_lengths[posting.doc_id] / self.avg_doc_length if self.avg_doc_length else 1.0
+        return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length_ratio))
+
+
+def snippet(line: str, terms: frozenset[str] | set[str], width: int = SNIPPET_WIDTH) -> str:
+    """Return about ``width`` characters of ``line`` around its first match, with matched words in bold.
+
+    The window is cut at word boundaries and marked with "…" where text was left out.
+    Words inside URLs and link targets are not bolded.
+    """
+    text = line.strip()
+    verbatim = [match.span() for match in UNHIGHLIGHTED_PATTERN.finditer(text)]
+    spans = [
+        match.span()
+        for match in TOKEN_PATTERN.finditer(text)
+        if match[0].casefold() in terms and not any(start <= match.start() < end for start, end in verbatim)
+    ]
+    start, end = 0, len(text)
+    if len(text) > width:
+        # Put the first match a quarter of the way in, so the window shows what leads up to it.
+        first = spans[0][0] if spans else 0
+        start = max(0, min(first - width // 4, len(text) - width))
+        end = start + width
+        if start > 0:
+            space = text.find(" ", start, first)
+            start = space + 1 if space != -1 else start
+        if end < len(text):
+            cut = text.rfind(" ", max(start, spans[0][1] if spans else start), end)
+            end = cut if cut > start else end
+
+    parts: list[str] = []
+    position = start
+    for span_start, span_end in spans:
+        if span_start >= start and span_end <= end:
+            parts.extend((text[position:span_start], "**", text[span_start:span_end], "**"))
+            position = span_end
+    parts.append(text[position:end])
+    return ("…" if start > 0 else "") + "".join(parts).strip() + ("…" if end < len(text) else "")
+
+
+def _difference(matches: Matches, excluded: Matches) -> Matches:
+    return {doc_id: lines - excluded.get(doc_id, set()) for doc_id, lines in matches.items()}
+
+
+def get_index(store: ContentStore | Snapshot) -> SearchIndex:
+    """Return the search index for ``store``, rebuilding it only when the content changed."""
+    from src.util.sections import get_section_trees
+
+    snapshot = store.snapshot() if isinstance(store, ContentStore) else store
+    index = snapshot.derived("search_index", SearchIndex.from_entries)
+    if index._section_source is None:
+        index._section_source = lambda: get_section_trees(snapshot)
+    return index
@@ -0,0 +1,130 @@
+"""Markdown heading trees for section-level retrieval.
+
+Each resource is parsed once per content version into a tree of ATX headings
+(``#`` .. ``######``) with UTF-8 byte offsets, so a single job, season or
+project can be sliced out of a document without returning the whole thing.
+"""
+
+import re
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from src.util.lines import OFFSET_TYPECODE, split_lines
+from src.util.store import ContentEntry, ContentStore, Snapshot
+from src.util.tokens import estimate_tokens
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$")
+FENCE_PATTERN = re.compile(r"^(```|~~~)")
+LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+
+# Separators accepted between heading names in a section path.
+PATH_SEPARATORS = re.compile(r"\s*(?:/|>)\s*")
+
+
+@dataclass
+class Section:
+    title: str
+    level: int
+    path: tuple[str, ...]
+    line: int
+    start: int
+    end: int
+    children: list["Section"] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+class SectionTree:
+    """All headings of one document, in document order, with byte ranges into its UTF-8 encoding."""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.data = text.encode()
+        self.sections: list[Section] = []
+        self.roots: list[Section] = []
+        # Byte offset of the start of every line, for cutting pages on line boundaries.
+        self.line_offsets = array(OFFSET_TYPECODE)
+
+        stack: list[Section] = []
+        offset = 0
+        in_fence = False
+        for line_number, line in enumerate(split_lines(text), start=1):
+            self.line_offsets.append(offset)
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+            match = None if in_fence else HEADING_PATTERN.match(line.rstrip("\r\n"))
+            if match:
+                level = len(match.group(1))
+                while stack and stack[-1].level >= level:
+                    stack.pop().end = offset
+                title = LINK_PATTERN.sub(r"\1", match.group(2)).strip()
+                parent_path = stack[-1].path if stack else ()
+                section = Section(title, level, (*parent_path, title), line_number, offset, len(self.data))
+                (stack[-1].children if stack else self.roots).append(section)
+                self.sections.append(section)
+                stack.append(section)
+            offset += len(line.encode())
+
+        for section in stack:
+            section.end = len(self.data)
+        # Section start offsets in document order, for bisecting page boundaries.
+        self.section_starts = array(OFFSET_TYPECODE, (section.start for section in self.sections))
+
+    def text(self, section: Section) -> str:
+        return self.data[section.start : section.end].decode()
+
+    def find(self, query: str) -> Section | None:
+        """Return the section best matching a heading name or a path like ``"2015-2016 Season/Singles"``.
+
+        Path components are matched case-insensitively against the tail of each
+        section's heading path, so leading ancestors (such as the document title)
+        can be left out. Exact heading matches beat substring matches; ties go to
+        the earliest section in the document.
+        """
+        components = [c.lower() for c in PATH_SEPARATORS.split(query.strip()) if c]
+        if not components:
+            return None
+
+        partial: Section | None = None
+        for section in self.sections:
+            if len(section.path) < len(components):
+                continue
+            tail = [title.lower() for title in section.path[-len(components) :]]
+            if all(c == t for c, t in zip(components, tail, strict=True)):
+                return section
+            if partial is None and all(c in t for c, t in zip(components, tail, strict=True)):
+                partial = section
+        return partial
+
+    def units(self) -> Iterator[tuple[tuple[str, ...], int, str]]:
+        """Yield (heading path, first line, own text) for the preamble and every section.
+
+        A section's own text is its heading plus what comes before its first
+        subsection, so each line of the document belongs to exactly one unit.
+        """
+        first = self.sections[0].start if self.sections else len(self.data)
+        if first:
+            yield (), 1, self.data[:first].decode()
+        for section in self.sections:
+            end = section.children[0].start if section.children else section.end
+            yield section.path, section.line, self.data[section.start : end].decode()
+
+    def outline(self) -> list[str]:
+        """Return one indented line per heading with its line number and approximate token size."""
+        min_level = min((s.level for s in self.sections), default=1)
+        return [
+            f"{'  ' * (s.level - min_level)}- {s.title} (line {s.line}, ~{estimate_tokens(self.text(s))} tokens)"
+            for s in self.sections
+        ]
+
+
+def build_section_trees(entries: dict[str, ContentEntry]) -> dict[str, SectionTree]:
+    return {name: SectionTree(name, entry.text) for name, entry in entries.items()}
+
+
+def get_section_trees(store: ContentStore | Snapshot) -> dict[str, SectionTree]:
+    """Return heading trees for every resource in ``store``, rebuilt only when the content changed."""
+    return store.derived("section_trees", build_section_trees)
@@ -0,0 +1,165 @@
+"""Vectorized TF-IDF search over resource sections (needs the optional ``numpy`` dependency).
+
+Every section's own text (its heading plus the lines before its first
+subsection) becomes one unit. Units are vectorized once per content version
+into L2-normalized TF-IDF vectors over words and character n-grams, so
+"microservice" still scores against "microservices" and queries need not
+match a whole line. Vectors are stored column-wise (one array of unit ids and
+weights per feature), which makes a query one sparse matrix-vector product
+whose cost is the total postings of the query's features, followed by an
+``argpartition`` top-k. Everything runs locally on the CPU.
+
+Install with ``pip install 'larkin-mcp[semantic]'``.
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from src.util.lines import split_lines
+from src.util.search import tokenize
+from src.util.sections import SectionTree, build_section_trees
+from src.util.store import ContentEntry, ContentStore, Snapshot
+
+# Character n-gram length taken from each padded word (" kafka " -> " kafk", "kafka", ...).
+CHAR_NGRAM = 5
+# Relative weight of character n-gram features versus whole words.
+CHAR_NGRAM_WEIGHT = 0.5
+# Cosine similarity below which a unit only shares incidental fragments with the query.
+MIN_SCORE = 0.05
+
+
+def features(text: str) -> Counter[str]:
+    """Return word and character n-gram counts for ``text``."""
+    words = Counter(tokenize(text))
+    counts: Counter[str] = Counter({"w:" + word: count for word, count in words.items()})
+    for word, count in words.items():
+        for ngram in _ngrams(word):
+            counts[ngram] += count
+    return counts
+
+
+@lru_cache(maxsize=65536)
+def _ngrams(word: str) -> tuple[str, ...]:
+    padded = f" {word} "
+    return tuple("c:" + padded[i : i + CHAR_NGRAM] for i in range(max(1, len(padded) - CHAR_NGRAM + 1)))
+
+
+@dataclass(frozen=True)
+class SemanticHit:
+    resource: str
+    path: tuple[str, ...]
+    line: int
+    score: float
+    lines: list[str]
+
+
+@dataclass(frozen=True)
+class _Unit:
+    resource: str
+    path: tuple[str, ...]
+    line: int
+    lines: list[str]
+
+
+class SemanticIndex:
+    """Column-major sparse TF-IDF matrix over section units."""
+
+    def __init__(self, trees: dict[str, SectionTree]):
+        self.units: list[_Unit] = []
+        self.vocabulary: dict[str, int] = {}
+        unit_cols: list[np.ndarray] = []
+        unit_counts: list[np.ndarray] = []
+        for name, tree in trees.items():
+            for path, line, text in tree.units():
+                counts = features(text)
+                # Heading-only units (a heading directly followed by a subheading) have nothing to show.
+                if counts and text.strip().count("\n"):
+                    self.units.append(_Unit(name, path, line, [row.rstrip("\r\n") for row in split_lines(text)]))
+                    ids = [self.vocabulary.setdefault(feature, len(self.vocabulary)) for feature in counts]
+                    unit_cols.append(np.array(ids, dtype=np.int64))
+                    unit_counts.append(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+
+        n, size = len(self.units), len(self.vocabulary)
+        cols = np.concatenate(unit_cols) if unit_cols else np.zeros(0, dtype=np.int64)
+        counts_array = np.concatenate(unit_counts) if unit_counts else np.zeros(0, dtype=np.float32)
+        row_lengths = np.array([len(c) for c in unit_cols], dtype=np.int64)
+        rows = np.repeat(np.arange(n, dtype=np.int32), row_lengths)
+
+        # Per-feature weight: smoothed IDF, scaled down for character n-grams.
+        idf = np.log((1 + n) / (1 + np.bincount(cols, minlength=size))) + 1
+        is_ngram = np.fromiter((feature.startswith("c:") for feature in self.vocabulary), dtype=bool, count=size)
+        self.column_weights = (idf * np.where(is_ngram, CHAR_NGRAM_WEIGHT, 1.0)).astype(np.float32)
+
+        values = (1 + np.log(counts_array)) * self.column_weights[cols]
+        if n:
+            norms = np.sqrt(np.add.reduceat(values * values, np.concatenate(([0], row_lengths.cumsum()[:-1]))))
+            values /= np.repeat(norms, row_lengths)
+
+        order = np.argsort(cols, kind="stable")
+        self.rows = rows[order]
+        self.values = values[order].astype(np.float32)
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=size), out=self.indptr[1:])
+
+    def _weights(self, counts: Counter[str]) -> dict[int, float]:
+        """Sublinear TF-IDF weight per known feature column."""
+        weights = {}
+        for feature, count in counts.items():
+            col = self.vocabulary.get(feature)
+            if col is not None:
+                weights[col] = (1 + math.log(count)) * float(self.column_weights[col])
+        return weights
+
+    def search(self, query: str, limit: int = 10) -> list[SemanticHit]:
+        """Return up to ``limit`` units with the highest cosine similarity to ``query``, above MIN_SCORE."""
+        weights = self._weights(features(query))
+        if not weights or not self.units:
+            return []
+
+        cols = np.fromiter(weights.keys(), dtype=np.int64)
+        query_values = np.fromiter(weights.values(), dtype=np.float32)
+        query_values /= np.linalg.norm(query_values)
+
+        starts, ends = self.indptr[cols], self.indptr[cols + 1]
+        lengths = ends - starts
+        positions = np.repeat(ends - lengths.cumsum(), lengths) + np.arange(lengths.sum())
+        scores = np.bincount(
+            self.rows[positions],
+            weights=self.values[positions] * np.repeat(query_values, lengths),
+            minlength=len(self.units),
+        )
+
+        k = min(limit, len(self.units))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        query_features = set(features(query))
+        hits = []
+        for unit_id in top:
+            if scores[unit_id] < MIN_SCORE:
+                break
+            unit = self.units[unit_id]
+            score = float(scores[unit_id])
+            hits.append(SemanticHit(unit.resource, unit.path, unit.line, score, _snippet(unit, query_features)))
+        return hits
+
+
+def _snippet(unit: _Unit, query_features: set[str]) -> list[str]:
+    """Body lines ordered by how many features they share with the query, else the first body line."""
+    body = [line for line in unit.lines[1 if unit.path else 0 :] if line.strip()]
+    overlap = {line: len(query_features & features(line).keys()) for line in body}
+    matching = sorted((line for line in body if overlap[line]), key=lambda line: -overlap[line])
+    return matching or body[:1]
+
+
+def build_semantic_index(entries: dict[str, ContentEntry]) -> SemanticIndex:
+    return SemanticIndex(build_section_trees(entries))
+
+
+def get_semantic_index(store: ContentStore | Snapshot) -> SemanticIndex:
+    """Return the semantic index for ``store``, rebuilding it only when the content changed."""
+    return store.derived("semantic_index", build_semantic_index)
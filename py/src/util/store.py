@@ -0,0 +1,603 @@
+"""In-memory content store for the larkin-mcp server.
+
+Every category is read from disk once and served from memory afterwards. Each
+lookup does a single ``stat`` and compares mtime/size against the cached entry,
+so edits to the markdown files still show up without restarting the server.
+
+Requests that touch more than one resource, or a resource plus an index built
+from it, read from a :class:`Snapshot`: an immutable view of every entry and of
+the values derived from them. With :meth:`ContentStore.watch`, a background
+thread polls the files instead, builds the next snapshot (indexes included) off
+the request path and swaps it in with a single assignment, so requests never
+stat files, never wait for a rebuild and never see two versions at once.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from src.constants import (
+    BUNDLE_ENV,
+    BUNDLE_PATH,
+    CONTENT_HISTORY_SIZE,
+    RESOURCES_CATEGORIES,
+    RESOURCES_DIR,
+    RESUME_MD_PATH,
+    RESUME_PDF_PATH,
+    RESUME_PDF_RESOURCE,
+)
+
+if TYPE_CHECKING:
+    from src.util.bundle import ContentBundle
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UnknownResourceError(FileNotFoundError):
+    """A name that is not one of the store's categories; such names never reach the filesystem."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"'{name}' is not a known resource")
+
+
+@dataclass(frozen=True)
+class ContentEntry:
+    name: str
+    path: Path
+    text: str
+    mtime_ns: int
+    size: int
+    loaded_at: float
+
+    @cached_property
+    def etag(self) -> str:
+        """Content hash of the text: equal for equal content, whatever the file's mtime."""
+        return hashlib.sha256(self.text.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class BlobEntry:
+    """A binary file's bytes plus their base64 encoding, both copied once per version.
+
+    The bytes are a private copy rather than a mapping of the file, so an in-place
+    rewrite can never tear a read or change them behind the cached encoding.
+    """
+
+    path: Path
+    data: bytes
+    base64: str
+    mtime_ns: int
+    size: int
+    loaded_at: float
+
+    @cached_property
+    def etag(self) -> str:
+        """Content hash of the bytes, like ``ContentEntry.etag``."""
+        return hashlib.sha256(self.data).hexdigest()[:16]
+
+    def base64_range(self, offset: int, length: int) -> str:
+        """Return the base64 encoding of ``data[offset:offset + length]``.
+
+        When the slice starts and ends on a 3-byte boundary (or runs to the end of the
+        file) it is cut straight out of the precomputed encoding instead of re-encoding.
+        """
+        end = min(offset + length, self.size)
+        if offset % 3 == 0 and (end % 3 == 0 or end == self.size):
+            stop = len(self.base64) if end == self.size else end // 3 * 4
+            return self.base64[offset // 3 * 4 : stop]
+        return base64.b64encode(self.data[offset:end]).decode()
+
+
+class Snapshot:
+    """One consistent, immutable version of every resource, plus the values derived from it."""
+
+    def __init__(
+        self,
+        entries: dict[str, ContentEntry],
+        errors: dict[str, str],
+        paths: dict[str, Path],
+        blobs: dict[str, BlobEntry] | None = None,
+    ):
+        self.entries: Mapping[str, ContentEntry] = MappingProxyType(dict(entries))
+        # Binary resources by name; they carry ETags but are not searched or diffed.
+        self.blobs: Mapping[str, BlobEntry] = MappingProxyType(dict(blobs or {}))
+        self.errors: Mapping[str, str] = MappingProxyType(dict(errors))
+        self.version = _signature(entries)
+        self.created_at = time.time()
+        self._paths = paths
+        self._derived: dict[str, Any] = {}
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> ContentEntry:
+        """Return the entry for ``name``.
+
+        Raises:
+            FileNotFoundError: If ``name`` had no readable file when the snapshot was taken.
+        """
+        entry = self.entries.get(name)
+        if entry is None and name not in self._paths:
+            raise UnknownResourceError(name)
+        if entry is None:
+            raise FileNotFoundError(self.errors.get(name) or f"not found at {self._paths.get(name)}")
+        return entry
+
+    def derived(self, key: str, build: Callable[[dict[str, ContentEntry]], T]) -> T:
+        """Return ``build(entries)``, computed at most once for this snapshot."""
+        if key in self._derived:
+            return self._derived[key]
+        with self._lock:
+            if key not in self._derived:
+                load = self._loaders.pop(key, None)
+                if load is not None:
+                    self._derived[key] = load()
+                    logger.debug(f"Loaded precomputed derived value '{key}'")
+                else:
+                    self._derived[key] = build(dict(self.entries))
+                    logger.debug(f"Built derived value '{key}' over {len(self.entries)} resources")
+            return self._derived[key]
+
+    def etags(self) -> dict[str, str]:
+        """Return the ETag of every text resource and blob, by name."""
+        etags = {name: entry.etag for name, entry in self.entries.items()}
+        etags.update((name, blob.etag) for name, blob in self.blobs.items())
+        return etags
+
+    @cached_property
+    def content_id(self) -> str:
+        """Hash of every text resource's content: the version id clients pass to ``get_changes``."""
+        digest = hashlib.sha256()
+        for name, entry in sorted(self.entries.items()):
+            digest.update(f"{name}:{entry.etag}\n".encode())
+        return digest.hexdigest()[:16]
+
+    def has_derived(self, key: str) -> bool:
+        return key in self._derived
+
+    def _seed(self, key: str, load: Callable[[], Any]) -> None:
+        self._loaders[key] = load
+
+
+class ContentStore:
+    """Process-wide cache of resource text keyed by category name."""
+
+    def __init__(
+        self,
+        root: Path = RESOURCES_DIR,
+        categories: list[str] = RESOURCES_CATEGORIES,
+        bundle: "ContentBundle | None" = None,
+    ):
+        self.root = root
+        self.categories = list(categories)
+        self.bundle = bundle
+        self._entries: dict[str, ContentEntry] = {}
+        self._errors: dict[str, str] = {}
+        self._blobs: dict[Path, BlobEntry] = {}
+        self._preloaded = False
+        self.last_reload: float | None = None
+        # Precomputed values for the bundle's content version, copied into matching snapshots.
+        self._seeded: dict[str, tuple[tuple, Callable[[], Any]]] = {}
+        # Every derived value requested so far, rebuilt for each new snapshot before it is swapped in.
+        self._builders: dict[str, Callable[[dict[str, ContentEntry]], Any]] = {}
+        self._snapshot: Snapshot | None = None
+        self._watcher: ContentWatcher | None = None
+        self._listeners: list[Callable[[Snapshot, Snapshot], None]] = []
+        # Entries of recent snapshots by content id, oldest first; derived values are not kept.
+        self._history: OrderedDict[str, Mapping[str, ContentEntry]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def path_for(self, name: str) -> Path:
+        """Return the markdown file behind category ``name``.
+
+        Raises:
+            UnknownResourceError: If ``name`` is not one of ``categories``, so no caller can
+                name a path outside the content root.
+        """
+        if name not in self.categories:
+            raise UnknownResourceError(name)
+        if name == "resume":
+            return self.root / RESUME_MD_PATH.relative_to(RESOURCES_DIR)
+        return self.root / f"{name}.md"
+
+    def exists(self, name: str) -> bool:
+        """Return whether ``name`` can be served, either from disk or from the bundle."""
+        if name not in self.categories:
+            return False
+        return self.path_for(name).exists() or (self.bundle is not None and name in self.bundle.resources)
+
+    def get(self, name: str) -> ContentEntry:
+        """Return the cached entry for ``name``, re-reading it if the file changed.
+
+        While the store is watched, the entry comes from the current snapshot instead,
+        without touching the filesystem.
+
+        Raises:
+            UnknownResourceError: If ``name`` is not one of ``categories``.
+            FileNotFoundError: If the backing file does not exist.
+            OSError / UnicodeDecodeError: If the file exists but cannot be read.
+        """
+        snapshot = self._snapshot
+        if self._watcher is not None and snapshot is not None:
+            return snapshot.get(name)
+        return self._load(name)
+
+    def _load(self, name: str) -> ContentEntry:
+        path = self.path_for(name)
+        try:
+            stat = path.stat()
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            # A bundle-only install ships no loose files; the bundle is the content.
+            if self.bundle is None or name not in self.bundle.resources:
+                self.invalidate(name)
+                self._errors[name] = f"not found at {path}"
+                raise
+            mtime_ns, size = self.bundle.resources[name].mtime_ns, self.bundle.resources[name].size
+
+        cached = self._entries.get(name)
+        if cached is not None and cached.mtime_ns == mtime_ns and cached.size == size:
+            return cached
+
+        with self._lock:
+            cached = self._entries.get(name)
+            if cached is not None and cached.mtime_ns == mtime_ns and cached.size == size:
+                return cached
+
+            try:
+                text = self._read_text(name, path, mtime_ns, size)
+            except Exception as e:
+                self._errors[name] = f"{type(e).__name__}: {e}"
+                raise
+            entry = ContentEntry(
+                name=name,
+                path=path,
+                text=text,
+                mtime_ns=mtime_ns,
+                size=size,
+                loaded_at=time.time(),
+            )
+            self._entries[name] = entry
+            self._errors.pop(name, None)
+            self.last_reload = entry.loaded_at
+
+        logger.debug(f"{'Reloaded' if cached else 'Loaded'} resource '{name}' ({entry.size} bytes)")
+        return entry
+
+    def _read_text(self, name: str, path: Path, mtime_ns: int, size: int) -> str:
+        bundled = self.bundle.resources.get(name) if self.bundle else None
+        if self.bundle and bundled and bundled.mtime_ns == mtime_ns and bundled.size == size:
+            return self.bundle.text(name)
+        return path.read_text()
+
+    @property
+    def resume_pdf_path(self) -> Path:
+        return self.root / RESUME_PDF_PATH.relative_to(RESOURCES_DIR)
+
+    def get_blob(self, path: Path) -> BlobEntry:
+        """Return the contents of ``path``, re-reading them if the file changed.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        relative_path = path.relative_to(self.root).as_posix() if path.is_relative_to(self.root) else None
+        bundled = self.bundle.blobs.get(relative_path) if self.bundle and relative_path else None
+        try:
+            stat = path.stat()
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            if bundled is None:
+                with self._lock:
+                    self._blobs.pop(path, None)
+                raise
+            mtime_ns, size = bundled.mtime_ns, bundled.size
+
+        cached = self._blobs.get(path)
+        if cached is not None and cached.mtime_ns == mtime_ns and cached.size == size:
+            return cached
+
+        with self._lock:
+            cached = self._blobs.get(path)
+            if cached is not None and cached.mtime_ns == mtime_ns and cached.size == size:
+                return cached
+
+            if self.bundle and relative_path and bundled and bundled.mtime_ns == mtime_ns and bundled.size == size:
+                data = bytes(self.bundle.blob(relative_path))
+            else:
+                data = path.read_bytes()
+            entry = BlobEntry(
+                path=path,
+                data=data,
+                base64=base64.b64encode(data).decode(),
+                mtime_ns=mtime_ns,
+                # The file may have changed since the stat; the copy is what gets served.
+                size=len(data),
+                loaded_at=time.time(),
+            )
+            self._blobs[path] = entry
+
+        logger.debug(f"Loaded binary resource {path.name} ({entry.size} bytes)")
+        return entry
+
+    def entries(self) -> dict[str, ContentEntry]:
+        """Return the current entry for every available category, in category order."""
+        return dict(self.snapshot().entries)
+
+    def version(self) -> tuple:
+        """Return a value that changes whenever any resource is added, removed or modified."""
+        return self.snapshot().version
+
+    def derived(self, key: str, build: Callable[[dict[str, ContentEntry]], T]) -> T:
+        """Return a value computed from all entries, rebuilding it only when the content changes.
+
+        This is how search indexes and other per-corpus structures hang off the store
+        without each of them re-implementing change detection.
+        """
+        self._builders.setdefault(key, build)
+        return self.snapshot().derived(key, build)
+
+    def snapshot(self) -> Snapshot:
+        """Return the current snapshot.
+
+        While the store is watched this is just the last snapshot the watcher swapped
+        in. Otherwise every file is stat'ed, as ``get`` does, and a new snapshot is
+        taken if anything changed.
+        """
+        snapshot = self._snapshot
+        if self._watcher is not None and snapshot is not None:
+            return snapshot
+        return self.refresh()
+
+    def refresh(self, warm: bool = False) -> Snapshot:
+        """Re-check every file and swap in a new snapshot if any changed.
+
+        With ``warm``, every derived value used so far is built for the new snapshot
+        before it becomes visible, so no request pays for the rebuild.
+        """
+        with self._refresh_lock:
+            entries = {}
+            for name in self.categories:
+                try:
+                    entries[name] = self._load(name)
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable resource '{name}': {e}")
+
+            blobs = {}
+            try:
+                blobs[RESUME_PDF_RESOURCE] = self.get_blob(self.resume_pdf_path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Skipping unreadable resource '{RESUME_PDF_RESOURCE}': {e}")
+
+            current = self._snapshot
+            text_unchanged = current is not None and current.version == _signature(entries)
+            if current is not None and text_unchanged and _signature(current.blobs) == _signature(blobs):
+                return current
+
+            snapshot = Snapshot(entries, self._errors, {name: self.path_for(name) for name in self.categories}, blobs)
+            if current is not None and text_unchanged:
+                # Only a blob changed; everything derived from the text still holds.
+                snapshot._derived.update(current._derived)
+                snapshot._loaders.update(current._loaders)
+            for key, (signature, load) in self._seeded.items():
+                if signature == snapshot.version and key not in snapshot._derived:
+                    snapshot._seed(key, load)
+            if warm:
+                for key, build in list(self._builders.items()):
+                    snapshot.derived(key, build)
+            # A single reference assignment: readers see either the old snapshot or the new one.
+            self._snapshot = snapshot
+            self._remember(snapshot)
+        if current is not None:
+            logger.info(f"Swapped in content snapshot over {len(entries)} resources")
+            for listener in list(self._listeners):
+                try:
+                    listener(current, snapshot)
+                except Exception:
+                    logger.exception("Snapshot listener failed")
+        return snapshot
+
+    def _remember(self, snapshot: Snapshot) -> None:
+        self._history[snapshot.content_id] = snapshot.entries
+        self._history.move_to_end(snapshot.content_id)
+        while len(self._history) > CONTENT_HISTORY_SIZE:
+            self._history.popitem(last=False)
+
+    def history(self, content_id: str) -> Mapping[str, ContentEntry] | None:
+        """Return the entries of a recent snapshot by its ``content_id``, or None once it has aged out."""
+        return self._history.get(content_id)
+
+    def add_listener(self, listener: Callable[[Snapshot, Snapshot], None]) -> None:
+        """Call ``listener(old, new)`` after each snapshot swap, on the thread that made it."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def watch(self, interval: float) -> None:
+        """Poll the files every ``interval`` seconds from a background thread, swapping in warm snapshots.
+
+        The first snapshot is taken cold so that startup never waits on an index
+        build; its derived values are built by the first request that needs them.
+        """
+        self.refresh()
+        if self._watcher is None:
+            self._watcher = ContentWatcher(self, interval)
+            self._watcher.start()
+
+    def unwatch(self) -> None:
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None
+
+    def peek(self) -> Snapshot | None:
+        """Return the last snapshot taken, without checking the files."""
+        return self._snapshot
+
+    def resident_bytes(self) -> int:
+        """Bytes of text and blobs (raw and base64-encoded) this store holds in memory (derived values not included)."""
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values()) + sum(
+                blob.size + len(blob.base64) for blob in self._blobs.values()
+            )
+
+    def cached(self, name: str) -> ContentEntry | None:
+        """Return the entry from the last successful load without touching the filesystem."""
+        return self._entries.get(name)
+
+    def error(self, name: str) -> str | None:
+        """Return why the last load of ``name`` failed, or None if it succeeded."""
+        return self._errors.get(name)
+
+    @property
+    def preloaded(self) -> bool:
+        return self._preloaded
+
+    def seed_derived(self, key: str, load: Callable[[], Any]) -> None:
+        """Register a loader for a derived value that was precomputed for the bundle's content.
+
+        ``load`` runs on the first ``derived`` call instead of the builder, for as
+        long as the loose files still match the bundle.
+        """
+        if self.bundle is None:
+            raise ValueError("seed_derived requires a bundle-backed store")
+        signature = tuple(
+            (name, self.bundle.resources[name].mtime_ns, self.bundle.resources[name].size)
+            for name in self.categories
+            if name in self.bundle.resources
+        )
+        self._seeded[key] = (signature, load)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == signature:
+            snapshot._seed(key, load)
+
+    def preload(self) -> None:
+        """Warm the cache with every known category, skipping ones that fail to load."""
+        for name in self.categories:
+            try:
+                self._load(name)
+            except Exception as e:
+                logger.warning(f"Could not preload resource '{name}': {e}")
+        self.refresh()
+        self._preloaded = True
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop one cached entry, or all of them when ``name`` is None."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._blobs.clear()
+                self._snapshot = None
+            else:
+                self._entries.pop(name, None)
+
+
+class ContentWatcher(threading.Thread):
+    """Daemon thread that refreshes a store's snapshot every ``interval`` seconds.
+
+    Polling ``stat`` keeps the watcher dependency-free and works on every
+    filesystem, including network mounts where change notifications are unreliable.
+    """
+
+    def __init__(self, store: ContentStore, interval: float):
+        super().__init__(name="larkin-content-watcher", daemon=True)
+        self.store = store
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.store.refresh(warm=True)
+            except Exception:
+                # Keep serving the last good snapshot; the next poll tries again.
+                logger.exception("Content reload failed")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self is not threading.current_thread():
+            self.join()
+
+
+_store: ContentStore | None = None
+_store_lock = threading.Lock()
+# Store that ``get_store`` returns in the current context instead of the process-wide one (see ``use_store``).
+_active_store: ContextVar[ContentStore | None] = ContextVar("active_store", default=None)
+
+
+def _signature(entries: Mapping[str, ContentEntry | BlobEntry]) -> tuple:
+    return tuple((name, e.mtime_ns, e.size) for name, e in entries.items())
+
+
+def get_store() -> ContentStore:
+    """Return the process-wide content store, creating it on first use.
+
+    If a content bundle is present it backs the store, so unchanged resources and
+    the search index come straight out of one memory-mapped file. Inside
+    ``use_store`` the store given there is returned instead.
+    """
+    active = _active_store.get()
+    if active is not None:
+        return active
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_default_store()
+    return _store
+
+
+def set_store(store: ContentStore | None) -> None:
+    """Replace the process-wide store; None resets it so the next ``get_store`` starts cold."""
+    global _store
+    with _store_lock:
+        if _store is not None and _store is not store:
+            _store.unwatch()
+        _store = store
+
+
+@contextmanager
+def use_store(store: ContentStore) -> Iterator[ContentStore]:
+    """Make ``get_store`` return ``store`` for the rest of this context.
+
+    The override is a context variable, so it follows the request into
+    ``run_blocking`` worker threads and never leaks into concurrent requests.
+    """
+    token = _active_store.set(store)
+    try:
+        yield store
+    finally:
+        _active_store.reset(token)
+
+
+def _create_default_store() -> ContentStore:
+    # Imported here because the bundle module builds on the store (and the search index).
+    from src.util.bundle import open_bundle
+
+    bundle_setting = os.environ.get(BUNDLE_ENV, "")
+    bundle = None if bundle_setting == "off" else open_bundle(Path(bundle_setting) if bundle_setting else BUNDLE_PATH)
+    store = ContentStore(bundle=bundle)
+    if bundle is not None:
+        store.seed_derived("search_index", bundle.search_index)
+        logger.info(f"Using content bundle {bundle.path} (version {bundle.content_version[:12]})")
+    return store
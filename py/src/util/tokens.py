@@ -0,0 +1,12 @@
+"""Cheap token-count estimates for response payloads.
+
+Exact counts need the client's tokenizer, which differs per model. For budgeting
+and metrics a character heuristic is close enough and costs nothing.
+"""
+
+# English prose and markdown average roughly four characters per token across common tokenizers.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
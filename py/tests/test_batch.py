@@ -0,0 +1,92 @@
+"""Tests for batch retrieval in src/util/batch.py."""
+
+import pytest
+
+from src.util.batch import BatchItem, load_batch, parse_items
+from src.util.store import ContentStore, set_store
+
+RESUME = (
+    "# Resume\n\n## Work\n\n### Acme\n\nBuilt things.\n\n### Initech\n\nFiled TPS reports.\n\n## Skills\n\nPython.\n"
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "resume").mkdir()
+    (tmp_path / "resume" / "larkin_resume.md").write_text(RESUME)
+    (tmp_path / "bio.md").write_text("# Bio\n\nHello.\n")
+    store = ContentStore(tmp_path, ["resume", "bio"])
+    set_store(store)
+    yield store
+    set_store(None)
+
+
+class TestParseItems:
+    """Tests for parse_items."""
+
+    def test_splits_resource_and_section(self):
+        assert parse_items(["Resume : Work > Acme", "bio"]) == [
+            BatchItem("resume", "Work > Acme"),
+            BatchItem("bio"),
+        ]
+
+    def test_whole_resource_subsumes_its_sections(self):
+        assert parse_items(["resume:Work", "bio", "resume", "bio"]) == [BatchItem("bio"), BatchItem("resume")]
+
+    def test_rejects_empty_and_oversized_batches(self):
+        with pytest.raises(ValueError):
+            parse_items([])
+        with pytest.raises(ValueError):
+            parse_items(["bio"] * 100)
+
+
+class TestLoadBatch:
+    """Tests for load_batch."""
+
+    def test_returns_items_in_request_order(self, store):
+        output = load_batch(["bio", "resume:Skills"])
+        assert output == "<!-- bio -->\n# Bio\n\nHello.\n\n<!-- resume:Resume / Skills -->\n## Skills\n\nPython."
+
+    def test_parent_section_replaces_earlier_subsection(self, store):
+        output = load_batch(["resume:Acme", "resume:Work", "resume:Initech"])
+        assert output.count("<!-- ") == 1
+        assert output.startswith("<!-- resume:Resume / Work -->")
+
+    def test_unknown_section_is_reported_inline(self, store):
+        output = load_batch(["resume:Nope", "bio"])
+        assert "No section matching 'Nope' in 'resume'." in output
+        assert "Hello." in output
+
+    @pytest.mark.parametrize("item", ["../../../../tmp/secret", "../secret", "../secret:Heading"])
+    def test_names_outside_the_store_are_not_found(self, store, tmp_path, item):
+        (tmp_path.parent / "secret.md").write_text("# Heading\n\nStolen.\n")
+        output = load_batch([item])
+        assert "Stolen." not in output
+        assert f"Resource '{item.split(':')[0]}' not found." in output
+        assert str(tmp_path) not in output
+        assert store.cached(item.split(":")[0]) is None
+
+    def test_max_tokens_omits_later_items(self, store):
+        output = load_batch(["bio", "resume"], max_tokens=30)
+        assert "Hello." in output
+        assert "Filed TPS" not in output
+        assert "omitted to fit max_tokens=30: resume" in output
+
+
+class TestBatchEndpoints:
+    """Tests for the get_resources tool and larkin://batch resource."""
+
+    async def test_tool_and_resource_agree(self, store):
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("get_resources", {"items": ["bio", "resume:Work > Acme"]})
+        contents = await mcp.read_resource("larkin://batch/bio,resume:Work%20%3E%20Acme")
+        assert content[0].text == contents[0].content
+        assert "Built things." in content[0].text
+
+    async def test_resource_rejects_encoded_traversal(self, store, tmp_path):
+        from src.main import mcp
+
+        (tmp_path.parent / "secret.md").write_text("Stolen.\n")
+        contents = await mcp.read_resource("larkin://batch/..%2Fsecret")
+        assert contents[0].content == "<!-- ../secret -->\nResource '../secret' not found."
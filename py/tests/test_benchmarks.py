@@ -0,0 +1,28 @@
+"""Smoke test for the benchmark suite in benchmarks/server.py, so it keeps working as tools are added."""
+
+from benchmarks.server import run
+
+
+class TestServerBenchmark:
+    """Run the benchmark on a tiny corpus and check the report shape."""
+
+    async def test_covers_every_tool_and_resource_without_errors(self):
+        from src.main import mcp
+
+        report = await run([3], iterations=2)
+        results = report["results"]
+
+        assert all(result["errors"] == 0 for result in results), [r for r in results if r["errors"]]
+        benchmarked = {result["target"] for result in results}
+        assert {tool.name for tool in await mcp.list_tools()} <= benchmarked
+        assert {str(resource.uri) for resource in await mcp.list_resources()} <= benchmarked
+
+    async def test_reports_cold_and_warm_latencies(self):
+        report = await run([3], iterations=2)
+        phases = {(result["target"], result["phase"]) for result in report["results"]}
+
+        assert ("get_resume", "cold") in phases
+        assert ("get_resume", "warm") in phases
+        for result in report["results"]:
+            assert result["p50_ms"] <= result["p99_ms"]
+            assert result["corpus_docs"] == 3
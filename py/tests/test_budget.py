@@ -0,0 +1,110 @@
+"""Tests for token-budgeted responses in src/util/budget.py."""
+
+import pytest
+
+from src.util.budget import TokenBudget, fit, pack_sections
+from src.util.sections import SectionTree
+from src.util.tokens import estimate_tokens
+
+DOCUMENT = (
+    "# Resume\n\n"
+    "## Summary\n\nShort.\n\n"
+    "## Experience\n\nIntro.\n\n"
+    "### Big Job\n\n" + "Did many things. " * 100 + "\n\n"
+    "### Small Job\n\nDid one thing.\n\n"
+    "## Education\n\nSchool.\n"
+)
+
+
+class TestTokenBudget:
+    """Tests for TokenBudget and fit."""
+
+    def test_take_spends_only_when_it_fits(self):
+        budget = TokenBudget(3)
+        assert budget.take("12345678")
+        assert not budget.take("12345678")
+        assert budget.remaining == 1
+
+    def test_fit_keeps_note_inside_budget(self):
+        def build(budget: TokenBudget) -> str:
+            kept = [word for word in ("alpha " * 10).split() if budget.take(word) or budget.omit(word)]
+            return " ".join(kept)
+
+        output = fit(build, 16, lambda omitted: f"<!-- omitted {omitted} -->")
+        assert estimate_tokens(output) <= 16
+        assert output.startswith("alpha")
+        assert output.endswith("-->")
+
+    def test_rejects_non_positive_budget(self):
+        with pytest.raises(ValueError):
+            fit(lambda budget: "", 0, lambda omitted: "")
+
+
+class TestPackSections:
+    """Tests for pack_sections."""
+
+    def test_drops_sections_that_do_not_fit_and_lists_them(self):
+        tree = SectionTree("resume", DOCUMENT)
+        output = pack_sections(tree, 100)
+
+        assert estimate_tokens(output) <= 100
+        assert "## Summary" in output
+        assert "### Small Job" in output
+        assert "## Education" in output
+        assert "Did many things" not in output
+        assert "omitted to fit max_tokens=100: Experience / Big Job" in output
+
+    def test_packs_within_a_section(self):
+        tree = SectionTree("resume", DOCUMENT)
+        output = pack_sections(tree, 60, tree.find("Experience"))
+
+        assert output.startswith("## Experience")
+        assert "### Small Job" in output
+        assert "## Education" not in output
+
+    def test_omits_heading_when_no_subsection_fits(self):
+        tree = SectionTree(
+            "resume", "# R\n\n## About\n\nHi.\n\n## Jobs\n\n### A\n\n" + "a " * 200 + "\n\n### B\n\n" + "b " * 200
+        )
+        output = pack_sections(tree, 60)
+
+        assert "## About" in output
+        assert "## Jobs" not in output
+        assert "omitted to fit max_tokens=60: Jobs (~" in output
+
+
+class TestBudgetedTools:
+    """Tests for max_tokens on the content tools and search_info."""
+
+    async def test_content_tool_respects_max_tokens(self):
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("get_tennis_info", {"max_tokens": 500})
+        text = content[0].text
+        assert estimate_tokens(text) <= 500
+        assert "omitted to fit max_tokens=500" in text
+
+    async def test_small_budget_leaves_small_documents_alone(self):
+        from src.main import mcp
+        from src.util.resources import load_resource
+
+        content, _ = await mcp.call_tool("get_contact", {"max_tokens": 100_000})
+        assert content[0].text == load_resource("contact")
+
+    async def test_search_respects_max_tokens(self):
+        from src.main import mcp
+
+        full, _ = await mcp.call_tool("search_info", {"query": "python"})
+        budgeted, _ = await mcp.call_tool("search_info", {"query": "python", "max_tokens": 60})
+        assert estimate_tokens(budgeted[0].text) <= 60
+        assert estimate_tokens(full[0].text) > 60
+        assert budgeted[0].text.startswith(full[0].text.splitlines()[0])
+        assert "omitted to fit max_tokens=60" in budgeted[0].text
+
+    async def test_cursor_and_max_tokens_are_exclusive(self):
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        from src.main import mcp
+
+        with pytest.raises(ToolError, match="cannot be combined"):
+            await mcp.call_tool("get_resume", {"cursor": "abc", "max_tokens": 10})
@@ -0,0 +1,88 @@
+"""Tests for the precompiled content bundle in src/util/bundle.py."""
+
+import shutil
+
+import pytest
+
+from src.constants import RESOURCES_DIR
+from src.util.bundle import BundleFormatError, ContentBundle, build_bundle, open_bundle
+from src.util.search import SearchIndex
+from src.util.store import ContentStore
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    root = tmp_path / "content"
+    shutil.copytree(RESOURCES_DIR, root)
+    return root
+
+
+@pytest.fixture
+def bundle(tmp_path, content_dir):
+    path = tmp_path / "content.bundle"
+    build_bundle(path, content_dir)
+    return ContentBundle(path)
+
+
+class TestContentBundle:
+    """Tests for building and reading bundles."""
+
+    def test_round_trips_text_and_blobs(self, bundle, content_dir):
+        assert bundle.text("skills") == (content_dir / "skills.md").read_text()
+        assert (
+            bytes(bundle.blob("resume/larkin_resume.pdf"))
+            == (content_dir / "resume" / "larkin_resume.pdf").read_bytes()
+        )
+
+    def test_records_metadata(self, bundle, content_dir):
+        meta = bundle.resources["bio"]
+        stat = (content_dir / "bio.md").stat()
+        assert meta.size == stat.st_size
+        assert meta.mtime_ns == stat.st_mtime_ns
+        assert len(bundle.content_version) == 64
+
+    def test_index_matches_fresh_build(self, bundle, content_dir):
+        fresh = SearchIndex.from_entries(ContentStore(content_dir).entries())
+        assert bundle.search_index().search("python") == fresh.search("python")
+
+    def test_rejects_garbage(self, tmp_path):
+        path = tmp_path / "bad.bundle"
+        path.write_bytes(b"not a bundle at all")
+        with pytest.raises(BundleFormatError):
+            ContentBundle(path)
+        assert open_bundle(path) is None
+
+
+class TestBundleBackedStore:
+    """Tests for a ContentStore backed by a bundle."""
+
+    def test_serves_bundle_when_loose_files_are_gone(self, bundle, content_dir):
+        shutil.rmtree(content_dir)
+        store = ContentStore(content_dir, bundle=bundle)
+
+        assert store.exists("resume")
+        assert "John Larkin" in store.get("resume").text
+        assert bytes(store.get_blob(store.resume_pdf_path).data[:4]) == b"%PDF"
+
+    def test_edited_loose_file_wins_over_bundle(self, bundle, content_dir):
+        store = ContentStore(content_dir, bundle=bundle)
+        (content_dir / "contact.md").write_text("Edited after the bundle was built\n")
+        assert store.get("contact").text == "Edited after the bundle was built\n"
+
+    def test_seeded_index_is_reused(self, bundle, content_dir):
+        store = ContentStore(content_dir, bundle=bundle)
+        seeded = bundle.search_index()
+        store.seed_derived("search_index", lambda: seeded)
+        assert store.derived("search_index", SearchIndex.from_entries) is seeded
+
+    def test_seeded_index_is_decoded_on_first_use(self, bundle, content_dir):
+        store = ContentStore(content_dir, bundle=bundle)
+        loads = []
+        store.seed_derived("search_index", lambda: loads.append(1) or bundle.search_index())
+        store.preload()
+        assert loads == []
+        assert not store.snapshot().has_derived("search_index")
+
+        store.derived("search_index", SearchIndex.from_entries)
+        store.derived("search_index", SearchIndex.from_entries)
+        assert loads == [1]
@@ -0,0 +1,111 @@
+"""Tests for the LRU response cache in src/util/cache.py."""
+
+import os
+
+import pytest
+
+from src.util.cache import LRUCache
+from src.util.store import ContentStore, set_store
+
+
+class TestLRUCache:
+    """Tests for LRUCache eviction, versioning and counters."""
+
+    def test_evicts_least_recently_used(self):
+        cache: LRUCache[str] = LRUCache("test", 2)
+        cache.put("a", 1, "A")
+        cache.put("b", 1, "B")
+        assert cache.get("a", 1) == "A"
+        cache.put("c", 1, "C")
+
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == "A"
+        assert cache.evictions == 1
+
+    def test_new_version_invalidates_everything(self):
+        cache: LRUCache[str] = LRUCache("test", 10)
+        cache.put("a", 1, "A")
+        assert cache.get("a", 2) is None
+        assert len(cache) == 0
+        assert cache.invalidations == 1
+
+    def test_counts_hits_and_misses(self):
+        cache: LRUCache[str] = LRUCache("test", 10)
+        cache.get("a", 1)
+        cache.put("a", 1, "A")
+        cache.get("a", 1)
+        cache.get("a", 1)
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_prometheus_lines_are_labelled(self):
+        cache: LRUCache[str] = LRUCache("search_info", 10)
+        cache.get("a", 1)
+        assert 'larkin_mcp_cache_misses_total{cache="search_info"} 1' in cache.prometheus_lines()
+
+    def test_rejects_zero_size(self):
+        with pytest.raises(ValueError):
+            LRUCache("test", 0)
+
+
+class TestSearchCache:
+    """Tests for the search_info response cache."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        from src.tools.registry import search_cache
+
+        (tmp_path / "skills.md").write_text("Python and Rust\n")
+        store = ContentStore(tmp_path, ["skills"])
+        set_store(store)
+        search_cache.clear()
+        yield store
+        set_store(None)
+
+    async def test_normalized_queries_share_an_entry(self, store):
+        from src.main import mcp
+        from src.tools.registry import search_cache
+
+        hits = search_cache.hits
+        first, _ = await mcp.call_tool("search_info", {"query": "Python"})
+        second, _ = await mcp.call_tool("search_info", {"query": "  python "})
+        assert first[0].text == second[0].text
+        assert search_cache.hits == hits + 1
+
+    async def test_no_match_message_uses_the_callers_query(self, store):
+        from src.main import mcp
+
+        await mcp.call_tool("search_info", {"query": "Haskell"})
+        content, _ = await mcp.call_tool("search_info", {"query": "haskell"})
+        assert content[0].text == "No matches found for 'haskell'"
+
+    async def test_content_change_invalidates(self, store, tmp_path):
+        from src.main import mcp
+
+        before, _ = await mcp.call_tool("search_info", {"query": "go"})
+        assert "No matches" in before[0].text
+
+        path = tmp_path / "skills.md"
+        path.write_text("Python and Rust\nGo too\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_mtime_ns + 1_000_000, stat.st_mtime_ns + 1_000_000))
+
+        after, _ = await mcp.call_tool("search_info", {"query": "go"})
+        assert "**Go** too" in after[0].text
+
+    async def test_replacing_the_store_never_serves_its_entries(self, store, tmp_path):
+        from src.main import mcp
+
+        await mcp.call_tool("search_info", {"query": "rust"})
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "skills.md").write_text("Only Go here\n")
+        set_store(ContentStore(other, ["skills"]))
+
+        content, _ = await mcp.call_tool("search_info", {"query": "rust"})
+        assert content[0].text == "No matches found for 'rust'"
+
+    async def test_counters_are_exported(self, store):
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("get_server_stats", {})
+        assert 'larkin_mcp_cache_hits_total{cache="search_info"}' in content[0].text
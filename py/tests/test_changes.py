@@ -0,0 +1,72 @@
+"""Tests for section-level change tracking in src/util/changes.py."""
+
+import pytest
+
+from src.util.changes import PREAMBLE_LABEL, SectionChange, changes_since, diff_resource
+from src.util.store import ContentStore
+from tests.test_store import touch
+
+OLD = "Intro\n\n# Work\n\n## Acme\n\nBuilt things.\n\n## Initech\n\nFiled TPS reports.\n"
+
+
+class TestDiffResource:
+    """Tests for comparing two versions of one resource."""
+
+    def test_identical_text_has_no_changes(self):
+        assert diff_resource("work", OLD, OLD) == []
+
+    def test_changed_added_and_removed_sections(self):
+        new = OLD.replace("Built things.", "Built more things.").replace(
+            "## Initech\n\nFiled TPS reports.\n", "## Globex\n\nShipped.\n"
+        )
+        changes = diff_resource("work", OLD, new)
+        assert changes == [
+            SectionChange("changed", "Work / Acme", "## Acme\n\nBuilt more things.\n\n"),
+            SectionChange("added", "Work / Globex", "## Globex\n\nShipped.\n"),
+            SectionChange("removed", "Work / Initech"),
+        ]
+
+    def test_preamble_change(self):
+        changes = diff_resource("work", OLD, OLD.replace("Intro", "Hello"))
+        assert [(change.kind, change.label) for change in changes] == [("changed", PREAMBLE_LABEL)]
+
+
+class TestChangesSince:
+    """Tests for rendering the delta against a remembered store version."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        (tmp_path / "work.md").write_text(OLD)
+        (tmp_path / "bio.md").write_text("Bio v1\n")
+        return ContentStore(tmp_path, ["work", "bio"])
+
+    def test_only_changed_sections_are_returned(self, store, tmp_path):
+        since = store.snapshot().content_id
+        touch(tmp_path / "work.md", OLD.replace("Built things.", "Built more things."))
+
+        output = changes_since(store, since)
+        assert f"Current version: {store.snapshot().content_id}" in output
+        assert "## work" in output
+        assert "### Changed: Work / Acme" in output
+        assert "Built more things." in output
+        assert "Initech" not in output
+        assert "## bio" not in output
+
+    def test_resource_filter_and_no_changes(self, store, tmp_path):
+        since = store.snapshot().content_id
+        touch(tmp_path / "bio.md", "Bio v2\n")
+
+        assert changes_since(store, since, "work").startswith(f"No changes since {since}")
+        assert "### Changed: (text before the first heading)" in changes_since(store, since, "bio")
+
+    def test_new_resource_is_added_whole(self, store, tmp_path):
+        (tmp_path / "bio.md").unlink()
+        store.invalidate()
+        since = store.snapshot().content_id
+        touch(tmp_path / "bio.md", "Bio v2\n")
+
+        assert "### Added: (whole resource)\n\nBio v2" in changes_since(store, since)
+
+    def test_unknown_version_raises(self, store):
+        with pytest.raises(ValueError, match="fetch the resources in full"):
+            changes_since(store, "0123456789abcdef")
@@ -102,6 +102,59 @@ class TestResourceContractSync:
         )
 
 
+class TestExtensionContractSync:
+    """Verify Python-only tools/resources match the extensions section of tool-contracts.json."""
+
+    PYTHON_EXTENSION_TOOLS = {
+        "get_changes",
+        "get_resources",
+        "get_resume_pdf_chunk",
+        "get_section",
+        "get_server_stats",
+        "get_table_of_contents",
+        "list_profiles",
+    }
+
+    PYTHON_EXTENSION_RESOURCES = {
+        "config://etags",
+        "config://stats",
+        "larkin://batch/{items}",
+        "larkin://pages/{resource}/{cursor}",
+        "larkin://profiles/{profile}/pages/{resource}/{cursor}",
+        "larkin://profiles/{profile}/resume.pdf",
+        "larkin://profiles/{profile}/{resource}",
+        "larkin://resume.pdf/{offset}/{length}",
+    }
+
+    def _python_entries(self, section: dict) -> set[str]:
+        return {name for name, entry in section.items() if "py" in entry["implementations"]}
+
+    def test_extension_tools_match(self, tool_contracts: dict):
+        """Verify Python extension tools match the contracts exactly."""
+        contract_tools = self._python_entries(tool_contracts["extensions"]["tools"])
+        assert self.PYTHON_EXTENSION_TOOLS == contract_tools
+
+    def test_extension_resources_match(self, tool_contracts: dict):
+        """Verify Python extension resources match the contracts exactly."""
+        contract_resources = self._python_entries(tool_contracts["extensions"]["resources"])
+        assert self.PYTHON_EXTENSION_RESOURCES == contract_resources
+
+    async def test_registered_tools_are_all_accounted_for(self):
+        """Verify the live server registers exactly the shared plus extension tools."""
+        from src.main import mcp
+
+        registered = {tool.name for tool in await mcp.list_tools()}
+        assert registered == TestToolContractSync.PYTHON_TOOLS | self.PYTHON_EXTENSION_TOOLS
+
+    async def test_registered_resources_are_all_accounted_for(self):
+        """Verify the live server registers exactly the shared plus extension resources."""
+        from src.main import mcp
+
+        registered = {str(resource.uri) for resource in await mcp.list_resources()}
+        registered |= {template.uriTemplate for template in await mcp.list_resource_templates()}
+        assert registered == TestResourceContractSync.PYTHON_RESOURCES | self.PYTHON_EXTENSION_RESOURCES
+
+
 class TestResourceCategoriesSync:
     """Verify RESOURCES_CATEGORIES matches schema."""
 
@@ -187,24 +240,13 @@ class TestToolOutputContracts:
         message = "No matches found for 'xyznonexistent123'"
         assert "No matches found" in message
 
-    def test_health_check_output(self, tool_contracts: dict, resource_schema: dict):
+    async def test_health_check_output(self, tool_contracts: dict, resource_schema: dict):
         """Verify health_check output matches contract and schema."""
-        from src.types.models import HealthCheckResponse, ResourceStatus
-
-        resources_status = {}
-        for resource in RESOURCES_CATEGORIES:
-            content = load_resource(resource)
-            is_available = not content.startswith("Resource '") and not content.startswith("Error")
-            resources_status[resource] = ResourceStatus(
-                available=is_available,
-                size_bytes=len(content.encode()) if is_available else 0,
-            )
-
-        result = HealthCheckResponse(
-            status="healthy",
-            version=MCP_VERSION,
-            resources=resources_status,
-        )
+        from src.main import mcp
+        from src.types.models import HealthCheckResponse
+
+        _, structured = await mcp.call_tool("health_check", {})
+        result = HealthCheckResponse.model_validate(structured)
 
         # Check required fields from contract
         contract = tool_contracts["tools"]["health_check"]["expectedOutput"]
@@ -0,0 +1,77 @@
+"""Tests for sharded, parallel index builds in src/util/indexer.py."""
+
+import pytest
+
+from src.util.indexer import BuildStats, build_index, load_markdown, main, shard_documents
+from src.util.search import PackedPostings, SearchIndex, index_shard
+
+DOCUMENTS = {
+    f"doc{i}": f"# Doc {i}\n\nPython and rust, take {i}.\nMachine learning {'again ' * i}\n" for i in range(12)
+}
+
+
+def assert_same_index(actual: SearchIndex, expected: SearchIndex) -> None:
+    assert actual.doc_names == expected.doc_names
+    assert actual.doc_lengths == expected.doc_lengths
+    assert actual.postings == expected.postings
+    assert actual.to_payload() == expected.to_payload()
+
+
+class TestShards:
+    """Tests for splitting and recombining the corpus."""
+
+    def test_shards_are_contiguous_and_cover_every_document(self):
+        shards = shard_documents(DOCUMENTS, shard_bytes=100)
+        assert len(shards) > 1
+        assert [name for shard in shards for name in shard] == list(DOCUMENTS)
+
+    def test_shards_shrink_so_every_worker_gets_several(self):
+        one_worker = shard_documents(DOCUMENTS, shard_bytes=10**9, workers=1)
+        assert len(shard_documents(DOCUMENTS, shard_bytes=10**9, workers=3)) > len(one_worker) >= 4
+
+    def test_from_shards_matches_a_serial_build(self):
+        shards = [index_shard(shard) for shard in shard_documents(DOCUMENTS, shard_bytes=150)]
+        assert_same_index(SearchIndex.from_shards(DOCUMENTS, shards), SearchIndex(DOCUMENTS))
+
+    def test_postings_stay_packed_until_looked_up(self):
+        index = SearchIndex.from_shards(DOCUMENTS, [index_shard(DOCUMENTS)])
+        assert "python" in index.postings
+        assert index.postings.document_frequency("again") == 11
+        assert isinstance(index.postings._terms["python"], PackedPostings)
+        assert index.search('"machine learning" again', limit=1)
+        assert isinstance(index.postings._terms["machine"], list)
+
+    def test_shards_must_cover_the_documents(self):
+        with pytest.raises(ValueError, match="cover"):
+            SearchIndex.from_shards(DOCUMENTS, [index_shard({"doc0": DOCUMENTS["doc0"]})])
+
+
+class TestBuildIndex:
+    """Tests for the process-pool build and its throughput report."""
+
+    def test_parallel_build_matches_serial(self):
+        index, stats = build_index(DOCUMENTS, workers=2, shard_bytes=200, min_bytes=0)
+        assert_same_index(index, SearchIndex(DOCUMENTS))
+        assert (stats.documents, stats.workers) == (12, 2)
+        assert stats.shards > 2
+        assert stats.bytes == sum(len(text.encode()) for text in DOCUMENTS.values())
+
+    def test_small_corpora_are_built_in_process(self):
+        index, stats = build_index(DOCUMENTS, workers=4)
+        assert (stats.workers, stats.shards) == (1, 1)
+        assert_same_index(index, SearchIndex(DOCUMENTS))
+
+    def test_throughput(self):
+        stats = BuildStats(documents=200, bytes=4 * 1024 * 1024, seconds=2.0, workers=4, shards=8)
+        assert stats.docs_per_second == 100
+        assert stats.mb_per_second == 2
+        assert str(stats).endswith("100 docs/s, 2.00 MB/s")
+
+    def test_cli_indexes_a_directory(self, tmp_path, capsys):
+        (tmp_path / "ada").mkdir()
+        (tmp_path / "ada" / "bio.md").write_text("Python\n")
+        (tmp_path / "work.md").write_text("Rust\n")
+        assert list(load_markdown(tmp_path)) == ["ada/bio", "work"]
+
+        main([str(tmp_path), "--workers", "1"])
+        assert "Indexed 2 documents" in capsys.readouterr().out
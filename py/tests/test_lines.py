@@ -0,0 +1,39 @@
+"""Tests for the offset-based line storage in src/util/lines.py."""
+
+import re
+
+from src.util.lines import LineTable, line_offsets, split_lines
+
+
+class TestLineTable:
+    """Tests for LineTable."""
+
+    def test_offsets_match_splitlines(self):
+        for text in ("", "one", "one\n", "one\ntwo", "one\r\n\ntwo\n"):
+            table = LineTable(text)
+            assert [table.line(n) for n in range(len(table))] == text.splitlines()
+
+    def test_split_lines_breaks_on_newlines_only(self):
+        assert split_lines("a\rb\u2028c\r\nd\n\ne") == ["a\rb\u2028c\r\n", "d\n", "\n", "e"]
+        assert split_lines("a\n") == ["a\n"]
+        assert split_lines("") == []
+
+    def test_offsets_are_utf8_byte_positions(self):
+        assert list(line_offsets("é\nb\n".encode())) == [0, 3]
+        assert LineTable("é\nb").line_at(3) == 1
+
+    def test_finditer_reports_line_and_column(self):
+        table = LineTable("Python and Rust\n\nGo PYTHON")
+        matches = [(line, column, token) for line, column, token in table.finditer(re.compile(r"[a-z]+"))]
+        assert matches == [
+            (0, 0, "python"),
+            (0, 1, "and"),
+            (0, 2, "rust"),
+            (2, 0, "go"),
+            (2, 1, "python"),
+        ]
+
+    def test_finditer_folds_non_ascii_case(self):
+        table = LineTable("Zürich\nSTRASSE and Straße")
+        matches = list(table.finditer(re.compile(r"[^\W_]+")))
+        assert matches == [(0, 0, "zürich"), (1, 0, "strasse"), (1, 1, "and"), (1, 2, "strasse")]
@@ -0,0 +1,47 @@
+"""Tests for the CLI/env transport switch in src/main.py."""
+
+import pytest
+
+from src.constants import MCP_PORT_ENV, MCP_TRANSPORT_ENV, PROFILES_DIR_ENV, RELOAD_INTERVAL_ENV
+from src.main import parse_args
+
+
+class TestParseArgs:
+    """Tests for parse_args."""
+
+    def test_defaults_to_stdio(self, monkeypatch):
+        monkeypatch.delenv(MCP_TRANSPORT_ENV, raising=False)
+        args = parse_args([])
+        assert args.transport == "stdio"
+
+    def test_env_selects_transport(self, monkeypatch):
+        monkeypatch.setenv(MCP_TRANSPORT_ENV, "streamable-http")
+        monkeypatch.setenv(MCP_PORT_ENV, "9123")
+        args = parse_args([])
+        assert args.transport == "streamable-http"
+        assert args.port == 9123
+
+    def test_flag_overrides_env(self, monkeypatch):
+        monkeypatch.setenv(MCP_TRANSPORT_ENV, "sse")
+        args = parse_args(["--transport", "stdio"])
+        assert args.transport == "stdio"
+
+    def test_rejects_unknown_env_transport(self, monkeypatch):
+        monkeypatch.setenv(MCP_TRANSPORT_ENV, "carrier-pigeon")
+        with pytest.raises(SystemExit):
+            parse_args([])
+
+    def test_reload_interval_from_env(self, monkeypatch):
+        monkeypatch.setenv(RELOAD_INTERVAL_ENV, "0")
+        assert parse_args([]).reload_interval == 0
+        with pytest.raises(SystemExit):
+            parse_args(["--reload-interval", "-1"])
+
+    def test_profile_flags(self, monkeypatch):
+        monkeypatch.delenv(PROFILES_DIR_ENV, raising=False)
+        args = parse_args([])
+        assert args.profiles_dir is None
+        args = parse_args(["--profiles-dir", "/srv/profiles", "--profile-memory-mb", "64"])
+        assert (args.profiles_dir, args.profile_memory_mb) == ("/srv/profiles", 64)
+        with pytest.raises(SystemExit):
+            parse_args(["--profile-memory-mb", "0"])
@@ -0,0 +1,53 @@
+"""Tests for request metrics in src/util/metrics.py."""
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.util.metrics import Metrics
+from src.util.tokens import estimate_tokens
+
+
+class TestMetrics:
+    """Tests for the Metrics registry and Prometheus rendering."""
+
+    def test_observe_and_render(self):
+        registry = Metrics()
+        registry.observe("tool", "get_bio", 0.002, True, 100, 25)
+        registry.observe("tool", "get_bio", 0.2, False, 0, 0)
+
+        text = registry.render_prometheus()
+        assert 'larkin_mcp_requests_total{kind="tool",name="get_bio"} 2' in text
+        assert 'larkin_mcp_errors_total{kind="tool",name="get_bio"} 1' in text
+        assert 'larkin_mcp_response_bytes_total{kind="tool",name="get_bio"} 100' in text
+        assert 'larkin_mcp_request_duration_seconds_bucket{kind="tool",name="get_bio",le="0.0025"} 1' in text
+        assert 'larkin_mcp_request_duration_seconds_bucket{kind="tool",name="get_bio",le="+Inf"} 2' in text
+        assert 'larkin_mcp_request_duration_seconds_count{kind="tool",name="get_bio"} 2' in text
+
+    def test_collectors_are_appended(self):
+        registry = Metrics()
+        registry.add_collector(lambda: ["custom_metric 7"])
+        assert registry.render_prometheus().endswith("custom_metric 7\n")
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestInstrumentation:
+    """Tests that protocol requests are recorded."""
+
+    async def test_tool_calls_and_resource_reads_are_counted(self):
+        from src.main import mcp
+        from src.util.metrics import metrics
+
+        metrics.reset()
+        async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+            await client.call_tool("get_skills", {})
+            await client.call_tool("no_such_tool", {})
+            await client.read_resource("larkin://resume.pdf/0/10")
+            stats = await client.call_tool("get_server_stats", {})
+
+        text = stats.content[0].text
+        assert 'larkin_mcp_requests_total{kind="tool",name="get_skills"} 1' in text
+        assert 'larkin_mcp_errors_total{kind="tool",name="unknown"} 1' in text
+        assert 'larkin_mcp_requests_total{kind="resource",name="larkin://resume.pdf/{offset}/{length}"} 1' in text
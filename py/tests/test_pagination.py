@@ -0,0 +1,156 @@
+"""Tests for cursor-based pagination in src/util/pagination.py."""
+
+import os
+
+import pytest
+
+from src.util.pagination import InvalidCursorError, encode_cursor, paginate
+from src.util.sections import SectionTree
+from src.util.store import ContentStore, set_store
+
+DOCUMENT = "# Doc\n\n" + "".join(
+    f"## Part {i}\n\n" + "".join(f"- item {i}.{j} ✓\n" for j in range(20)) for i in range(5)
+)
+
+
+def read_all(tree: SectionTree, limit: int, **kwargs) -> list[str]:
+    pages = [paginate(tree, "v1", limit, **kwargs)]
+    while pages[-1].next_cursor:
+        pages.append(paginate(tree, "v1", limit, cursor=pages[-1].next_cursor, **kwargs))
+    return [page.text for page in pages]
+
+
+@pytest.fixture
+def tree() -> SectionTree:
+    return SectionTree("doc", DOCUMENT)
+
+
+class TestPaginate:
+    """Tests for page boundaries and cursors."""
+
+    def test_pages_reassemble_document(self, tree):
+        pages = read_all(tree, 200)
+        assert len(pages) > 1
+        assert "".join(pages) == DOCUMENT
+        assert all(len(page.encode()) <= 200 for page in pages)
+
+    def test_pages_end_on_line_boundaries(self, tree):
+        assert all(page.endswith("\n") for page in read_all(tree, 200))
+
+    def test_prefers_section_boundaries(self, tree):
+        part_size = len(tree.text(tree.find("Part 1")).encode())
+        pages = read_all(tree, part_size + 10, start=tree.find("Part 0").start)
+        assert all(page.startswith("## Part") for page in pages)
+
+    def test_splits_long_lines_on_character_boundaries(self):
+        tree = SectionTree("wide", "é" * 100)
+        pages = read_all(tree, 9)
+        assert "".join(pages) == "é" * 100
+        assert all(len(page.encode()) <= 9 for page in pages)
+
+    def test_tiny_limit_always_makes_progress(self, tree):
+        pages = read_all(tree, 1)
+        assert "".join(pages) == DOCUMENT
+        assert all(pages)
+
+    def test_page_starting_at_a_heading_is_not_empty(self, tree):
+        section = tree.find("Part 1")
+        for limit in (1, 2, 3):
+            page = paginate(tree, "v1", limit, start=section.start)
+            assert page.text and page.end > page.offset
+
+    def test_range_is_clipped_to_section(self, tree):
+        section = tree.find("Part 2")
+        pages = read_all(tree, 100, start=section.start, stop=section.end)
+        assert "".join(pages) == tree.text(section)
+
+    def test_rejects_cursor_from_other_version(self, tree):
+        with pytest.raises(InvalidCursorError, match="has changed"):
+            paginate(tree, "v2", 100, cursor=encode_cursor("doc", "v1", 10))
+
+    def test_rejects_cursor_from_other_resource(self, tree):
+        with pytest.raises(InvalidCursorError, match="issued for 'other'"):
+            paginate(tree, "v1", 100, cursor=encode_cursor("other", "v1", 10))
+
+    def test_offsets_inside_a_character_snap_back_to_its_start(self):
+        tree = SectionTree("wide", "aé" * 10)
+        page = paginate(tree, "v1", 100, cursor=encode_cursor("wide", "v1", 2))
+        assert page.text == "é" + "aé" * 9
+
+    def test_rejects_garbage_cursor(self, tree):
+        with pytest.raises(InvalidCursorError, match="malformed"):
+            paginate(tree, "v1", 100, cursor="!!not-a-cursor")
+
+
+class TestPaginatedTools:
+    """Tests for the cursor/limit parameters on the content tools and resources."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        (tmp_path / "tennis.md").write_text(DOCUMENT)
+        store = ContentStore(tmp_path, ["tennis"])
+        set_store(store)
+        yield store
+        set_store(None)
+
+    async def test_small_documents_are_unchanged(self, store):
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("get_tennis_info", {})
+        assert content[0].text == DOCUMENT
+
+    async def test_tool_follows_cursor_to_the_end(self, store):
+        from src.main import mcp
+        from src.util.resources import load_page
+
+        text = ""
+        cursor = None
+        while True:
+            page = load_page("tennis", cursor, limit=300)
+            text += page.text
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+            content, _ = await mcp.call_tool("get_tennis_info", {"cursor": cursor, "limit": 300})
+            assert "continue with cursor='" in content[0].text or "end of tennis" in content[0].text
+        assert text == DOCUMENT
+
+    async def test_resource_trailer_names_next_page_uri(self, store, tmp_path):
+        from src.constants import CONTENT_PAGE_BYTES
+        from src.main import mcp
+
+        large = "# Doc\n\n" + "".join(f"## Part {i}\n\n" + "- item\n" * 2000 for i in range(10))
+        assert len(large) > CONTENT_PAGE_BYTES
+        (tmp_path / "tennis.md").write_text(large)
+
+        first = (await mcp.read_resource("larkin://tennis"))[0].content
+        uri = first.rsplit("continue with ", 1)[1].removesuffix(" -->")
+        assert uri.startswith("larkin://pages/tennis/")
+
+        second = (await mcp.read_resource(uri))[0].content
+        assert second.startswith("## Part")
+        assert second.split("\n\n<!-- ")[0] in large
+
+    async def test_cursor_is_rejected_after_edit_that_keeps_the_mtime(self, store, tmp_path):
+        from src.util.resources import load_page
+
+        path = tmp_path / "tennis.md"
+        mtime_ns = path.stat().st_mtime_ns
+        cursor = load_page("tennis", limit=300).next_cursor
+        path.write_text("é" + DOCUMENT)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        with pytest.raises(InvalidCursorError, match="has changed"):
+            load_page("tennis", cursor, limit=300)
+
+    async def test_cursor_is_rejected_after_edit(self, store, tmp_path):
+        from src.util.resources import load_page
+
+        cursor = load_page("tennis", limit=300).next_cursor
+        path = tmp_path / "tennis.md"
+        path.write_text(DOCUMENT + "more\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_mtime_ns + 1_000_000, stat.st_mtime_ns + 1_000_000))
+
+        with pytest.raises(InvalidCursorError):
+            load_page("tennis", cursor, limit=300)
@@ -0,0 +1,187 @@
+"""Tests for multi-profile serving in src/util/profiles.py."""
+
+import base64
+import threading
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.constants import PROFILE_MEMORY_CAP_ENV, PROFILES_DIR_ENV
+from src.util.profiles import (
+    ProfileNotFoundError,
+    ProfileRegistry,
+    ProfilesDisabledError,
+    ause_profile,
+    get_profiles,
+    reset_profiles,
+    set_profiles,
+    use_profile,
+)
+from src.util.search import get_index
+from src.util.store import get_store
+
+
+@pytest.fixture
+def profiles_dir(tmp_path):
+    for name, sport in (("ada", "fencing"), ("grace", "rowing"), ("linus", "sailing")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "bio.md").write_text(f"# {name.title()}\n\nLoves {sport} and python.\n")
+    (tmp_path / ".hidden").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def registry(profiles_dir):
+    registry = ProfileRegistry(profiles_dir)
+    set_profiles(registry)
+    yield registry
+    reset_profiles()
+
+
+class TestProfileRegistry:
+    """Tests for lazy loading and LRU eviction."""
+
+    def test_names_lists_profile_directories(self, registry):
+        assert registry.names() == ["ada", "grace", "linus"]
+        assert registry.loaded() == []
+
+    def test_profiles_load_lazily_and_once(self, registry, profiles_dir):
+        profile = registry.get("ada")
+        assert profile.store.root == profiles_dir / "ada"
+        assert registry.get("ada") is profile
+        assert registry.loaded() == ["ada"]
+        assert registry.loads == 1
+
+    @pytest.mark.parametrize("name", ["nobody", "..", "../ada", ".hidden", ""])
+    def test_unknown_or_unsafe_names_are_rejected(self, registry, name):
+        with pytest.raises(ProfileNotFoundError):
+            registry.get(name)
+
+    def test_least_recently_used_profile_is_evicted_first(self, registry):
+        for name in ("ada", "grace", "linus"):
+            registry.get(name).store.preload()
+        registry.get("ada")  # now grace is the coldest
+        registry.max_bytes = registry.memory_bytes() - 1
+
+        assert registry.trim() == ["grace"]
+        assert registry.loaded() == ["linus", "ada"]
+        assert registry.evictions == 1
+
+    def test_trim_keeps_the_profile_in_use(self, registry):
+        registry.get("ada").store.preload()
+        registry.get("grace").store.preload()
+        registry.max_bytes = 1
+
+        assert registry.trim(keep="ada") == ["grace"]
+        assert registry.loaded() == ["ada"]
+
+    def test_built_indexes_count_towards_memory(self, registry):
+        profile = registry.get("ada")
+        profile.store.preload()
+        before = profile.memory_bytes()
+        get_index(profile.store.snapshot())
+        assert profile.memory_bytes() > before
+
+
+class TestUseProfile:
+    """Tests for routing requests to a profile's store."""
+
+    def test_get_store_follows_the_profile(self, registry):
+        default = get_store()
+        with use_profile("grace") as profile:
+            assert profile is not None
+            assert get_store() is profile.store
+            assert "rowing" in get_store().get("bio").text
+        assert get_store() is default
+
+    def test_none_keeps_default_content(self, registry):
+        default = get_store()
+        with use_profile(None) as profile:
+            assert profile is None
+            assert get_store() is default
+
+    def test_profile_without_registry_is_an_error(self, monkeypatch):
+        monkeypatch.delenv(PROFILES_DIR_ENV, raising=False)
+        reset_profiles()
+        with pytest.raises(ProfilesDisabledError), use_profile("ada"):
+            pass
+
+    def test_registry_from_env(self, monkeypatch, profiles_dir):
+        monkeypatch.setenv(PROFILES_DIR_ENV, str(profiles_dir))
+        monkeypatch.setenv(PROFILE_MEMORY_CAP_ENV, "2")
+        reset_profiles()
+        try:
+            registry = get_profiles()
+            assert registry is not None
+            assert registry.root == profiles_dir
+            assert registry.max_bytes == 2 * 1024 * 1024
+        finally:
+            reset_profiles()
+
+    async def test_async_variant_loads_off_the_event_loop(self, registry, monkeypatch):
+        threads = []
+        get = registry.get
+        monkeypatch.setattr(registry, "get", lambda name: threads.append(threading.current_thread()) or get(name))
+        async with ause_profile("grace") as profile:
+            assert profile is not None
+            assert get_store() is profile.store
+        assert threads and threads[0] is not threading.main_thread()
+        assert get_store() is not profile.store
+
+    def test_loading_a_profile_trims_the_registry(self, registry):
+        registry.max_bytes = 1
+        with use_profile("ada"):
+            get_store().preload()
+        with use_profile("grace"):
+            get_store().preload()
+        assert registry.loaded() == ["grace"]
+
+    def test_requests_for_a_loaded_profile_do_not_trim(self, registry, monkeypatch):
+        registry.get("ada")
+        monkeypatch.setattr(registry, "trim", lambda keep=None: pytest.fail("trimmed without a load"))
+        with use_profile("ada"):
+            get_store().preload()
+
+
+class TestProfileTools:
+    """Tests for the profile argument of the MCP tools and resources."""
+
+    async def test_tools_route_by_profile(self, registry):
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("get_bio", {"profile": "linus"})
+        assert "sailing" in content[0].text
+
+        content, _ = await mcp.call_tool("search_info", {"query": "python", "profile": "ada"})
+        assert "fencing" in content[0].text
+        assert "rowing" not in content[0].text
+
+        _, profiles = await mcp.call_tool("list_profiles", {})
+        assert profiles == {"result": ["ada", "grace", "linus"]}
+
+    async def test_search_cache_is_per_profile(self, registry):
+        from src.main import mcp
+
+        for name in ("ada", "grace"):
+            await mcp.call_tool("search_info", {"query": "python", "profile": name})
+        content, _ = await mcp.call_tool("search_info", {"query": "python", "profile": "ada"})
+        assert "fencing" in content[0].text
+        assert registry.get("ada").search_cache.hits == 1
+
+    async def test_profile_resource(self, registry):
+        from src.main import mcp
+
+        contents = list(await mcp.read_resource("larkin://profiles/grace/bio"))
+        assert "rowing" in contents[0].content
+
+    async def test_profile_resume_pdf(self, registry, profiles_dir):
+        from src.main import mcp
+
+        (profiles_dir / "ada" / "resume").mkdir()
+        (profiles_dir / "ada" / "resume" / "larkin_resume.pdf").write_bytes(b"%PDF-ada")
+
+        contents = list(await mcp.read_resource("larkin://profiles/ada/resume.pdf"))
+        assert contents[0].content == b"%PDF-ada"
+        async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+            result = await client.read_resource("larkin://profiles/ada/resume.pdf")
+        assert base64.b64decode(result.contents[0].blob) == b"%PDF-ada"
@@ -0,0 +1,54 @@
+"""Tests for the keyword query language in src/util/query.py."""
+
+import pytest
+
+from src.util.query import (
+    And,
+    Field,
+    Not,
+    Or,
+    Phrase,
+    QuerySyntaxError,
+    Term,
+    normalize_query,
+    parse_query,
+    terms,
+)
+
+
+class TestParseQuery:
+    """Tests for parse_query."""
+
+    def test_adjacent_words_are_anded(self):
+        assert parse_query("python rust") == And((Term("python"), Term("rust")))
+        assert parse_query("python AND rust") == parse_query("python rust")
+
+    def test_precedence(self):
+        assert parse_query("a b OR NOT c") == Or((And((Term("a"), Term("b"))), Not(Term("c"))))
+        assert parse_query("(a OR b) -c") == And((Or((Term("a"), Term("b"))), Not(Term("c"))))
+
+    def test_lowercase_operators_are_words(self):
+        assert parse_query("rock and roll") == And((Term("rock"), Term("and"), Term("roll")))
+
+    def test_phrases_prefixes_and_fields(self):
+        assert parse_query('"Machine Learning"') == Phrase(("machine", "learning"))
+        assert parse_query("next.js") == Phrase(("next", "js"))
+        assert parse_query("pyth*") == Term("pyth", prefix=True)
+        assert parse_query('section:"Work Experience" resource:Resume') == And(
+            (Field("section", "Work Experience"), Field("resource", "Resume"))
+        )
+
+    def test_empty_query(self):
+        assert parse_query("  ... ") is None
+
+    @pytest.mark.parametrize("query", ["(python", "python)", "python NOT"])
+    def test_malformed_queries(self, query):
+        with pytest.raises(QuerySyntaxError):
+            parse_query(query)
+
+    def test_terms_skip_negated_words(self):
+        assert terms(parse_query('"big data" -java')) == [Term("big"), Term("data")]
+
+    def test_normalize_keeps_operators(self):
+        assert normalize_query("  Python   OR go ") == "python OR go"
+        assert normalize_query("python or go") != normalize_query("python OR go")
@@ -0,0 +1,168 @@
+"""Tests for the inverted index in src/util/search.py."""
+
+from src.util.search import SearchIndex, TrigramIndex, edit_distance, get_index, snippet, tokenize
+from src.util.store import ContentStore
+
+
+class TestTokenize:
+    """Tests for the search tokenizer."""
+
+    def test_lowercases_and_splits(self):
+        assert tokenize("Python, Rust & Go!") == ["python", "rust", "go"]
+
+    def test_keeps_language_suffixes(self):
+        assert tokenize("C++ and C#") == ["c++", "and", "c#"]
+
+    def test_keeps_non_ascii_words_whole(self):
+        assert tokenize("Zürich, STRASSE/Straße, naïve_café") == ["zürich", "strasse", "strasse", "naïve", "café"]
+
+
+class TestSearchIndex:
+    """Tests for SearchIndex lookups and ranking."""
+
+    def test_ranks_denser_resource_first(self):
+        index = SearchIndex(
+            {
+                "bio": "I like tennis.\nAlso some python.",
+                "skills": "Python\nPython again\nMore python",
+            }
+        )
+        hits = index.search("python")
+        assert [hit.resource for hit in hits] == ["skills", "bio"]
+        assert hits[0].lines == ["Python", "Python again", "More python"]
+
+    def test_all_terms_must_share_a_line(self):
+        index = SearchIndex({"bio": "John went home\nLarkin stayed", "resume": "John Larkin"})
+        hits = index.search("john larkin")
+        assert [hit.resource for hit in hits] == ["resume"]
+
+    def test_unknown_term_returns_nothing(self):
+        index = SearchIndex({"bio": "hello world"})
+        assert index.search("xyznonexistent") == []
+
+    def test_limit_truncates_resources(self):
+        index = SearchIndex({"a": "rust", "b": "rust rust", "c": "rust rust rust"})
+        assert len(index.search("rust", limit=2)) == 2
+
+    def test_non_ascii_words_match_whole(self):
+        index = SearchIndex({"bio": "Grew up in Zürich.\nRich in detail."})
+        assert [hit.lines for hit in index.search("rich")] == [["Rich in detail."]]
+        assert [hit.lines for hit in index.search("ZÜRICH")] == [["Grew up in Zürich."]]
+
+    def test_empty_corpus(self):
+        assert SearchIndex({}).search("anything") == []
+
+
+class TestFuzzyMatching:
+    """Tests for typo-tolerant term lookup."""
+
+    def test_edit_distance_counts_transpositions_once(self):
+        assert edit_distance("pyhton", "python", 2) == 1
+        assert edit_distance("larkn", "larkin", 2) == 1
+        assert edit_distance("abc", "xyz", 2) == 3
+
+    def test_candidates_prefer_fewest_edits(self):
+        trigrams = TrigramIndex(["larkin", "large", "lake", "python"])
+        assert trigrams.candidates("larkn") == ["larkin"]
+        assert trigrams.candidates("pyhton") == ["python"]
+        assert trigrams.candidates("zzzzzz") == []
+
+    def test_short_terms_allow_one_edit(self):
+        trigrams = TrigramIndex(["go", "java"])
+        assert trigrams.candidates("jaav") == ["java"]
+        assert trigrams.candidates("jv") == []
+
+    def test_weak_trigram_overlap_is_not_a_correction(self):
+        assert TrigramIndex(["march"]).candidates("zürch") == []
+        index = SearchIndex({"bio": "Ca can cal"})
+        assert index.corrections("café") == {"café": []}
+        assert index.search("café") == []
+
+    def test_search_corrects_misspelled_terms(self):
+        index = SearchIndex({"skills": "Python and Rust", "bio": "Larkin plays tennis"})
+        assert index.corrections("pyhton rust") == {"pyhton": ["python"]}
+        assert [hit.lines for hit in index.search("pyhton rust")] == [["Python and Rust"]]
+        assert index.search("pyhton", fuzzy=False) == []
+
+
+class TestQueryLanguage:
+    """Tests for executing parsed queries against the positional index."""
+
+    INDEX = {
+        "resume": "# Resume\n\n## Work\n\nPython at Acme\nMachine learning with Rust\n\n## Education\n\nPython course",
+        "projects": "Learning machine code\nPython scripts",
+    }
+
+    def lines(self, query: str) -> dict[str, list[str]]:
+        return {hit.resource: hit.lines for hit in SearchIndex(self.INDEX).search(query)}
+
+    def test_or_and_not(self):
+        assert set(self.lines("rust OR scripts")) == {"resume", "projects"}
+        assert self.lines("python -acme") == {"resume": ["Python course"], "projects": ["Python scripts"]}
+
+    def test_phrases_need_adjacent_words_in_order(self):
+        assert self.lines('"machine learning"') == {"resume": ["Machine learning with Rust"]}
+
+    def test_prefix_wildcard(self):
+        assert self.lines("learn*") == self.lines("learning")
+        assert self.lines("scr*") == {"projects": ["Python scripts"]}
+
+    def test_field_filters(self):
+        assert self.lines("python resource:projects") == {"projects": ["Python scripts"]}
+        assert self.lines('python section:"Work"') == {"resume": ["Python at Acme"]}
+
+    def test_section_filters_reuse_the_snapshot_section_trees(self, tmp_path):
+        (tmp_path / "work.md").write_text(self.INDEX["resume"])
+        snapshot = ContentStore(tmp_path, ["work"]).snapshot()
+
+        hits = get_index(snapshot).search('python section:"Work"')
+
+        assert [hit.lines for hit in hits] == [["Python at Acme"]]
+        assert snapshot.has_derived("section_trees")
+        assert get_index(snapshot)._section_trees is None
+
+    def test_payload_round_trip_keeps_positions(self):
+        index = SearchIndex(self.INDEX)
+        restored = SearchIndex.from_payload(index.to_payload(), self.INDEX)
+        assert restored.postings == index.postings
+        assert [hit.lines for hit in restored.search('"machine learning"')] == [["Machine learning with Rust"]]
+
+
+class TestTopK:
+    """Tests for bounded results and snippets."""
+
+    def test_limit_and_max_lines_keep_the_best(self):
+        index = SearchIndex({"a": "rust", "b": "rust\nrust\nrust", "c": "go"})
+        hits = index.search("rust", limit=1, max_lines=2)
+        assert [hit.resource for hit in hits] == ["b"]
+        assert hits[0].line_numbers == [0, 1]
+        assert hits[0].matched == 3
+
+    def test_hits_report_matched_words(self):
+        index = SearchIndex({"a": "Python and pytest", "b": "Rust"})
+        assert index.search("py*")[0].terms == {"python", "pytest"}
+        assert index.search("pyhton")[0].terms == {"python"}
+
+
+class TestSnippet:
+    """Tests for snippet windows."""
+
+    def test_highlights_matched_words(self):
+        assert snippet("  Python (FastAPI, pytest)", {"python", "pytest"}) == "**Python** (FastAPI, **pytest**)"
+
+    def test_highlights_non_ascii_words_whole(self):
+        assert snippet("Zürich and rich", {"rich"}) == "Zürich and **rich**"
+        assert snippet("Zürich and rich", {"zürich"}) == "**Zürich** and rich"
+
+    def test_urls_and_link_targets_are_left_intact(self):
+        line = "Read the [post](https://example.com/walk-in-the-park/) or https://example.com/the-end"
+        assert snippet(line, {"the"}) == (
+            "Read **the** [post](https://example.com/walk-in-the-park/) or https://example.com/the-end"
+        )
+
+    def test_long_lines_are_windowed_around_the_first_match(self):
+        line = "filler " * 30 + "uses Rust daily " + "more " * 30
+        text = snippet(line, {"rust"}, width=40)
+        assert text.startswith("…") and text.endswith("…")
+        assert "**Rust**" in text
+        assert len(text) <= 40 + 6
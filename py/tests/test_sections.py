@@ -0,0 +1,126 @@
+"""Tests for the markdown heading trees in src/util/sections.py."""
+
+import pytest
+
+from src.util.lines import LineTable
+from src.util.sections import SectionTree
+
+DOCUMENT = """# Tennis
+
+## Overview
+
+Four years of college tennis.
+
+## 2015-2016 Season
+
+### Singles
+
+Went 12-3 at #1 singles.
+
+### Doubles
+
+Ranked nationally.
+
+## 2016-2017 Season
+
+### Singles
+
+```
+# not a heading
+```
+
+Captain's year — 15-2.
+"""
+
+
+@pytest.fixture
+def tree() -> SectionTree:
+    return SectionTree("tennis", DOCUMENT)
+
+
+class TestSectionTree:
+    """Tests for parsing and slicing sections."""
+
+    def test_builds_nested_paths(self, tree):
+        assert [s.path[-1] for s in tree.sections] == [
+            "Tennis",
+            "Overview",
+            "2015-2016 Season",
+            "Singles",
+            "Doubles",
+            "2016-2017 Season",
+            "Singles",
+        ]
+        assert tree.sections[3].path == ("Tennis", "2015-2016 Season", "Singles")
+        assert [child.title for child in tree.sections[2].children] == ["Singles", "Doubles"]
+
+    def test_section_text_stops_at_next_sibling(self, tree):
+        text = tree.text(tree.find("2015-2016 Season"))
+        assert text.startswith("## 2015-2016 Season\n")
+        assert "Ranked nationally." in text
+        assert "2016-2017" not in text
+
+    def test_offsets_are_utf8_bytes(self, tree):
+        last = tree.find("2016-2017 Season/Singles")
+        assert last.end == len(DOCUMENT.encode())
+        assert tree.text(last).endswith("Captain's year — 15-2.\n")
+
+    def test_ignores_headings_in_code_fences(self, tree):
+        assert tree.find("not a heading") is None
+
+    def test_path_disambiguates_repeated_headings(self, tree):
+        assert "12-3" in tree.text(tree.find("2015-2016 season / singles"))
+        assert "15-2" in tree.text(tree.find("2016-2017 Season > Singles"))
+
+    def test_exact_match_beats_earlier_substring(self):
+        tree = SectionTree("resume", "# Resume\n## Python Projects\n## Python\n")
+        assert tree.find("python").title == "Python"
+        assert tree.find("proj").title == "Python Projects"
+
+    def test_link_headings_use_link_text(self):
+        tree = SectionTree("bio", "## Places\n### [Cincinnati](https://example.com)\nHome.\n")
+        assert tree.find("cincinnati").path == ("Places", "Cincinnati")
+
+    def test_line_numbers_agree_with_line_table(self):
+        text = "# One\n\nCarriage\rreturn and line\u2028separator.\n\n## Two\n\nEnd.\n"
+        tree = SectionTree("doc", text)
+        table = LineTable(text)
+        assert list(tree.line_offsets) == list(table.offsets)
+        section = tree.find("Two")
+        assert section is not None
+        assert table.line(section.line - 1) == "## Two"
+
+    def test_outline_indents_by_level(self, tree):
+        outline = tree.outline()
+        assert outline[0].startswith("- Tennis (line 1, ~")
+        assert outline[3].startswith("    - Singles (line 9, ~")
+
+
+class TestSectionTools:
+    """Tests for the get_section and get_table_of_contents tools."""
+
+    async def test_get_section_returns_only_that_section(self):
+        from src.main import mcp
+        from src.util.resources import load_resource
+
+        content, _ = await mcp.call_tool("get_section", {"resource": "tennis", "section": "Overview"})
+        text = content[0].text
+        assert text.startswith("## Overview")
+        assert len(text) < len(load_resource("tennis")) / 10
+
+    async def test_unknown_section_lists_headings(self):
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        from src.main import mcp
+
+        with pytest.raises(ToolError, match="Available sections: .*Overview"):
+            await mcp.call_tool("get_section", {"resource": "tennis", "section": "xyznonexistent"})
+
+    async def test_table_of_contents_covers_every_resource(self):
+        from src.constants import RESOURCES_CATEGORIES
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("get_table_of_contents", {})
+        text = content[0].text
+        for resource in RESOURCES_CATEGORIES:
+            assert f"## {resource}\n" in text
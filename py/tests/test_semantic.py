@@ -0,0 +1,86 @@
+"""Tests for the TF-IDF section search in src/util/semantic.py."""
+
+import sys
+
+import pytest
+
+from src.util.resources import SemanticSearchUnavailableError, search_sections
+from src.util.sections import SectionTree
+
+np = pytest.importorskip("numpy")
+
+from src.util.semantic import SemanticIndex, features  # noqa: E402
+
+
+def make_index(documents: dict[str, str]) -> SemanticIndex:
+    return SemanticIndex({name: SectionTree(name, text) for name, text in documents.items()})
+
+
+class TestFeatures:
+    """Tests for feature extraction."""
+
+    def test_words_and_ngrams(self):
+        counts = features("Kafka kafka")
+        assert counts["w:kafka"] == 2
+        assert counts["c: kafk"] == 2
+        assert counts["c:kafka"] == 2
+
+
+class TestSemanticIndex:
+    """Tests for SemanticIndex ranking."""
+
+    DOCUMENTS = {
+        "resume": (
+            "# Resume\n\n"
+            "## Platform\n\nBuilt distributed microservices on Kafka.\n\n"
+            "## Frontend\n\nReact dashboards and design systems.\n"
+        ),
+        "tennis": "# Tennis\n\n## Doubles\n\nWon the conference doubles title.\n",
+    }
+
+    def test_ranks_sections_not_documents(self):
+        hits = make_index(self.DOCUMENTS).search("kafka microservices")
+        assert hits[0].resource == "resume"
+        assert hits[0].path == ("Resume", "Platform")
+        assert hits[0].lines == ["Built distributed microservices on Kafka."]
+
+    def test_partial_and_inflected_matches(self):
+        hits = make_index(self.DOCUMENTS).search("microservice architecture")
+        assert hits and hits[0].path[-1] == "Platform"
+
+    def test_scores_are_cosine_similarities(self):
+        hits = make_index(self.DOCUMENTS).search("conference doubles title")
+        assert hits[0].resource == "tennis"
+        assert 0 < hits[0].score <= 1.0 + 1e-6
+        assert all(a.score >= b.score for a, b in zip(hits, hits[1:], strict=False))
+
+    def test_unknown_words_return_nothing(self):
+        assert make_index(self.DOCUMENTS).search("zzzz qqqq") == []
+
+    def test_empty_corpus(self):
+        assert make_index({}).search("anything") == []
+
+
+class TestSemanticSearchInfo:
+    """Tests for search_info(mode="semantic")."""
+
+    async def test_semantic_mode_groups_by_section(self):
+        from src.main import mcp
+
+        content, _ = await mcp.call_tool("search_info", {"query": "distributed systems", "mode": "semantic"})
+        assert content[0].text.startswith("## ")
+        assert " › " in content[0].text.splitlines()[0]
+
+    async def test_rejects_unknown_mode(self):
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        from src.main import mcp
+
+        with pytest.raises(ToolError, match="mode must be one of"):
+            await mcp.call_tool("search_info", {"query": "python", "mode": "psychic"})
+
+    def test_reports_missing_numpy(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        monkeypatch.delitem(sys.modules, "src.util.semantic", raising=False)
+        with pytest.raises(SemanticSearchUnavailableError, match="larkin-mcp\\[semantic\\]"):
+            search_sections("python")
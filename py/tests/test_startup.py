@@ -0,0 +1,28 @@
+"""Startup-time budget checks (see benchmarks/startup.py).
+
+These spawn fresh interpreters, so they measure real cold starts.
+"""
+
+import pytest
+
+from benchmarks.startup import FIRST_RESPONSE_BUDGET_MS, OWN_IMPORT_BUDGET_MS, measure_first_response, measure_import
+
+
+@pytest.mark.end_to_end_test
+class TestStartupBudget:
+    """Fail if cold start regresses past its budget."""
+
+    def test_heavy_modules_are_deferred(self):
+        result = measure_import()
+        assert not result["deferred_imported"], f"Imported at startup: {result['deferred_imported']}"
+
+    def test_own_import_time_within_budget(self):
+        # Best of three, so one noisy run on a busy CI box doesn't fail the suite.
+        own_ms = min(measure_import()["own_ms"] for _ in range(3))
+        assert own_ms <= OWN_IMPORT_BUDGET_MS, f"src.* import time {own_ms:.1f}ms > {OWN_IMPORT_BUDGET_MS}ms"
+
+    def test_first_response_within_budget(self):
+        elapsed_ms = measure_first_response()
+        assert elapsed_ms <= FIRST_RESPONSE_BUDGET_MS, (
+            f"first response {elapsed_ms:.1f}ms > {FIRST_RESPONSE_BUDGET_MS}ms"
+        )
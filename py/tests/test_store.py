@@ -0,0 +1,170 @@
+"""Tests for the in-memory content store in src/util/store.py."""
+
+import base64
+import os
+import time
+
+import pytest
+
+from src.util.store import ContentStore, UnknownResourceError
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "resume").mkdir()
+    (tmp_path / "resume" / "larkin_resume.md").write_text("# John Larkin\n")
+    (tmp_path / "bio.md").write_text("Bio v1\n")
+    return tmp_path
+
+
+class TestContentStore:
+    """Tests for ContentStore caching and invalidation."""
+
+    def test_resume_uses_special_path(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        assert store.path_for("resume") == content_dir / "resume" / "larkin_resume.md"
+        assert store.path_for("bio") == content_dir / "bio.md"
+
+    def test_repeated_get_serves_cached_entry(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        first = store.get("bio")
+        second = store.get("bio")
+        assert first is second
+        assert first.text == "Bio v1\n"
+
+    def test_modified_file_is_reloaded(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        first = store.get("bio")
+
+        path = content_dir / "bio.md"
+        path.write_text("Bio v2 with more text\n")
+        os.utime(path, ns=(first.mtime_ns + 1_000_000, first.mtime_ns + 1_000_000))
+
+        second = store.get("bio")
+        assert second is not first
+        assert second.text == "Bio v2 with more text\n"
+
+    def test_missing_file_raises(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        with pytest.raises(FileNotFoundError):
+            store.get("skills")
+
+    @pytest.mark.parametrize("name", ["skills", "../secret", "../../../../tmp/secret", "bio/../bio"])
+    def test_names_outside_the_categories_never_touch_the_filesystem(self, content_dir, name):
+        (content_dir.parent / "secret.md").write_text("Outside the content root\n")
+        store = ContentStore(content_dir, ["resume", "bio"])
+        with pytest.raises(UnknownResourceError):
+            store.get(name)
+        with pytest.raises(UnknownResourceError):
+            store.snapshot().get(name)
+        assert not store.exists(name)
+        assert store.cached(name) is None
+        assert store.error(name) is None
+
+    def test_deleted_file_is_evicted(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        store.get("bio")
+        (content_dir / "bio.md").unlink()
+        with pytest.raises(FileNotFoundError):
+            store.get("bio")
+
+    def test_blob_survives_an_in_place_rewrite(self, content_dir):
+        pdf = content_dir / "resume" / "larkin_resume.pdf"
+        pdf.write_bytes(b"%PDF-" + b"a" * 100)
+        store = ContentStore(content_dir, ["resume", "bio"])
+        blob = store.get_blob(pdf)
+        etag = blob.etag
+
+        # Same inode, truncated and refilled shorter, as ``cp new.pdf resume.pdf`` does.
+        with pdf.open("r+b") as f:
+            f.truncate(0)
+            f.write(b"%PDF-b")
+        assert blob.data == b"%PDF-" + b"a" * 100
+        assert blob.base64_range(1, 50) == base64.b64encode(blob.data[1:51]).decode()
+        assert blob.etag == etag
+
+        os.utime(pdf, ns=(blob.mtime_ns + 1_000_000, blob.mtime_ns + 1_000_000))
+        assert store.get_blob(pdf).data == b"%PDF-b"
+
+    def test_preload_skips_missing_categories(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio", "skills"])
+        store.preload()
+        assert store.get("resume").text == "# John Larkin\n"
+
+
+def touch(path, text):
+    """Rewrite ``path`` with a later mtime, so the change is visible even on coarse-mtime filesystems."""
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+
+class TestSnapshots:
+    """Tests for immutable snapshots and background reload."""
+
+    def test_snapshot_is_unchanged_by_later_edits(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        before = store.snapshot()
+        touch(content_dir / "bio.md", "Bio v2\n")
+
+        after = store.snapshot()
+        assert after is not before
+        assert before.get("bio").text == "Bio v1\n"
+        assert after.get("bio").text == "Bio v2\n"
+        assert store.snapshot() is after
+
+    def test_derived_values_belong_to_their_snapshot(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        builds = []
+
+        def build(entries):
+            builds.append(entries["bio"].text)
+            return entries["bio"].text.upper()
+
+        assert store.derived("upper", build) == "BIO V1\n"
+        assert store.derived("upper", build) == "BIO V1\n"
+        touch(content_dir / "bio.md", "Bio v2\n")
+        assert store.derived("upper", build) == "BIO V2\n"
+        assert builds == ["Bio v1\n", "Bio v2\n"]
+
+    def test_watched_store_swaps_in_warm_snapshots(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        store.derived("upper", lambda entries: entries["bio"].text.upper())
+        store.watch(interval=3600)
+        try:
+            first = store.snapshot()
+            touch(content_dir / "bio.md", "Bio v2\n")
+            # Requests keep the current snapshot until the watcher swaps in the next one.
+            assert store.snapshot() is first
+            assert store.get("bio").text == "Bio v1\n"
+
+            second = store.refresh(warm=True)
+            assert second.has_derived("upper")
+            assert store.snapshot() is second
+            assert store.derived("upper", lambda entries: "unused") == "BIO V2\n"
+        finally:
+            store.unwatch()
+
+    def test_watch_takes_the_first_snapshot_cold(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        store.derived("upper", lambda entries: entries["bio"].text.upper())
+        touch(content_dir / "bio.md", "Bio v2\n")
+        store.watch(interval=3600)
+        try:
+            assert store.snapshot().entries["bio"].text == "Bio v2\n"
+            assert not store.snapshot().has_derived("upper")
+        finally:
+            store.unwatch()
+
+    def test_watcher_thread_picks_up_edits(self, content_dir):
+        store = ContentStore(content_dir, ["resume", "bio"])
+        store.watch(interval=0.01)
+        try:
+            touch(content_dir / "bio.md", "Bio v2\n")
+            deadline = time.monotonic() + 5
+            while store.get("bio").text != "Bio v2\n" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert store.get("bio").text == "Bio v2\n"
+        finally:
+            store.unwatch()
+        assert not store.watching
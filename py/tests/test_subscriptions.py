@@ -0,0 +1,148 @@
+"""Tests for resource subscriptions and ETags in src/resources/subscriptions.py."""
+
+import asyncio
+import json
+import os
+
+import pytest
+from mcp import types
+
+from src.resources.subscriptions import SubscriptionManager, resource_for_uri
+from src.util.aio import run_blocking
+from src.util.store import ContentStore, get_store
+
+
+class FakeSession:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send_resource_updated(self, uri):
+        self.sent.append(f"updated {uri}")
+
+
+def touch(path, text):
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+
+async def wait_for(predicate):
+    for _ in range(200):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "bio.md").write_text("Bio v1\n")
+    (tmp_path / "work.md").write_text("Work v1\n")
+    store = ContentStore(tmp_path, ["bio", "work", "skills"])
+    store.snapshot()
+    return store
+
+
+class TestResourceForUri:
+    """Tests for mapping URIs to resources."""
+
+    def test_maps_resources_and_pages(self):
+        assert resource_for_uri("larkin://bio") == "bio"
+        assert resource_for_uri("larkin://pages/resume/abc") == "resume"
+        assert resource_for_uri("larkin://resume.pdf") == "resume.pdf"
+        assert resource_for_uri("larkin://resume.pdf/0/10") == "resume.pdf"
+        assert resource_for_uri("config://version") is None
+
+    def test_profile_uris_are_not_followed(self):
+        assert resource_for_uri("larkin://profiles/ada/bio") is None
+        assert resource_for_uri("larkin://profiles/ada/pages/bio/abc") is None
+
+
+class TestSubscriptionManager:
+    """Tests for change notifications."""
+
+    async def test_notifies_subscribers_of_changed_resources_only(self, store, tmp_path):
+        manager = SubscriptionManager()
+        session, other = FakeSession(), FakeSession()
+        manager.subscribe(session, "larkin://bio", store)
+        manager.subscribe(other, "larkin://work", store)
+
+        touch(tmp_path / "bio.md", "Bio v2\n")
+        await run_blocking(store.refresh)
+        await wait_for(lambda: session.sent)
+
+        assert session.sent == ["updated larkin://bio"]
+        assert other.sent == []
+
+    async def test_unsubscribed_and_new_resources_send_nothing(self, store, tmp_path):
+        manager = SubscriptionManager()
+        session = FakeSession()
+        manager.subscribe(session, "larkin://bio", store)
+        manager.unsubscribe(session, "larkin://bio")
+
+        touch(tmp_path / "bio.md", "Bio v2\n")
+        (tmp_path / "skills.md").write_text("Skills\n")
+        await run_blocking(store.refresh)
+        await asyncio.sleep(0.05)
+        assert session.sent == []
+
+    async def test_resume_pdf_changes_are_notified(self, store, tmp_path):
+        (tmp_path / "resume").mkdir()
+        touch(tmp_path / "resume" / "larkin_resume.pdf", "%PDF-1")
+        await run_blocking(store.refresh)
+        manager = SubscriptionManager()
+        session = FakeSession()
+        manager.subscribe(session, "larkin://resume.pdf", store)
+
+        touch(tmp_path / "resume" / "larkin_resume.pdf", "%PDF-2")
+        await run_blocking(store.refresh)
+        await wait_for(lambda: session.sent)
+        assert session.sent == ["updated larkin://resume.pdf"]
+
+    async def test_unchanged_content_sends_nothing(self, store, tmp_path):
+        manager = SubscriptionManager()
+        session = FakeSession()
+        manager.subscribe(session, "larkin://bio", store)
+
+        # Same bytes, new mtime: a new snapshot, but the ETag is unchanged.
+        touch(tmp_path / "bio.md", "Bio v1\n")
+        await run_blocking(store.refresh)
+        await asyncio.sleep(0.05)
+        assert session.sent == []
+
+
+class TestServerIntegration:
+    """Tests for the handlers registered on the server."""
+
+    def test_advertises_subscriptions(self):
+        from src.main import mcp
+
+        capabilities = mcp._mcp_server.create_initialization_options().capabilities
+        assert capabilities.resources.subscribe is True
+        assert not capabilities.resources.listChanged
+
+    async def test_reads_carry_etags(self):
+        from src.main import mcp
+
+        request = types.ReadResourceRequest(
+            method="resources/read", params=types.ReadResourceRequestParams(uri="larkin://bio")
+        )
+        result = await mcp._mcp_server.request_handlers[types.ReadResourceRequest](request)
+        snapshot = get_store().snapshot()
+        etag = snapshot.entries["bio"].etag
+        assert result.root.contents[0].meta == {"etag": etag, "version": snapshot.content_id}
+
+        contents = await mcp.read_resource("config://etags")
+        assert json.loads(contents[0].content)["larkin://bio"] == etag
+
+    async def test_resume_pdf_reads_carry_etags(self):
+        from src.main import mcp
+
+        request = types.ReadResourceRequest(
+            method="resources/read", params=types.ReadResourceRequestParams(uri="larkin://resume.pdf")
+        )
+        result = await mcp._mcp_server.request_handlers[types.ReadResourceRequest](request)
+        etag = get_store().snapshot().blobs["resume.pdf"].etag
+        assert result.root.contents[0].meta["etag"] == etag
+
+        contents = await mcp.read_resource("config://etags")
+        assert json.loads(contents[0].content)["larkin://resume.pdf"] == etag
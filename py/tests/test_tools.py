@@ -6,46 +6,84 @@ the MCP server, which is useful for unit testing the logic.
 WARNING: Most of the test suite was generated by AI so just a heads up.
 """
 
+import pytest
+
 from src.constants import MCP_VERSION, RESOURCES_CATEGORIES
 
 
 class TestHealthCheck:
     """Tests for health_check tool logic."""
 
-    def test_health_check_returns_dict(self):
+    async def test_health_check_returns_dict(self):
         """Test that health_check returns the expected structure."""
-        from src.util.resources import load_resource
-
-        # Simulate health check logic
-        resources_status = {}
-        for resource in RESOURCES_CATEGORIES:
-            content = load_resource(resource)
-            is_available = not content.startswith("Resource '") and not content.startswith("Error")
-            resources_status[resource] = {
-                "available": is_available,
-                "size_bytes": len(content.encode()) if is_available else 0,
-            }
-
-        result = {
-            "status": "healthy",
-            "version": MCP_VERSION,
-            "resources": resources_status,
-        }
+        from src.main import mcp
+
+        _, result = await mcp.call_tool("health_check", {})
 
         assert result["status"] == "healthy"
         assert result["version"] == MCP_VERSION
-        assert "resources" in result
+        assert set(result["resources"]) == set(RESOURCES_CATEGORIES)
+        assert result["last_reload"] is not None
 
-    def test_resources_have_expected_fields(self):
+    async def test_resources_have_expected_fields(self):
         """Test that each resource has expected status fields."""
-        from src.util.resources import load_resource
-
-        for resource in RESOURCES_CATEGORIES:
-            content = load_resource(resource)
-            is_available = not content.startswith("Resource '")
-
-            if is_available:
-                assert len(content.encode()) > 0
+        from src.main import mcp
+
+        _, result = await mcp.call_tool("health_check", {})
+        for name, status in result["resources"].items():
+            assert status["available"], f"{name} should be available"
+            assert status["size_bytes"] > 0
+            assert status["last_loaded"] is not None
+            assert status["error"] is None
+
+    def test_degraded_when_some_resources_missing(self, tmp_path):
+        """Test that a partially populated content dir reports degraded."""
+        from src.tools.registry import _health_from_store
+        from src.util.store import ContentStore
+
+        (tmp_path / "bio.md").write_text("bio")
+        store = ContentStore(tmp_path)
+        store.preload()
+
+        result = _health_from_store(store)
+        assert result.status == "degraded"
+        assert result.resources["bio"].available
+        assert result.resources["bio"].size_bytes == 3
+        assert not result.resources["skills"].available
+        assert "not found" in result.resources["skills"].error
+
+    def test_degraded_when_a_reload_fails(self, tmp_path):
+        """Test that a resource whose last reload failed is reported even though an old copy is cached."""
+        from src.tools.registry import _health_from_store
+        from src.util.store import ContentStore
+
+        for name in RESOURCES_CATEGORIES:
+            (tmp_path / f"{name}.md").write_text(name)
+        (tmp_path / "resume").mkdir()
+        (tmp_path / "resume" / "larkin_resume.md").write_text("resume")
+        store = ContentStore(tmp_path)
+        store.preload()
+        (tmp_path / "bio.md").write_bytes(b"\xff\xfe not utf-8")
+        with pytest.raises(UnicodeDecodeError):
+            store.get("bio")
+
+        result = _health_from_store(store)
+        assert result.status == "degraded"
+        assert not result.resources["bio"].available
+        assert "UnicodeDecodeError" in result.resources["bio"].error
+        assert result.resources["skills"].available
+
+    def test_unhealthy_when_no_resources(self, tmp_path):
+        """Test that an empty content dir reports unhealthy."""
+        from src.tools.registry import _health_from_store
+        from src.util.store import ContentStore
+
+        store = ContentStore(tmp_path)
+        store.preload()
+
+        result = _health_from_store(store)
+        assert result.status == "unhealthy"
+        assert result.last_reload is None
 
 
 class TestSearchInfo:
@@ -73,3 +111,89 @@ class TestSearchInfo:
         if not results:
             message = "No matches found for 'xyznonexistent123'"
             assert "No matches found" in message
+
+    def test_search_tolerates_typos(self):
+        """Test that a misspelled query matches the word it was meant to be."""
+        from src.util.resources import correct_query, search_resources
+
+        assert search_resources("pyhton") == search_resources("python")
+        assert correct_query("pyhton") == {"pyhton": "python"}
+
+
+class TestAsyncHandlers:
+    """Tests that the registered handlers run as coroutines on the server."""
+
+    async def test_tools_are_coroutines(self):
+        from src.main import mcp
+
+        for name in ("get_resume", "get_bio", "search_info", "health_check"):
+            tool = mcp._tool_manager.get_tool(name)
+            assert tool is not None and tool.is_async, f"{name} should be async"
+
+    async def test_concurrent_tool_calls(self):
+        import anyio
+
+        from src.main import mcp
+
+        results: list[str] = []
+
+        async def call(name: str) -> None:
+            content, _ = await mcp.call_tool(name, {})
+            results.append(content[0].text)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(20):
+                tg.start_soon(call, "get_resume")
+                tg.start_soon(call, "get_skills")
+
+        assert len(results) == 40
+        assert all(text for text in results)
+
+    async def test_resume_pdf_resource(self):
+        from src.main import mcp
+
+        contents = await mcp.read_resource("larkin://resume.pdf")
+        assert contents[0].content.startswith(b"%PDF")
+
+
+class TestResumePdfChunks:
+    """Tests for byte-range access to the resume PDF."""
+
+    async def test_chunks_reassemble_to_full_pdf(self):
+        import base64
+
+        from src.constants import RESUME_PDF_PATH
+        from src.main import mcp
+
+        data = b""
+        offset: int | None = 0
+        while offset is not None:
+            _, chunk = await mcp.call_tool("get_resume_pdf_chunk", {"offset": offset, "length": 30000})
+            data += base64.b64decode(chunk["data_base64"])
+            offset = chunk["next_offset"]
+
+        assert data == RESUME_PDF_PATH.read_bytes()
+
+    async def test_unaligned_chunk_matches_file(self):
+        import base64
+
+        from src.constants import RESUME_PDF_PATH
+        from src.main import mcp
+
+        _, chunk = await mcp.call_tool("get_resume_pdf_chunk", {"offset": 7, "length": 100})
+        assert base64.b64decode(chunk["data_base64"]) == RESUME_PDF_PATH.read_bytes()[7:107]
+
+    async def test_protocol_read_serves_cached_base64(self):
+        import base64
+
+        from mcp.shared.memory import create_connected_server_and_client_session
+
+        from src.constants import RESUME_PDF_PATH, RESUME_PDF_URI
+        from src.main import mcp
+
+        async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+            result = await client.read_resource(RESUME_PDF_URI)
+            assert base64.b64decode(result.contents[0].blob) == RESUME_PDF_PATH.read_bytes()
+
+            ranged = await client.read_resource(f"{RESUME_PDF_URI}/0/4")
+            assert base64.b64decode(ranged.contents[0].blob) == b"%PDF"
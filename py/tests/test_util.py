@@ -4,7 +4,10 @@ Tests for utility functions in src/util/resources.py.
 WARNING: Most of the test suite was generated by AI so just a heads up.
 """
 
-from src.util.resources import list_resources, load_resource, search_resources
+import pytest
+
+from src.util.resources import list_resources, load_resource, load_resume_pdf, search_resources
+from src.util.store import ContentStore, set_store
 
 
 class TestLoadResource:
@@ -46,6 +49,11 @@ class TestLoadResource:
         assert content.startswith("Resource '")
         assert "not found" in content.lower()
 
+    def test_unknown_names_do_not_reveal_paths(self):
+        """Test that path-like names get the plain not-found message."""
+        content = load_resource("../../../../etc/passwd")
+        assert content == "Resource '../../../../etc/passwd' not found."
+
 
 class TestListResources:
     """Tests for list_resources function."""
@@ -69,6 +77,40 @@ class TestListResources:
             assert resource, "Empty resource name found"
 
 
+class TestSnapshotReads:
+    """Tests that list_resources and load_resume_pdf answer from the store's snapshot."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        (tmp_path / "bio.md").write_text("bio")
+        (tmp_path / "resume").mkdir()
+        (tmp_path / "resume" / "larkin_resume.pdf").write_bytes(b"%PDF-1")
+        store = ContentStore(tmp_path, ["bio", "skills"])
+        store.watch(3600)
+        set_store(store)
+        yield store
+        set_store(None)
+
+    def test_answers_from_the_watched_snapshot_not_the_disk(self, store, tmp_path):
+        (tmp_path / "bio.md").unlink()
+        (tmp_path / "skills.md").write_text("skills")
+        (tmp_path / "resume" / "larkin_resume.pdf").unlink()
+
+        assert list_resources() == ["bio"]
+        assert load_resume_pdf() is store.snapshot().blobs["resume.pdf"]
+
+    def test_unreadable_files_are_not_listed(self, tmp_path):
+        (tmp_path / "bio.md").write_bytes(b"\xff\xfe not utf-8")
+        (tmp_path / "skills.md").write_text("skills")
+        set_store(ContentStore(tmp_path, ["bio", "skills"]))
+        try:
+            assert list_resources() == ["skills"]
+            with pytest.raises(FileNotFoundError):
+                load_resume_pdf()
+        finally:
+            set_store(None)
+
+
 class TestSearchResources:
     """Tests for search_resources function."""
 
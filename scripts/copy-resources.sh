@@ -20,4 +20,13 @@ for TGT in $TARGETS; do
   echo "Copied resources to ${TGT#$ROOT/}"
 done
 
+# Recompile the Python content bundle so it matches the freshly copied files.
+if command -v uv >/dev/null 2>&1; then
+  (cd "$ROOT/py" && uv run python -m src.util.bundle build)
+elif command -v python3 >/dev/null 2>&1; then
+  (cd "$ROOT/py" && python3 -m src.util.bundle build)
+else
+  echo "Skipping Python content bundle (no uv or python3 found)" >&2
+fi
+
 echo "Done!"